@@ -0,0 +1,84 @@
+"""
+Churn benchmark — repository growth over simulated hourly runs
+==============================================================
+Replays the Actions job (write README.md + assets/, `git add`, commit if
+anything is staged) in a throwaway git repo, once the old way and once with
+update_readme's material_change() gate and content-addressed store_asset().
+Run: python benchmarks/bench_churn.py [--runs 168] [--live 1,0.5,0.1]
+
+`--live` is the chance that a run changes something besides the timestamp
+(1.0 ≈ ISS position in the README, 0.1 ≈ a README of slow-moving sections).
+"""
+
+import os, sys, random, shutil, argparse, tempfile, subprocess
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import update_readme as ur
+
+SECTIONS = ("TIME", "LIVE", "APOD", "PROTEIN")
+FILLER   = "".join(f"| static row {i} | {'·' * 40} |\n" for i in range(300))   # ~20 KB of unchanging README
+IMG_SIZE = 96 * 1024
+
+def git(repo, *args):
+    return subprocess.run(["git", "-C", repo, "-c", "user.name=bench", "-c", "user.email=bench@localhost", *args],
+                          check=True, capture_output=True, text=True).stdout
+
+def image(kind, variant):
+    """Incompressible stand-in for a JPEG; same (kind, variant) → same bytes."""
+    return random.Random(f"{kind}:{variant}").randbytes(IMG_SIZE)
+
+def readme(parts):
+    return "# Dashboard\n\n" + "".join(f"<!-- START_{t} -->\n{parts[t]}\n<!-- END_{t} -->\n\n" for t in SECTIONS) + FILLER
+
+def simulate(mode, runs, live_p, seed=1):
+    repo = tempfile.mkdtemp(prefix=f"churn-{mode}-")
+    cwd  = os.getcwd()
+    try:
+        git(repo, "init", "-q")
+        os.chdir(repo)
+        rng, live, commits = random.Random(seed), "ISS @ 0.00, 0.00", 0
+        for r in range(runs):
+            day = r // 24
+            if rng.random() < live_p: live = f"ISS @ {rng.uniform(-51.6, 51.6):.2f}, {rng.uniform(-180, 180):.2f}"
+            apod, protein = image("apod", day), image("protein", day % 6)     # APOD daily, protein cycles weekly-ish
+            parts = {"TIME": f"<sub>Last Updated: **run {r:04d}**</sub>", "LIVE": live}
+
+            if mode == "legacy":                                 # fixed names, rewritten every run
+                os.makedirs("assets", exist_ok=True)
+                for name, raw in (("apod.jpg", apod), ("protein.jpg", protein)):
+                    with open(os.path.join("assets", name), "wb") as f: f.write(raw)
+                parts.update(APOD="![](./assets/apod.jpg)", PROTEIN='<img src="./assets/protein.jpg" />')
+                with open("README.md", "w", encoding="utf-8") as f: f.write(readme(parts))
+            else:                                                # content-addressed + material-change gate
+                parts.update(APOD=f"![](./{ur.store_asset(apod, 'assets/apod.jpg')})",
+                             PROTEIN=f'<img src="./{ur.store_asset(protein, "assets/protein.jpg")}" />')
+                new = readme(parts)
+                old = open("README.md", encoding="utf-8").read() if os.path.exists("README.md") else ""
+                if ur.material_change(old, new):
+                    with open("README.md", "w", encoding="utf-8") as f: f.write(new)
+                ur.prune_assets(open("README.md", encoding="utf-8").read())
+
+            git(repo, "add", "-A", "README.md", "assets")
+            if git(repo, "status", "--porcelain"):
+                git(repo, "commit", "-q", "-m", f"run {r}"); commits += 1
+
+        git(repo, "gc", "-q")
+        stats = dict(l.split(": ") for l in git(repo, "count-objects", "-v").splitlines())
+        return commits, int(stats["in-pack"]) + int(stats["count"]), int(stats["size-pack"]) + int(stats["size"])
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(repo, ignore_errors=True)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--runs", type=int, default=168, help="simulated hourly runs (default: one week)")
+    ap.add_argument("--live", default="1,0.5,0.1", help="comma-separated non-timestamp change probabilities")
+    args = ap.parse_args()
+
+    print(f"{'mode':<10} {'live_p':>6} {'runs':>5} {'commits':>8} {'objects':>8} {'repo_KiB':>9}")
+    for p in (float(x) for x in args.live.split(",")):
+        for mode in ("legacy", "cas+gate"):
+            commits, objects, kib = simulate(mode, args.runs, p)
+            print(f"{mode:<10} {p:>6.2f} {args.runs:>5} {commits:>8} {objects:>8} {kib:>9}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Conjunction-screen benchmark — run time against catalog size
+============================================================
+Screens synthetic catalogs shaped like today's active one (a dense 550 km
+mega-constellation shell, sun-synchronous and ISS-inclination LEO, a few MEO
+and GEO) in the two modes update_readme supports: the 18 key satellites
+against everything ("key", what the hourly run does) and every pair ("full").
+"brute" is the O(n²) pairwise check the spatial hash replaces, run at the
+smaller sizes only, as the reference for both speed and results.
+Run: python benchmarks/bench_conjunctions.py [--sizes 1000,3000,10000,30000] [--hours 1] [--modes key,full,brute] [--workers N] [--check 1.6]
+
+Times are for --hours of screening; the hourly run does SCREEN_HOURS (24).
+Expect ~1.0 for "key", ~1.5 for "full" (see ur.screen_step) and 2 for "brute";
+`--check X` exits non-zero when a hashed mode's scaling exponent exceeds X.
+"""
+
+import os, sys, math, time, random, argparse
+from array import array
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import update_readme as ur
+
+# ── synthetic catalog ─────────────────────────────────────────────────────────
+SHELLS = [   # (weight, altitude km, spread km, inclinations °)
+    (0.62, 550,   15,  (53.0, 43.0, 70.0, 97.6)),
+    (0.18, 700,  150,  (97.6, 98.2, 86.4)),
+    (0.10, 420,   60,  (51.6, 41.5)),
+    (0.06, 1100, 150,  (87.9, 52.0)),
+    (0.02, 20200, 50,  (55.0, 64.8)),
+    (0.02, 35786, 20,  (0.05,)),
+]
+
+def gen_catalog(n, rng, epoch=0.0):
+    """Packed ORBIT_FIELDS array of n objects; ur.tle_orbit's secular rates, zero drag."""
+    el, cum = array("d"), []
+    for w, *_ in SHELLS: cum.append((cum[-1] if cum else 0) + w)
+    for _ in range(n):
+        _, alt, spread, incs = SHELLS[min(len(SHELLS) - 1, sum(c < rng.random() for c in cum))]
+        a   = ur.R_EARTH + alt + rng.uniform(-spread, spread)
+        e   = rng.uniform(0, 0.002)
+        inc = math.radians(rng.choice(incs) + rng.gauss(0, 0.05))
+        n0  = math.sqrt(ur.MU_EARTH / a ** 3)
+        k   = 1.5 * ur.J2_EARTH * (ur.R_EARTH / (a * (1 - e * e))) ** 2 * n0
+        si2 = math.sin(inc) ** 2
+        el.extend((epoch, a, e, inc, rng.uniform(0, 2 * math.pi), -k * math.cos(inc), rng.uniform(0, 2 * math.pi),
+                   k * (2 - 2.5 * si2), rng.uniform(0, 2 * math.pi), n0 + k * math.sqrt(1 - e * e) * (1 - 1.5 * si2),
+                   0.0, a * (1 - e), a * (1 + e)))
+    return el
+
+def brute(el, prim, t0, hours, step, miss):
+    """Every pair at every step; each pair's closest sample is refined as in ur.screen_window."""
+    n      = len(prim)
+    cell   = miss + ur.V_REL_MAX * step / 2 + ur.A_REL_MAX * step * step / 8
+    planes = [ur._plane(el, k) for k in range(n)]
+    best, nsteps = {}, int(hours * 3600 / step)
+    for s in range(nsteps):
+        t   = t0 + s * step
+        pos = ur.orbit_positions(planes, range(n), t)
+        for i in range(n):
+            p = pos[i]
+            for j in range(i + 1, n):
+                q = pos[j]
+                d2 = (q[0] - p[0]) ** 2 + (q[1] - p[1]) ** 2 + (q[2] - p[2]) ** 2
+                if d2 <= cell * cell and d2 < best.get((i, j), (math.inf,))[0]: best[(i, j)] = (d2, t)
+    lo, hi = t0 - step / 2, t0 + (nsteps - 0.5) * step        # the span screen() covers
+    out = [(i, j, *ur._tca(el, i, j, max(lo, tb - step), min(hi, tb + step))) for (i, j), (_, tb) in best.items()]
+    return sorted((r for r in out if r[3] <= miss), key=lambda r: r[3])
+
+def run(mode, el, n, hours):
+    prim = array("b", (mode != "key" or k < len(ur.KEY_SATS) for k in range(n)))
+    t0   = time.perf_counter()
+    if mode == "brute": hits = brute(el, prim, 0.0, hours, ur.screen_step(n), ur.SCREEN_MISS)
+    else:               hits, _ = ur.screen(el, prim, 0.0, hours)
+    return time.perf_counter() - t0, hits
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--sizes", default="1000,3000,10000,30000", help="comma-separated catalog sizes")
+    ap.add_argument("--hours", type=float, default=1.0, help="screening horizon per measurement")
+    ap.add_argument("--modes", default="key,full,brute", help="comma-separated: key, full, brute")
+    ap.add_argument("--brute-max", type=int, default=3000, help="largest catalog the O(n²) reference runs on")
+    ap.add_argument("--workers", type=int, default=None, help="CPU pool size (default: update_readme's)")
+    ap.add_argument("--check", type=float, default=None, metavar="X", help="fail when a hashed mode's exponent exceeds X")
+    args = ap.parse_args()
+    if args.workers: ur.CPU_WORKERS = args.workers
+
+    sizes, modes = [int(x) for x in args.sizes.split(",")], args.modes.split(",")
+    print(f"{'mode':<6} {'objects':>8} {'hits':>6} {'seconds':>9} {'per 24 h':>9} {'exp':>5}   (workers={ur.CPU_WORKERS})")
+    worst, ref = 0.0, {}
+    for mode in modes:
+        prev = None
+        for n in sizes:
+            if mode == "brute" and n > args.brute_max: continue
+            sec, hits = run(mode, gen_catalog(n, random.Random(n)), n, args.hours)
+            exp = math.log(sec / prev[1]) / math.log(n / prev[0]) if prev else float("nan")
+            if mode != "brute" and exp == exp: worst = max(worst, exp)
+            note = ""
+            if mode == "full": ref[n] = {(i, j) for i, j, *_ in hits}
+            if mode == "brute" and n in ref:
+                missed = {(i, j) for i, j, *_ in hits} - ref[n]
+                note = f"   full mode missed {len(missed)}" if missed else "   matches full mode"
+            print(f"{mode:<6} {n:>8,} {len(hits):>6} {sec:>9.2f} {sec * 24 / args.hours:>9.0f} "
+                  f"{'' if exp != exp else f'{exp:.2f}':>5}{note}")
+            prev = (n, sec)
+    ur.cpu_shutdown()
+    if args.check is not None and worst > args.check:
+        sys.exit(f"scaling exponent {worst:.2f} exceeds --check {args.check}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Parser benchmark — throughput and allocations at 1×, 100×, 10,000× today's inputs
+=================================================================================
+Feeds each hot parsing path in update_readme synthetic input scaled from the
+size it sees in an hourly run (18 TLEs, 146 GISS years, a 100-row FIRMS day,
+10 arXiv entries, 40 World Bank records) and reports rows/s, MB/s, peak
+traced memory and blocks still allocated per row of output, plus the scaling exponent between
+successive scales (1.0 = linear).
+Run: python benchmarks/bench_parsers.py [--scales 1,100,10000] [--only tle,firms] [--max-mb 250] [--check 1.25]
+
+`--check X` exits non-zero when any parser's exponent exceeds X, so a
+quadratic slip shows up here instead of in the hourly job's run budget.
+"""
+
+import os, sys, math, time, random, argparse, tracemalloc
+import xml.etree.ElementTree as ET
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import update_readme as ur
+
+# ── synthetic inputs ──────────────────────────────────────────────────────────
+def _tle_checksum(line):
+    return sum(int(c) if c.isdigit() else c == "-" for c in line) % 10
+
+def gen_tle(n, rng):
+    out = []
+    for i in range(n):
+        norad = 10000 + i
+        l1 = f"1 {norad:05d}U 98067A   24{rng.uniform(1, 365):012.8f}  .00016717  00000-0  10270-3 0  900"
+        l2 = (f"2 {norad:05d} {rng.uniform(0, 110):8.4f} {rng.uniform(0, 360):8.4f} {rng.randrange(10**7):07d} "
+              f"{rng.uniform(0, 360):8.4f} {rng.uniform(0, 360):8.4f} {rng.uniform(1, 16):11.8f}{rng.randrange(10**5):05d}")
+        out += [f"SAT-{i}", l1 + str(_tle_checksum(l1)), l2 + str(_tle_checksum(l2))]
+    return ("\n".join(out) + "\n").encode()
+
+def gen_giss(n, rng):
+    head = "Land-Ocean: Global Means\nYear,Jan,Feb,Mar,Apr,May,Jun,Jul,Aug,Sep,Oct,Nov,Dec,J-D,D-N,DJF,MAM,JJA,SON\n"
+    rows = (f"{1880 + i % 8000},"
+            + ",".join("***" if rng.random() < 0.01 else f"{rng.gauss(0.2, 0.4):.2f}" for _ in range(18))
+            for i in range(n))
+    return (head + "\n".join(rows) + "\n").encode()
+
+def gen_co2_weekly(n, rng):
+    rows = []
+    for i in range(n):
+        y = 1974 + i % 2600 * 7 / 365.25             # wrap: NOAA years are 4 digits
+        rows.append(f"  {int(y)}  {1 + i % 12:2d}  {1 + i % 28:2d}  {y:9.4f}  "
+                    f"{-999.99 if rng.random() < 0.02 else 330 + i * 0.04:7.2f}  7  {330:7.2f}  {325:7.2f}  {310:7.2f}")
+    return ("# NOAA GML weekly CO2\n" + "\n".join(rows) + "\n").encode()
+
+def gen_firms(n, rng):
+    head = "latitude,longitude,bright_ti4,scan,track,acq_date,acq_time,satellite,instrument,confidence,version,bright_ti5,frp,daynight\n"
+    rows = (f"{rng.uniform(-60, 70):.5f},{rng.uniform(-180, 180):.5f},{rng.uniform(300, 367):.2f},0.39,0.36,"
+            f"2026-10-{1 + i % 28:02d},{rng.randrange(24):02d}{rng.randrange(60):02d},N20,VIIRS,n,2.0NRT,"
+            f"{rng.uniform(270, 300):.2f},{rng.expovariate(1 / 8):.2f},{'DN'[i % 2]}"
+            for i in range(n))
+    return head + "\n".join(rows) + "\n"
+
+def gen_arxiv(n, rng):
+    entry = ("<entry><id>http://arxiv.org/abs/2610.{i:05d}v1</id><published>2026-10-18T17:59:59Z</published>"
+             "<title>Synthetic paper {i} on\n  scalable parsing</title><summary>{s}</summary>"
+             "<author><name>A. Author</name></author><author><name>B. Author</name></author>"
+             "<author><name>C. Author</name></author></entry>")
+    body = "".join(entry.format(i=i, s="x" * rng.randrange(600, 1400)) for i in range(n))
+    return f'<?xml version="1.0"?><feed xmlns="http://www.w3.org/2005/Atom">{body}</feed>'.encode()
+
+def gen_wb(n, rng):
+    isos = [f"C{i:02d}" for i in range(max(1, n // 5))]
+    return [{"countryiso3code": isos[i % len(isos)], "country": {"value": f"Country {isos[i % len(isos)]}"},
+             "date": str(2024 - i // len(isos)), "value": None if rng.random() < 0.1 else rng.uniform(-5, 8)}
+            for i in range(n)]
+
+# name -> (rows per 1× run, generator, parser)
+PARSERS = {
+    "tle":        (18,   gen_tle,        lambda b: [ur.tle_elements(l2) for _, _, l2 in ur.parse_tle(b.decode())]),
+    "giss":       (146,  gen_giss,       lambda b: ur._parse_giss(b, 0)),
+    "co2_weekly": (2700, gen_co2_weekly, lambda b: ur._parse_co2_weekly(b, 0)),
+    "firms":      (100,  gen_firms,      ur.parse_firms),
+    "arxiv":      (10,   gen_arxiv,      lambda b: ur.arxiv_entries(ET.fromstring(b))),
+    "worldbank":  (40,   gen_wb,         ur._wb_latest),
+}
+
+def _size(data):
+    return len(data) if isinstance(data, (bytes, str)) else sum(len(str(r)) for r in data)
+
+def measure(parse, data, min_time=0.3):
+    """(seconds per call, peak traced bytes, blocks retained by one call's result)."""
+    parse(data)                                            # warm caches / regex compilation
+    n, t0 = 0, time.perf_counter()
+    while True:
+        parse(data); n += 1
+        if time.perf_counter() - t0 >= min_time: break
+    sec = (time.perf_counter() - t0) / n
+    tracemalloc.start()
+    b0 = sys.getallocatedblocks()
+    out = parse(data)
+    blocks = sys.getallocatedblocks() - b0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del out
+    return sec, peak, blocks
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--scales", default="1,100,10000", help="comma-separated multiples of today's input size")
+    ap.add_argument("--only", default="", help="comma-separated parser names (default: all)")
+    ap.add_argument("--max-mb", type=float, default=250, help="skip scales whose input would exceed this size")
+    ap.add_argument("--check", type=float, default=None, metavar="X", help="fail when a scaling exponent exceeds X")
+    args = ap.parse_args()
+
+    scales = [int(x) for x in args.scales.split(",")]
+    names  = [n for n in PARSERS if not args.only or n in args.only.split(",")]
+    print(f"{'parser':<11} {'scale':>6} {'rows':>9} {'MB':>8} {'ms/call':>10} {'rows/s':>11} {'MB/s':>7} "
+          f"{'peak_MiB':>9} {'blk/row':>8} {'exp':>5}")
+    worst = 0.0
+    for name in names:
+        base, gen, parse = PARSERS[name]
+        prev, unit = None, _size(gen(base, random.Random(0))) / base / 1e6
+        for k in scales:
+            rows = base * k
+            if rows * unit > args.max_mb:
+                print(f"{name:<11} {k:>5}× {rows:>9,} {rows * unit:>8.0f}  skipped (> --max-mb)"); continue
+            data = gen(rows, random.Random(rows))
+            mb   = _size(data) / 1e6
+            sec, peak, blocks = measure(parse, data)
+            exp  = math.log(sec / prev[1]) / math.log(rows / prev[0]) if prev else float("nan")
+            if exp == exp: worst = max(worst, exp)
+            print(f"{name:<11} {k:>5}× {rows:>9,} {mb:>8.2f} {sec * 1e3:>10.2f} {rows / sec:>11,.0f} {mb / sec:>7.1f} "
+                  f"{peak / 2**20:>9.1f} {blocks / rows:>8.2f} {'' if exp != exp else f'{exp:.2f}':>5}")
+            prev = (rows, sec)
+            del data
+    if args.check is not None and worst > args.check:
+        sys.exit(f"scaling exponent {worst:.2f} exceeds --check {args.check}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+// ══════════════════════════════════════════════════════
+//  DATA BUNDLE — data.json(.gz), rebuilt hourly by update_readme.py
+//  One same-origin request replaces the per-visitor API fan-out;
+//  every helper falls back to the live API when a key is missing.
+// ══════════════════════════════════════════════════════
+const BUNDLE_VERSION=1;
+let _bundle=null;
+function bundle(){
+  return _bundle||(_bundle=(async()=>{
+    try{
+      if(typeof DecompressionStream!=='undefined'){
+        const r=await fetch('data.json.gz',{cache:'no-cache'});
+        if(r.ok){
+          const b=await new Response(r.body.pipeThrough(new DecompressionStream('gzip'))).json();
+          if(b?.version===BUNDLE_VERSION)return b;
+        }
+      }
+      const b=await fetch('data.json',{cache:'no-cache'}).then(r=>r.json());
+      return b?.version===BUNDLE_VERSION?b:null;
+    }catch(e){return null;}
+  })());
+}
+// Raw API payload (same shape as the live endpoint returns)
+async function feed(key,url,kind='json'){
+  const b=await bundle();
+  if(b?.feeds?.[key]!=null)return b.feeds[key];
+  return fetch(url).then(r=>kind==='text'?r.text():r.json());
+}
+// Parsed column series; `parse` turns the live text into the same columns
+async function series(key,url,parse){
+  const b=await bundle();
+  if(b?.series?.[key])return b.series[key];
+  return parse(await fetch(url).then(r=>r.text()));
+}
+
+// ── SERIES PYRAMIDS — raw / monthly / yearly levels, fetched per zoom ──
+const _levels={};
+function yearToDate(t){const y=Math.floor(t);return new Date(Date.UTC(y,0,1)+(t-y)*365.25*864e5).toISOString().slice(0,10);}
+function dateToYear(s){const d=new Date(s),y=d.getUTCFullYear();return y+(d-Date.UTC(y,0,1))/(365.25*864e5);}
+// Finest level whose estimated point count over [t0,t1] fits maxPts → {level,t,v|mean,min,max}
+async function pyramidLevel(name,t0=-Infinity,t1=Infinity,maxPts=800){
+  const p=(await bundle())?.pyramids?.[name];
+  if(!p)return null;
+  const names=Object.keys(p.levels);
+  let pick=names[names.length-1];
+  for(const k of names){
+    const m=p.levels[k],lo=Math.max(t0,m.t0),hi=Math.min(t1,m.t1);
+    if(m.n*Math.max(0,hi-lo)/Math.max(1e-9,m.t1-m.t0)<=maxPts){pick=k;break;}
+  }
+  const key=name+'.'+pick;
+  const d=p.inline?.[pick]||await (_levels[key]||(_levels[key]=fetch(p.levels[pick].file).then(r=>r.json())));
+  const i=d.t.findIndex(t=>t>=t0),j=d.t.findLastIndex(t=>t<=t1);
+  const out={level:pick};
+  for(const c in d)out[c]=i<0?[]:d[c].slice(i,j+1);
+  return out;
+}
+// Re-pick the pyramid level when the user zooms a date-axis chart; load(t0,t1) → rows {d,v}
+function bindZoom(div,load,trace=0){
+  const el=document.getElementById(div);
+  el?.on?.('plotly_relayout',async ev=>{
+    if(ev['xaxis.range[0]']===undefined&&!ev['xaxis.autorange'])return;
+    const rows=ev['xaxis.autorange']?await load():await load(dateToYear(ev['xaxis.range[0]']),dateToYear(ev['xaxis.range[1]']));
+    Plotly.restyle(div,{x:[rows.map(r=>r.d)],y:[rows.map(r=>r.v)]},[trace]);
+  });
+}
+
+// ── CO2 weekly (NOAA GML) → [{d:'YYYY-MM-DD', y:decimal year, v:ppm}] ──
+const CO2_WEEKLY_URL='https://gml.noaa.gov/webdata/ccgg/trends/co2/co2_weekly_mlo.txt';
+async function co2Weekly(t0,t1,maxPts=800){
+  const lv=await pyramidLevel('co2_weekly',t0,t1,maxPts);
+  if(lv){const v=lv.v||lv.mean;return lv.t.map((t,i)=>({d:yearToDate(t),y:t,v:v[i]}));}
+  const rows=(await fetch(CO2_WEEKLY_URL).then(r=>r.text())).split('\n').filter(l=>!l.startsWith('#')&&l.trim())
+    .map(l=>l.trim().split(/\s+/)).filter(r=>r.length>=5&&+r[4]>0);
+  return rows.map(r=>({d:`${r[0]}-${r[1].padStart(2,'0')}-${r[2].padStart(2,'0')}`,y:+r[3],v:+r[4]}))
+    .filter(r=>(t0===undefined||r.y>=t0)&&(t1===undefined||r.y<=t1));
+}
+
+// ── GISS annual J-D anomaly → [{y, v}] ──
+const GISS_URL='https://data.giss.nasa.gov/gistemp/tabledata_v4/GLB.Ts+dSST.csv';
+function parseGISS(txt){
+  const rows=txt.split('\n').filter(l=>/^\d{4}/.test(l)).map(l=>l.split(','));
+  return {year:rows.map(r=>+r[0]),jd:rows.map(r=>isNaN(+r[13])||r[13].trim()===''?null:+r[13])};
+}
+async function gissAnnual(){
+  const s=await series('giss',GISS_URL,parseGISS);
+  return s.year.map((y,i)=>({y,v:s.jd[i]})).filter(d=>d.v!=null&&d.v>-99&&d.y>=1880);
+}
+
+// ── ECB daily FX, EUR base → {dates:['YYYY-MM-DD'], rates:{USD:[...], GBP:[...], ...}} ──
+const FX_HISTORY_URL='https://api.frankfurter.app/2024-01-01..?from=EUR';
+async function fxHistory(){
+  const s=(await bundle())?.series?.fx_eur;
+  if(s){const {ymd,...rates}=s;return {dates:ymd.map(d=>String(d).replace(/(\d{4})(\d\d)(\d\d)/,'$1-$2-$3')),rates};}
+  const r=await fetch(FX_HISTORY_URL).then(r=>r.json()),dates=Object.keys(r.rates||{}).sort(),rates={};
+  for(const c of new Set(dates.flatMap(d=>Object.keys(r.rates[d]))))rates[c]=dates.map(d=>r.rates[d][c]??null);
+  return {dates,rates};
+}
+
+// ── Per-host circuit breaker (localStorage) — the same closed / open / half-open
+//    machine as update_readme.py, with its policy read from data.json's "breaker":
+//    `threshold` straight failures open a host for a cooldown that doubles per
+//    failed probe; after the cooldown one request probes it under a short lease ──
+const BREAKER={threshold:3,cooldown:1800e3,max:86400e3,probe:60e3,http:[401,403,429,500,502,503,504]};  // until the bundle loads
+async function _breakerPolicy(){
+  const p=(await bundle())?.breaker;
+  return p?{threshold:p.threshold,cooldown:p.cooldown_s*1e3,max:p.max_s*1e3,probe:p.probe_s*1e3,http:p.http}:BREAKER;
+}
+function _breaker(){try{return JSON.parse(localStorage.getItem('breaker')||'{}');}catch(e){return {};}}
+function _breakerSave(b){try{localStorage.setItem('breaker',JSON.stringify(b));}catch(e){}}
+async function guarded(url,opts={},ms=10000){
+  const P=await _breakerPolicy(),host=new URL(url).host,b=_breaker(),s=b[host];
+  if(s?.state&&s.state!=='closed'){
+    if(Date.now()<s.until)throw new Error(`${host} circuit ${s.state}`);
+    s.state='half_open';s.until=Date.now()+P.probe;_breakerSave(b);   // probe lease: one request, then re-probe
+  }
+  try{
+    const r=await fetch(url,{...opts,signal:AbortSignal.timeout(ms)});
+    if(P.http.includes(r.status))throw new Error(`HTTP ${r.status}`);
+    const bb=_breaker();delete bb[host];_breakerSave(bb);
+    return r;
+  }catch(e){
+    const bb=_breaker(),t=bb[host]||{state:'closed',fails:0,until:0,cooldown:P.cooldown};
+    t.fails++;
+    if(t.state==='half_open')t.cooldown=Math.min(P.max,t.cooldown*2);
+    if(t.state==='half_open'||t.fails>=P.threshold){t.state='open';t.until=Date.now()+t.cooldown;}
+    bb[host]=t;_breakerSave(bb);
+    throw e;
+  }
+}
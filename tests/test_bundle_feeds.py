@@ -0,0 +1,46 @@
+import os, sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import update_readme as ur
+
+import pytest
+
+TLE = ("ISS (ZARYA)\n"
+       "1 25544U 98067A   08264.51782528 -.00002182  00000-0 -11606-4 0  2927\n"
+       "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391563537\n")
+
+OWNERS = ("SPACE_WEATHER", "EARTHQUAKES", "ISS", "NEOS", "DONKI", "CELESTRAK", "FOREX", "DISEASE")
+
+
+@pytest.fixture
+def network(monkeypatch, tmp_path):
+    calls = []
+    def fetch(url, headers=None, timeout=15, max_bytes=None):
+        calls.append(url)
+        return 200, {}, TLE.encode() if "celestrak" in url else b"[]"
+    monkeypatch.setattr(ur, "_fetch", fetch)
+    for name in ("CACHE_DIR", "NASA_DIR", "GP_DIR"):
+        monkeypatch.setattr(ur, name, str(tmp_path / name))
+    for name in ("_MEMO", "_MEMO_BY", "_RECORDS", "_TABLES"):
+        monkeypatch.setattr(ur, name, {})
+    monkeypatch.setattr(ur, "_NASA_QUOTA", None)
+    monkeypatch.setattr(ur, "CPU_WORKERS", 1)
+    monkeypatch.setattr(ur.time, "sleep", lambda s: None)
+    return calls
+
+
+def test_bundle_feeds_reuse_the_sections_requests(network):
+    steps = dict(ur.README_STEPS)
+    for tag in OWNERS: steps[tag]()
+    n = len(network)
+    feeds = ur.bundle_feeds()
+    assert network[n:] == []
+    assert {"swpc_plasma", "usgs_week", "astros", "covid_top", "stations_tle"} <= set(feeds)
+
+
+def test_second_renderer_makes_no_requests(network):
+    tags = [t for t in OWNERS if t in ur.SECTIONS]
+    for tag in tags: ur.render(tag, "md")
+    n = len(network)
+    for tag in tags:
+        ur.render(tag, "json"); ur.render(tag, "svg")
+    assert network[n:] == []
@@ -0,0 +1,41 @@
+import os, sys, time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import update_readme as ur
+
+import pytest
+
+CHUNK = 128 * 1024
+
+
+def _growing(refused, kept):
+    def fn():
+        for _ in range(40):                        # ~5 MiB over ~0.3 s, so the watcher sees it running
+            try:
+                ur.mem_check()
+                kept.append(bytearray(CHUNK))
+            except:                                # a per-row bare except, as in parse_firms
+                refused[0] += 1
+            time.sleep(0.008)
+        return "finished"
+    return fn
+
+
+def test_section_over_budget_is_refused_and_raises_on_return(monkeypatch):
+    monkeypatch.setitem(ur.MEM_BUDGETS, "BUDGET_TEST", 1)
+    refused, kept = [0], []
+    with ur.memory_accounting():
+        with pytest.raises(ur.MemoryBudgetExceeded):
+            ur.mem_guarded("BUDGET_TEST", _growing(refused, kept))()
+    rep = ur.MEM_REPORT["BUDGET_TEST"]
+    assert rep["over"] > 2**20
+    assert refused[0] > 0                          # later downloads were refused
+    assert rep["retained"] >= len(kept) * CHUNK    # still held by `kept`
+
+
+def test_section_within_budget_returns_and_is_reported(monkeypatch):
+    monkeypatch.setitem(ur.MEM_BUDGETS, "SMALL_TEST", 8)
+    with ur.memory_accounting():
+        assert ur.mem_guarded("SMALL_TEST", lambda: len(bytearray(2**20)))() == 2**20
+    rep = ur.MEM_REPORT["SMALL_TEST"]
+    assert rep["over"] == 0
+    assert 2**20 <= rep["peak"] < 8 * 2**20
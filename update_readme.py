@@ -7,39 +7,171 @@ Required env: NASA_API_KEY (optional, falls back to DEMO_KEY)
 All other APIs: zero auth required.
 """
 
-import os, re, json, math, time, urllib.request, urllib.parse, xml.etree.ElementTree as ET
-from datetime import datetime, timezone
+import os, re, io, sys, json, math, time, gzip, zlib, bisect, shutil, atexit, tarfile, tempfile, cProfile, tracemalloc, multiprocessing, hashlib, mmap, struct, threading, http.client, http.server, argparse, urllib.request, urllib.error, urllib.parse, xml.etree.ElementTree as ET
+from array import array
+from itertools import accumulate
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field, asdict, is_dataclass
+from datetime import datetime, timezone, timedelta
 
 # ── CONFIG ────────────────────────────────────────────────────────────────────
 NASA_KEY = os.environ.get("NASA_API_KEY", "DEMO_KEY")
 QC_BASE  = "https://quickchart.io/chart?c="
 DARK_BG  = "%230D1117"
+CACHE_DIR = os.environ.get("DASHBOARD_CACHE", ".cache")   # persisted between runs by actions/cache
+
+GISS_URL  = "https://data.giss.nasa.gov/gistemp/tabledata_v4/GLB.Ts+dSST.csv"
+CO2_URL   = "https://gml.noaa.gov/webdata/ccgg/trends/co2/co2_annmean_mlo.txt"
+CO2_WEEKLY_URL = "https://gml.noaa.gov/webdata/ccgg/trends/co2/co2_weekly_mlo.txt"
+SOLAR_URL = "https://services.swpc.noaa.gov/json/solar-cycle/observed-solar-cycle-indices.json"
 
 # ── HELPERS ───────────────────────────────────────────────────────────────────
+_TLS = threading.local()   # per-thread run deadline (epoch seconds), see deadline()
+KEEPALIVE  = False         # --daemon: reuse one connection per host instead of urlopen's one-shot sockets
+DRY_RUN    = False         # --dry-run: store_asset() computes paths but writes nothing
+_POOL      = {}            # (scheme, netloc) -> idle http.client connections
+_POOL_LOCK = threading.Lock()
+
+def _pooled(url, headers, timeout, max_bytes, hops=5):
+    """_fetch over a kept-alive http.client connection; follows redirects and raises HTTPError like urlopen."""
+    u = urllib.parse.urlsplit(url)
+    key = (u.scheme, u.netloc)
+    with _POOL_LOCK:
+        idle = _POOL.setdefault(key, [])
+        conn = idle.pop() if idle else None
+    if conn is None:
+        cls  = http.client.HTTPSConnection if u.scheme == "https" else http.client.HTTPConnection
+        conn = cls(u.netloc, timeout=timeout)
+    reused = conn.sock is not None
+    conn.timeout = timeout
+    if reused: conn.sock.settimeout(timeout)
+    try:
+        conn.request("GET", (u.path or "/") + (f"?{u.query}" if u.query else ""), headers=headers)
+        r    = conn.getresponse()
+        body = r.read() if max_bytes is None else r.read(max_bytes)
+    except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+        conn.close()
+        if reused: return _pooled(url, headers, timeout, max_bytes, hops)   # server dropped the idle socket
+        raise
+    except:
+        conn.close(); raise
+    if r.will_close or not r.isclosed(): conn.close()     # truncated by max_bytes → can't reuse
+    else:
+        with _POOL_LOCK: _POOL[key].append(conn)
+    hdrs = {k.lower(): v for k, v in r.getheaders()}
+    if r.status in (301, 302, 303, 307, 308) and hdrs.get("location") and hops:
+        return _pooled(urllib.parse.urljoin(url, hdrs["location"]), headers, timeout, max_bytes, hops - 1)
+    if r.status >= 400:
+        raise urllib.error.HTTPError(url, r.status, r.reason, r.msg, None)
+    return r.status, hdrs, body
+
+def _get_once(url, headers, timeout, max_bytes):
+    if KEEPALIVE: return _pooled(url, headers, timeout, max_bytes)
+    req = urllib.request.Request(url, headers=headers)
+    with urllib.request.urlopen(req, timeout=timeout) as r:
+        body = r.read() if max_bytes is None else r.read(max_bytes)
+        return r.status, {k.lower(): v for k, v in r.headers.items()}, body
+
+def _fetch(url, headers=None, timeout=15, max_bytes=None):
+    """Single HTTP funnel for every helper — returns (status, headers, body bytes), raises on error."""
+    mem_check()
+    t0, n = time.time(), 0
+    try:
+        if CASSETTE_MODE == "replay": res = cassette_play(url, headers)
+        elif CASSETTE_MODE == "record": res = cassette_record(url, headers, lambda: _fetch_live(url, headers, timeout, max_bytes))
+        else: res = _fetch_live(url, headers, timeout, max_bytes)
+        n = len(res[2])
+        return res
+    finally: stats_fetch(url, n, time.time() - t0)
+
+def _fetch_live(url, headers, timeout, max_bytes):
+    host, ep = urllib.parse.urlsplit(url).netloc, endpoint(url)
+    breaker_allow(host)
+    timeout = host_timeout(ep, timeout)
+    dl, asked = getattr(_TLS, "deadline", None), timeout
+    if dl is not None:
+        timeout = min(timeout, dl - time.time())
+        if timeout <= 0: raise TimeoutError(f"run budget exhausted before {url}")
+    hdrs  = {"User-Agent": "Mozilla/5.0", **(headers or {})}
+    call  = _carry_deadline(lambda: _get_once(url, hdrs, timeout, max_bytes))
+    hedge = None if host in NO_HEDGE or "Range" in hdrs else hedge_after(ep)
+    t0 = time.time()
+    try:
+        res = _hedged(call, hedge) if hedge is not None and hedge < timeout else call()
+    except urllib.error.HTTPError as e:
+        breaker_record(host, e.code not in BREAKER_HTTP)   # a 404/416 still proves the host is up
+        raise
+    except:
+        if timeout == asked:                              # a budget-shortened timeout says nothing about the host
+            breaker_record(host, False)
+            if time.time() - t0 >= timeout * 0.95: latency_record(ep, timeout)   # censored sample
+        raise
+    breaker_record(host, True)
+    latency_record(ep, time.time() - t0)
+    return res
+
+_MEMO    = {}   # per-run memo of successful GETs: (kind, url) -> parsed result
+_MEMO_BY = {}   # section tag -> memo keys it filled; the daemon forgets them when the section is due
+
+def _memo_put(key, data):
+    _MEMO[key] = data
+    _MEMO_BY.setdefault(getattr(_TLS, "section", None), set()).add(key)
+    return data
+
+def memo_forget(tags):
+    """Drops the memo entries filled by `tags` (and by no section) so their next GETs go out again."""
+    for tag in (*tags, None):
+        for key in _MEMO_BY.pop(tag, ()): _MEMO.pop(key, None)
+
 def get_json(url):
+    if ("json", url) in _MEMO: return _MEMO[("json", url)]
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=15) as r:
-            return json.loads(r.read().decode())
+        data = json.loads(_fetch(url)[2].decode())
     except: return None
+    return _memo_put(("json", url), data)
 
 def get_xml(url):
+    if ("xml", url) in _MEMO: return _MEMO[("xml", url)]
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=15) as r:
-            return ET.fromstring(r.read())
+        root = ET.fromstring(_fetch(url)[2])
     except: return None
+    return _memo_put(("xml", url), root)
 
 def get_text(url):
+    if ("text", url) in _MEMO: return _MEMO[("text", url)]
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=15) as r:
-            return r.read().decode(errors="ignore")
+        text = _fetch(url)[2].decode(errors="ignore")
     except: return None
+    return _memo_put(("text", url), text)
+
+def _atomic_write(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+    with open(tmp, "wb") as f:
+        f.write(data if isinstance(data, bytes) else data.encode("utf-8"))
+    os.replace(tmp, path)
+
+def _write_if_changed(path, data):
+    data = data if isinstance(data, bytes) else data.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if f.read() == data: return False
+    except OSError: pass
+    _atomic_write(path, data)
+    return True
+
+def _stable(o, sig=6):
+    """Floats → `sig` significant digits, recursively, so float noise can't change rendered output."""
+    if isinstance(o, float): return float(f"{o:.{sig}g}") if o == o else o
+    if isinstance(o, dict):  return {k: _stable(v, sig) for k, v in o.items()}
+    if isinstance(o, (list, tuple)): return [_stable(v, sig) for v in o]
+    return o
 
 def make_chart(config, w=600, h=300):
     try:
-        params = json.dumps(config, separators=(",", ":"))
+        params = json.dumps(_stable(config), separators=(",", ":"))
         safe   = urllib.parse.quote(params)
         return f'<img src="{QC_BASE}{safe}&w={w}&h={h}&bkg={DARK_BG}" width="100%" />'
     except: return ""
@@ -52,18 +184,46 @@ def inject(text, tag, content):
         return re.sub(pattern, f"{start}\n{content}\n{end}", text, flags=re.DOTALL)
     except: return text
 
+ASSET_DIR = "assets"
+_ASSET_RE = re.compile(r"^[\w-]+\.[0-9a-f]{12}\.\w+$")   # <stem>.<sha256[:12]>.<ext>
+
+def store_asset(raw, hint):
+    """
+    Content-addressed write: "assets/apod.jpg" + bytes → assets/apod.<sha256[:12]>.jpg.
+    Unchanged bytes map to the same path, so README links and the file itself
+    stay put across runs; returns the path.
+    """
+    stem, ext = os.path.splitext(os.path.basename(hint))
+    path = os.path.join(os.path.dirname(hint) or ASSET_DIR, f"{stem}.{hashlib.sha256(raw).hexdigest()[:12]}{ext}")
+    if not DRY_RUN and not os.path.exists(path): _atomic_write(path, raw)
+    return path
+
+def prune_assets(*texts, asset_dir=ASSET_DIR):
+    """Deletes content-addressed assets no longer referenced by any of `texts`; returns the count."""
+    try: names = os.listdir(asset_dir)
+    except OSError: return 0
+    n = 0
+    for name in names:
+        if _ASSET_RE.match(name) and not any(name in t for t in texts):
+            os.remove(os.path.join(asset_dir, name)); n += 1
+    return n
+
 def _download_image(url, save_path, max_mb=15):
+    """Fetches an image into the asset store; returns its content-addressed path or None."""
     try:
-        req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urllib.request.urlopen(req, timeout=30) as r:
-            raw = r.read(max_mb * 1024 * 1024 + 1)
+        raw = _fetch(url, timeout=30, max_bytes=max_mb * 1024 * 1024 + 1)[2]
         if not raw or len(raw) > max_mb * 1024 * 1024:
-            return False
-        os.makedirs(os.path.dirname(save_path) or ".", exist_ok=True)
-        with open(save_path, "wb") as f:
-            f.write(raw)
-        return True
-    except: return False
+            return None
+        return store_asset(raw, save_path)
+    except: return None
+
+VOLATILE_TAGS = ("TIME",)   # sections whose change alone doesn't warrant a commit
+
+def material_change(old, new, volatile=VOLATILE_TAGS):
+    """True when `new` differs from `old` anywhere outside the volatile sections."""
+    for tag in volatile:
+        old, new = inject(old, tag, ""), inject(new, tag, "")
+    return old != new
 
 def _title(text):
     return {"display": True, "text": text, "fontColor": "#E0E0E0", "fontSize": 13}
@@ -82,6 +242,17 @@ def _axes(x_label="", y_label="", x_min=None, x_max=None, y_min=None, y_max=None
     if y_max is not None: y["ticks"]["max"] = y_max
     return {"xAxes": [x], "yAxes": [y]}
 
+def _wb_latest(records):
+    """iso3 -> (country, value, date) of the newest non-null World Bank record per country."""
+    latest = {}
+    for rec in records:
+        if rec.get("value") is None: continue
+        iso  = rec["countryiso3code"]
+        date = rec["date"]
+        if iso not in latest or date > latest[iso][2]:
+            latest[iso] = (rec["country"]["value"], rec["value"], date)
+    return latest
+
 def _wb_fetch(indicator, iso_codes, fallback):
     codes = ";".join(iso_codes.values())
     url   = (f"https://api.worldbank.org/v2/country/{codes}/indicator/{indicator}"
@@ -89,13 +260,7 @@ def _wb_fetch(indicator, iso_codes, fallback):
     data  = get_json(url)
     if not data or len(data) < 2 or not data[1]:
         return fallback, "est."
-    latest = {}
-    for rec in data[1]:
-        if rec.get("value") is None: continue
-        iso  = rec["countryiso3code"]
-        date = rec["date"]
-        if iso not in latest or date > latest[iso][2]:
-            latest[iso] = (rec["country"]["value"], rec["value"], date)
+    latest = _wb_latest(data[1])
     result = {}; year = None
     for iso, name in iso_codes.items():
         if iso in latest:
@@ -104,6 +269,1725 @@ def _wb_fetch(indicator, iso_codes, fallback):
     return (result, year) if result else (fallback, "est.")
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# CASSETTE — record every _fetch of a run, replay it without the network
+# --record writes url, request headers, status, response headers, body and
+# elapsed time (or the error) per request; --replay serves them back in
+# order, optionally sleeping the recorded latency, so runs can be profiled
+# and compared between commits on identical inputs. Request keys depend on the
+# date and on .cache (Range/ETag headers, TTLs), so a recording also stores a
+# snapshot of CACHE_DIR and its start time: both runs see the same "now"
+# (wall / utcnow) and a replay runs against a private copy of that snapshot.
+# A request the tape does not hold is a CassetteMiss and fails the run.
+# ══════════════════════════════════════════════════════════════════════════════
+CASSETTE_MODE  = None       # None | "record" | "replay"
+CASSETTE_PATH  = os.path.join(CACHE_DIR, "cassette.bin.gz")
+CASSETTE_SPEED = 0.0        # replay: fraction of the recorded latency to sleep (1.0 = as recorded)
+NOW_PIN        = None       # epoch s every calendar decision uses during a cassette run
+_TAPE      = {}             # (url, headers) -> [entries]; record appends, replay pops
+_TAPE_LOCK = threading.Lock()
+_TAPE_SNAP = "\0cache"      # key of the frame holding the CACHE_DIR tarball
+_TAPE_MISSES = []
+
+class CassetteMiss(Exception):
+    pass
+
+def wall():
+    """Epoch seconds for calendar logic (query dates, cache ages); durations keep using time.time()."""
+    return time.time() if NOW_PIN is None else NOW_PIN
+
+def utcnow():
+    return datetime.fromtimestamp(wall(), timezone.utc)
+
+def _cache_tar():
+    """CACHE_DIR as an uncompressed tarball, without cassettes and profiles."""
+    buf, skip = io.BytesIO(), {os.path.abspath(CASSETTE_PATH), os.path.abspath(os.path.join(CACHE_DIR, "profile"))}
+    with tarfile.open(fileobj=buf, mode="w") as tf:
+        if os.path.isdir(CACHE_DIR):
+            tf.add(CACHE_DIR, ".", filter=lambda ti: None if os.path.abspath(os.path.join(CACHE_DIR, ti.name)) in skip else ti)
+    return buf.getvalue()
+
+def _rebase_cache(path):
+    """Points CACHE_DIR and every module path under it at `path`."""
+    g, old = globals(), CACHE_DIR
+    for k, v in list(g.items()):
+        if k.isupper() and isinstance(v, str) and (v == old or v.startswith(old + os.sep)):
+            g[k] = path + v[len(old):]
+
+def _tape_key(url, headers):
+    return url + ("\n" + json.dumps(headers, sort_keys=True) if headers else "")
+
+def cassette_open(mode, path=None, speed=0.0):
+    """Switches _fetch to record into / replay from `path` (gzip of length-prefixed meta + body frames)."""
+    global CASSETTE_MODE, CASSETTE_PATH, CASSETTE_SPEED, NOW_PIN
+    CASSETTE_MODE, CASSETTE_PATH, CASSETTE_SPEED = mode, path or CASSETTE_PATH, speed
+    _TAPE.clear(); _TAPE_MISSES.clear()
+    if mode == "record":
+        NOW_PIN = time.time()
+        _TAPE[_TAPE_SNAP] = [{"at": NOW_PIN, "body": _cache_tar()}]
+        return 0
+    with gzip.open(CASSETTE_PATH, "rb") as f: raw = f.read()
+    off, n = 0, 0
+    while off < len(raw):
+        ml, bl = struct.unpack_from("<II", raw, off); off += 8
+        meta = json.loads(raw[off:off + ml]); off += ml
+        meta["body"] = raw[off:off + bl]; off += bl
+        _TAPE.setdefault(meta.pop("key"), []).append(meta); n += 1
+    snap = _TAPE.pop(_TAPE_SNAP, None)
+    if not snap: raise ValueError(f"{CASSETTE_PATH} has no .cache snapshot; record it again")
+    tmp = tempfile.mkdtemp(prefix="replay-cache-")
+    atexit.register(shutil.rmtree, tmp, True)
+    with tarfile.open(fileobj=io.BytesIO(snap[0]["body"])) as tf:
+        tf.extractall(tmp, **({"filter": "data"} if hasattr(tarfile, "data_filter") else {}))
+    _rebase_cache(tmp)
+    NOW_PIN = snap[0]["at"]
+    return n - 1
+
+def cassette_record(url, headers, call):
+    t0, e = time.time(), None
+    try: status, hdrs, body = call()
+    except Exception as x:
+        e, status, hdrs, body = x, getattr(x, "code", 0), {}, b""
+    meta = {"key": _tape_key(url, headers), "status": status, "hdrs": hdrs, "t": round(time.time() - t0, 4),
+            "err": None if e is None else ["http" if isinstance(e, urllib.error.HTTPError) else
+                                           "timeout" if isinstance(e, TimeoutError) else "error", str(getattr(e, "reason", None) or e)]}
+    with _TAPE_LOCK: _TAPE.setdefault(meta["key"], []).append({**meta, "body": body})
+    if e is not None: raise e
+    return status, hdrs, body
+
+def cassette_play(url, headers):
+    key = _tape_key(url, headers)
+    with _TAPE_LOCK:
+        q = _TAPE.get(key)
+        if not q:
+            _TAPE_MISSES.append(key)
+            print(f"  cassette miss: {key}", file=sys.stderr)
+            raise CassetteMiss(key)
+        m = q.pop(0) if len(q) > 1 else q[0]      # the last recorded answer repeats
+    if CASSETTE_SPEED: time.sleep(m["t"] * CASSETTE_SPEED)
+    if m["err"]:
+        kind, msg = m["err"]
+        if kind == "http": raise urllib.error.HTTPError(url, m["status"], msg, {}, None)
+        raise TimeoutError(msg) if kind == "timeout" else urllib.error.URLError(msg)
+    return m["status"], m["hdrs"], m["body"]
+
+def save_cassette():
+    """Writes the recorded tape; returns the number of requests (0 when not recording)."""
+    if CASSETTE_MODE != "record": return 0
+    out, n = [], 0
+    with _TAPE_LOCK:
+        for key, entries in _TAPE.items():
+            for m in entries:
+                meta = json.dumps({**{k: v for k, v in m.items() if k != "body"}, "key": key},
+                                  separators=(",", ":")).encode()
+                out += [struct.pack("<II", len(meta), len(m["body"])), meta, m["body"]]; n += 1
+    _atomic_write(CASSETTE_PATH, gzip.compress(b"".join(out), 6, mtime=0))
+    return n
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# CIRCUIT BREAKER — per-host closed / open / half-open, persisted across runs
+# A host that keeps timing out or refusing anonymous clients is skipped at once
+# (CircuitOpen) instead of costing a full timeout per request; after a cooldown
+# one request probes it, and the cooldown doubles each time the probe fails.
+# The policy ships in data.json ("breaker"), so bundle.js runs the same machine.
+# ══════════════════════════════════════════════════════════════════════════════
+BREAKER_PATH      = os.path.join(CACHE_DIR, "breaker.json")
+BREAKER_THRESHOLD = 3              # consecutive failures that open the circuit
+BREAKER_COOLDOWN  = 1800           # first open period (s); doubles per failed probe
+BREAKER_MAX       = 86400
+BREAKER_PROBE     = 60             # half-open lease: one request per this many seconds
+BREAKER_HTTP      = {401, 403, 429, 500, 502, 503, 504}   # HTTP codes that count as a failure
+_BREAKER      = None               # host -> {"state", "fails", "until", "cooldown"}; loaded lazily
+_BREAKER_LOCK = threading.Lock()
+
+class CircuitOpen(Exception):
+    pass
+
+def _breaker():
+    global _BREAKER
+    if _BREAKER is None:
+        try:
+            with open(BREAKER_PATH, encoding="utf-8") as f: _BREAKER = json.load(f)
+        except: _BREAKER = {}
+    return _BREAKER
+
+def breaker_allow(host):
+    """Raises CircuitOpen while `host` is open; lets exactly one probe through once the cooldown ends."""
+    with _BREAKER_LOCK:
+        b = _breaker().get(host)
+        if not b or b["state"] == "closed": return
+        if time.time() < b["until"]:
+            raise CircuitOpen(f"{host} circuit {b['state']} until {datetime.fromtimestamp(b['until'], timezone.utc):%H:%M} UTC")
+        b["state"], b["until"] = "half_open", time.time() + BREAKER_PROBE   # probe lease: one request, then re-probe
+
+def breaker_record(host, ok):
+    with _BREAKER_LOCK:
+        reg = _breaker()
+        b   = reg.get(host)
+        if ok:
+            if b: reg.pop(host)
+            return
+        b = reg.setdefault(host, {"state": "closed", "fails": 0, "until": 0, "cooldown": BREAKER_COOLDOWN})
+        b["fails"] += 1
+        if b["state"] == "half_open":
+            b["cooldown"] = min(BREAKER_MAX, b["cooldown"] * 2)
+        elif b["fails"] < BREAKER_THRESHOLD:
+            return
+        b["state"], b["until"] = "open", time.time() + b["cooldown"]
+
+def breaker_snapshot():
+    """Copy of the registry taken under the lock, for readers outside the fetch path."""
+    with _BREAKER_LOCK:
+        return {host: dict(b) for host, b in _breaker().items()}
+
+def save_breaker():
+    with _BREAKER_LOCK:
+        if _BREAKER is not None:
+            _atomic_write(BREAKER_PATH, json.dumps(_BREAKER, indent=1, sort_keys=True))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ADAPTIVE TIMEOUTS + HEDGING — per-endpoint latency history across runs
+# Samples are keyed by host + path + query (digits folded), so a
+# multi-MB catalog download is not judged by the same host's small requests.
+# An endpoint's timeout is TIMEOUT_MARGIN × its observed p99 (within a floor
+# and twice the caller's default); a GET still unanswered at the endpoint's p95
+# gets one duplicate, first answer wins — except Range requests and NO_HEDGE
+# hosts, whose requests spend a quota.
+# ══════════════════════════════════════════════════════════════════════════════
+LATENCY_PATH   = os.path.join(CACHE_DIR, "latency.json")
+LATENCY_KEEP   = 200        # most recent samples per endpoint
+LATENCY_MIN    = 20         # samples before a host's own numbers are trusted
+TIMEOUT_MARGIN = 2.0
+TIMEOUT_FLOOR  = 2.0        # seconds
+NO_HEDGE       = {"api.nasa.gov"}
+_LATENCY      = None        # endpoint -> [seconds, ...]; loaded lazily
+_LATENCY_LOCK = threading.Lock()
+_HEDGE_POOL   = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+
+def _latency():
+    global _LATENCY
+    if _LATENCY is None:
+        try:
+            with open(LATENCY_PATH, encoding="utf-8") as f:
+                _LATENCY = {k: v for k, v in json.load(f).items() if "/" in k}   # drop old per-host keys
+        except: _LATENCY = {}
+    return _LATENCY
+
+def endpoint(url):
+    """host/path?query with digit runs folded (dates, ids) and api_key dropped — one key per kind of request."""
+    u = urllib.parse.urlsplit(url)
+    q = "&".join(sorted(p for p in u.query.split("&") if p and not p.startswith("api_key=")))
+    return re.sub(r"\d+", "#", u.netloc + (u.path or "/") + (f"?{q}" if q else ""))
+
+def _quantile(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+def latency_record(ep, secs):
+    with _LATENCY_LOCK:
+        xs = _latency().setdefault(ep, [])
+        xs.append(round(secs, 3))
+        del xs[:-LATENCY_KEEP]
+
+def _samples(ep):
+    with _LATENCY_LOCK:
+        xs = _latency().get(ep)
+        return list(xs) if xs and len(xs) >= LATENCY_MIN else None
+
+def host_timeout(ep, default):
+    xs = _samples(ep)
+    if xs is None: return default
+    return max(TIMEOUT_FLOOR, min(2 * default, TIMEOUT_MARGIN * _quantile(xs, 0.99)))
+
+def hedge_after(ep):
+    """Seconds after which a duplicate request is worth sending (endpoint p95), or None without history."""
+    xs = _samples(ep)
+    return None if xs is None else _quantile(xs, 0.95)
+
+def _hedged(call, delay):
+    """Runs call(); if it has not answered within `delay` s, races one duplicate. First success wins."""
+    futs = [_HEDGE_POOL.submit(call)]
+    if not wait(futs, timeout=delay)[0]:
+        futs.append(_HEDGE_POOL.submit(call))
+    err = None
+    while futs:
+        done, pending = wait(futs, return_when=FIRST_COMPLETED)
+        for f in done:
+            if f.exception() is None:
+                for p in pending: p.cancel()      # loser is abandoned; its socket times out on its own
+                return f.result()
+            err = err or f.exception()
+        futs = list(pending)
+    raise err
+
+def save_latency():
+    with _LATENCY_LOCK:
+        if _LATENCY is not None:
+            _atomic_write(LATENCY_PATH, json.dumps(_LATENCY, separators=(",", ":"), sort_keys=True))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# RACING — first good result wins
+# Fallback chains used to run strictly in series, so a dead primary cost a full
+# timeout before the backup even started. first_good() starts the primary at
+# once and the alternatives after a short grace (or as soon as it fails).
+# ══════════════════════════════════════════════════════════════════════════════
+FIRST_GOOD_GRACE = 1.5      # seconds the primary runs alone
+_RACE_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="race")
+
+def _carry_deadline(fn):
+    """Wraps fn so it runs under the calling thread's run deadline (and section, for its stats) on a pool thread."""
+    dl, tag = getattr(_TLS, "deadline", None), getattr(_TLS, "section", None)
+    def run():
+        prev, _TLS.section = getattr(_TLS, "section", None), tag
+        try:
+            with deadline(dl): return fn()
+        finally: _TLS.section = prev
+    return run
+
+def first_good(*sources, grace=FIRST_GOOD_GRACE, valid=lambda r: r is not None):
+    """
+    Returns the first result from `sources` (zero-arg callables) that passes
+    `valid`, or None if none does. Exceptions count as invalid; the losers are
+    abandoned, their next _fetch still bounded by the run deadline.
+    """
+    rest = [_carry_deadline(fn) for fn in sources[1:]]
+    futs = [_RACE_POOL.submit(_carry_deadline(sources[0]))]
+    t_rest = time.time() + grace
+    while futs or rest:
+        if rest and (not futs or time.time() >= t_rest):
+            futs += [_RACE_POOL.submit(fn) for fn in rest]; rest = []
+        done, _ = wait(futs, timeout=max(0, t_rest - time.time()) if rest else None, return_when=FIRST_COMPLETED)
+        for f in done:
+            futs.remove(f)
+            try: r = f.result()
+            except: continue
+            if valid(r):
+                for p in futs: p.cancel()
+                return r
+    return None
+
+def get_json_all(urls):
+    """get_json over independent URLs concurrently; results in input order (None for failures)."""
+    return list(_RACE_POOL.map(lambda fn: fn(), [_carry_deadline(lambda u=u: get_json(u)) for u in urls]))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# NASA CLIENT — one quota for every api.nasa.gov caller
+# DEMO_KEY allows ~30 requests/hour and ~50/day per IP. nasa_get() tracks the
+# X-RateLimit-Remaining header across runs, keeps a reserve for higher-priority
+# callers, and serves recent responses from disk; DONKI events are cached per
+# day so each run only asks for the days that are new or still being revised.
+# ══════════════════════════════════════════════════════════════════════════════
+NASA_BASE     = "https://api.nasa.gov"
+NASA_RESERVE  = {0: 0, 1: 3, 2: 8}   # priority → requests left untouched (0 = README, 1 = bundle, 2 = extras)
+NASA_DIR      = os.path.join(CACHE_DIR, "nasa")
+DONKI_TTL     = 4 * 3600             # re-ask for still-open days this often
+DONKI_SETTLE  = 2                    # days after which DONKI stops revising a day's events
+DONKI_KEEP    = 60                   # days of events kept on disk
+DONKI_TIME    = {"CME": "startTime", "FLR": "beginTime", "GST": "startTime",
+                 "WSAEnlilSimulations": "modelCompletionTime"}
+_NASA_QUOTA   = None
+_NASA_LOCK    = threading.Lock()
+
+def _nasa_quota():
+    global _NASA_QUOTA
+    if _NASA_QUOTA is None:
+        try:
+            with open(os.path.join(NASA_DIR, "quota.json"), encoding="utf-8") as f: _NASA_QUOTA = json.load(f)
+        except: _NASA_QUOTA = {}
+    if wall() - _NASA_QUOTA.get("at", 0) > 3600:           # rolling hour has passed → unknown again
+        _NASA_QUOTA.update(remaining=None, at=0)
+    return _NASA_QUOTA
+
+def _nasa_note(hdrs):
+    rem = (hdrs or {}).get("x-ratelimit-remaining")
+    if rem is not None and rem.strip().isdigit():
+        with _NASA_LOCK:
+            _nasa_quota().update(remaining=int(rem), limit=(hdrs or {}).get("x-ratelimit-limit"), at=wall())
+
+def nasa_get(path, priority=0, ttl=0, stale_ok=True, **params):
+    """
+    JSON from api.nasa.gov/<path>, or None. A response younger than `ttl`
+    seconds is served from disk; a call that would dip into the reserve for
+    higher priorities is skipped, and so is a failed one — both return the
+    last stored response when `stale_ok`, else None.
+    """
+    key   = hashlib.sha1(f"{path}?{urllib.parse.urlencode(sorted(params.items()))}".encode()).hexdigest()[:16]
+    disk  = os.path.join(NASA_DIR, f"{key}.json")
+    url   = f"{NASA_BASE}/{path}?" + urllib.parse.urlencode({**params, "api_key": NASA_KEY})
+    if ("json", url) in _MEMO: return _MEMO[("json", url)]
+    try:
+        with open(disk, encoding="utf-8") as f: cached = json.load(f)
+    except: cached = None
+    if cached and wall() - cached["at"] < ttl: return cached["data"]
+    if not stale_ok: cached = None
+
+    with _NASA_LOCK:
+        q = _nasa_quota()
+        if q.get("remaining") is not None:
+            if q["remaining"] <= NASA_RESERVE[priority]: return cached and cached["data"]
+            q["remaining"] -= 1                                  # reserve our slot before the call
+    try:
+        _, hdrs, body = _fetch(url)
+        data = json.loads(body.decode()) if body.strip() else []   # DONKI answers "no events" with an empty body
+    except urllib.error.HTTPError as e:
+        _nasa_note({k.lower(): v for k, v in (e.headers or {}).items()})
+        if e.code == 429:
+            with _NASA_LOCK: _nasa_quota().update(remaining=0, at=wall())
+        return cached and cached["data"]
+    except: return cached and cached["data"]
+    _nasa_note(hdrs)
+    _memo_put(("json", url), data)
+    _atomic_write(disk, json.dumps({"at": wall(), "data": data}, separators=(",", ":")))
+    return data
+
+def save_nasa_quota():
+    with _NASA_LOCK:
+        if _NASA_QUOTA is not None:
+            _atomic_write(os.path.join(NASA_DIR, "quota.json"), json.dumps(_NASA_QUOTA))
+
+def donki_events(kind, days=7, priority=0):
+    """
+    DONKI `kind` events (CME, FLR, GST, WSAEnlilSimulations) for the last
+    `days` days, oldest first, from a per-day store. One request covers the
+    new and still-open days; settled days are never fetched again.
+    """
+    path  = os.path.join(NASA_DIR, f"donki_{kind}.json")
+    try:
+        with open(path, encoding="utf-8") as f: store = json.load(f)
+    except: store = {}
+    now   = wall()
+    today = utcnow().date()
+    want  = [(today - timedelta(days=i)).isoformat() for i in range(days - 1, -1, -1)]
+    settled = lambda d, at: at > datetime.fromisoformat(d).replace(tzinfo=timezone.utc).timestamp() + (DONKI_SETTLE + 1) * 86400
+    todo  = [d for d in want if d not in store or
+             (not settled(d, store[d]["at"]) and now - store[d]["at"] >= DONKI_TTL)]
+    if todo:
+        data = nasa_get(f"DONKI/{kind}", priority, stale_ok=False, startDate=todo[0], endDate=want[-1])
+        if isinstance(data, list):
+            fresh = {d: {"at": now, "events": []} for d in want if d >= todo[0]}
+            for ev in data or []:
+                day = (ev.get(DONKI_TIME[kind]) or "")[:10]
+                if day in fresh: fresh[day]["events"].append(ev)
+            store.update(fresh)
+            cutoff = (today - timedelta(days=DONKI_KEEP)).isoformat()
+            store  = {d: v for d, v in store.items() if d >= cutoff}
+            _atomic_write(path, json.dumps(store, separators=(",", ":"), sort_keys=True))
+    if not any(d in store for d in want): return None
+    return [ev for d in want for ev in store.get(d, {}).get("events", [])]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SPATIAL INDEX — geohash grid × time buckets for event points
+# Every event is counted into all geohash levels 1..depth, so a region/time
+# query only visits cells cut by the box edge instead of every point.
+# ══════════════════════════════════════════════════════════════════════════════
+_GH32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Non-overlapping boxes (lon0, lat0, lon1, lat1) — same split as the old FIRMS if-chain
+WORLD_REGIONS = {
+    "N.America": [(-180,   0, -30, 90)],
+    "S.America": [(-180, -90, -30,  0)],
+    "Africa":    [(-20,  -90,  55, 40)],
+    "Europe":    [(-30,   35, -20, 90), (-20, 40, 40, 90)],
+    "Asia":      [(55,     0, 180, 90), ( 40, 40, 55, 90)],
+    "Australia": [(110,  -90, 180,  0)],
+}
+
+def _gh_split(level):
+    bits = 5 * level
+    return (bits + 1) // 2, bits // 2          # (lon bits, lat bits) — geohash starts on lon
+
+def _gh_cell(lat, lon, level):
+    """Geohash cell number of a point at `level` (5 bits per level, lon/lat interleaved)."""
+    nlon, nlat = _gh_split(level)
+    xi = min(int((lon + 180.0) / 360.0 * (1 << nlon)), (1 << nlon) - 1)
+    yi = min(int((lat +  90.0) / 180.0 * (1 << nlat)), (1 << nlat) - 1)
+    cell = 0
+    for i in range(5 * level):
+        if i % 2 == 0:
+            nlon -= 1; cell = (cell << 1) | ((xi >> nlon) & 1)
+        else:
+            nlat -= 1; cell = (cell << 1) | ((yi >> nlat) & 1)
+    return cell
+
+def geohash(lat, lon, precision=5):
+    cell = _gh_cell(lat, lon, precision)
+    return "".join(_GH32[(cell >> (5 * i)) & 31] for i in range(precision - 1, -1, -1))
+
+
+class EventGrid:
+    """
+    Hierarchical geohash grid with time buckets.
+    add() is O(depth). query() / regions() sum whole cells inside the box and
+    test only the points of leaf cells its edge cuts, so region counts are
+    exact; time windows select whole bucket_s buckets. hotspots() never
+    touches raw points.
+    """
+    __slots__ = ("depth", "bucket_s", "levels", "points", "n")
+
+    def __init__(self, depth=5, bucket_s=3600):
+        self.depth    = depth
+        self.bucket_s = bucket_s
+        self.levels   = [{} for _ in range(depth + 1)]   # level -> {cell: {bucket: [count, sum]}}
+        self.points   = {}                               # leaf cell -> [(lat, lon, bucket, value)]
+        self.n        = 0
+
+    def add(self, lat, lon, t=0, value=1.0):
+        lat, lon = max(-90.0, min(90.0, lat)), ((lon + 180.0) % 360.0) - 180.0
+        cell = _gh_cell(lat, lon, self.depth)
+        b    = int(t // self.bucket_s)
+        self.points.setdefault(cell, []).append((lat, lon, b, value))
+        for lvl in range(self.depth, -1, -1):
+            slot = self.levels[lvl].setdefault(cell, {}).setdefault(b, [0, 0.0])
+            slot[0] += 1; slot[1] += value
+            cell >>= 5
+        self.n += 1
+
+    @staticmethod
+    def bounds(level, cell):
+        nlon, nlat = _gh_split(level)
+        xi = yi = 0
+        for i in range(5 * level):
+            bit = (cell >> (5 * level - 1 - i)) & 1
+            if i % 2 == 0: xi = (xi << 1) | bit
+            else:          yi = (yi << 1) | bit
+        w = 360.0 / (1 << nlon); h = 180.0 / (1 << nlat)
+        return (-180.0 + xi * w, -90.0 + yi * h, -180.0 + (xi + 1) * w, -90.0 + (yi + 1) * h)
+
+    def _span(self, t0, t1):
+        return (None if t0 is None else int(t0 // self.bucket_s),
+                None if t1 is None else int(t1 // self.bucket_s))
+
+    def _sum(self, buckets, t0, t1, acc):
+        b0, b1 = self._span(t0, t1)
+        for b, (c, s) in buckets.items():
+            if (b0 is None or b >= b0) and (b1 is None or b <= b1):
+                acc[0] += c; acc[1] += s
+
+    def _walk(self, level, cell, box, t0, t1, acc):
+        c0, r0, c1, r1 = self.bounds(level, cell)
+        x0, y0, x1, y1 = box
+        if c1 <= x0 or c0 >= x1 or r1 <= y0 or r0 >= y1:
+            return
+        if c0 >= x0 and c1 <= x1 and r0 >= y0 and r1 <= y1:
+            self._sum(self.levels[level][cell], t0, t1, acc)
+            return
+        if level == self.depth:                          # leaf cut by the box edge: test its points
+            b0, b1 = self._span(t0, t1)
+            for lat, lon, b, v in self.points[cell]:
+                if ((x0 <= lon < x1) and (y0 <= lat < y1 or lat == y1 == 90.0)
+                        and (b0 is None or b >= b0) and (b1 is None or b <= b1)):
+                    acc[0] += 1; acc[1] += v
+            return
+        nxt = self.levels[level + 1]
+        for k in range(32):
+            child = (cell << 5) | k
+            if child in nxt:
+                self._walk(level + 1, child, box, t0, t1, acc)
+
+    def query(self, box=None, t0=None, t1=None):
+        """(count, sum) of events inside box=(lon0, lat0, lon1, lat1) with t0 <= t <= t1."""
+        acc = [0, 0.0]
+        if box is None:
+            for buckets in self.levels[0].values():
+                self._sum(buckets, t0, t1, acc)
+            return acc[0], acc[1]
+        x0, y0, x1, y1 = box
+        boxes = [(x0, y0, x1, y1)] if x0 <= x1 else [(x0, y0, 180, y1), (-180, y0, x1, y1)]
+        for bx in boxes:
+            for cell in self.levels[1]:
+                self._walk(1, cell, bx, t0, t1, acc)
+        return acc[0], acc[1]
+
+    def regions(self, regions=WORLD_REGIONS, t0=None, t1=None, other="Other"):
+        """{name: (count, sum)} for non-overlapping regions; remainder goes to `other`."""
+        out = {}
+        for name, boxes in regions.items():
+            c = s = 0
+            for box in boxes:
+                bc, bs = self.query(box, t0, t1)
+                c += bc; s += bs
+            out[name] = (c, s)
+        if other:
+            tc, ts = self.query(None, t0, t1)
+            out[other] = (tc - sum(c for c, _ in out.values()),
+                          ts - sum(s for _, s in out.values()))
+        return out
+
+    def hotspots(self, level=3, k=10, t0=None, t1=None):
+        """Top-k cells at `level` as (geohash, lat, lon, count, sum), busiest first."""
+        cells = []
+        for cell, buckets in self.levels[level].items():
+            acc = [0, 0.0]
+            self._sum(buckets, t0, t1, acc)
+            if acc[0]:
+                c0, r0, c1, r1 = self.bounds(level, cell)
+                gh = "".join(_GH32[(cell >> (5 * i)) & 31] for i in range(level - 1, -1, -1))
+                cells.append((gh, round((r0 + r1) / 2, 2), round((c0 + c1) / 2, 2), acc[0], acc[1]))
+        cells.sort(key=lambda x: (-x[3], x[0]))
+        return cells[:k]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TAIL SYNC — HTTP Range fetch for append-only upstream files
+# NOAA CO2 weekly / SWPC solar-cycle grow at the end: keep the body in
+# CACHE_DIR, ask for the last `overlap` bytes onwards and let the DATASETS
+# loaders parse only what is new. The same request re-reads TAIL_PROBES small
+# windows spread over the older bytes; a changed probe or overlap, a length
+# below the stored copy or a server that ignores Range means a full fetch, and
+# the prefix is then compared locally so a pure append still parses only the
+# new rows. A full re-download every TAIL_VERIFY_DAYS bounds what the probes
+# can miss. Files revised in place (`revised`: GISTEMP re-estimates its whole
+# history every month) are never spliced: each sync is a conditional full GET.
+# Unchanged files cost one 304 (If-None-Match / If-Modified-Since) either way.
+# ══════════════════════════════════════════════════════════════════════════════
+TAIL_PROBES      = 8        # prefix windows checked with every tail request
+TAIL_PROBE_BYTES = 64
+TAIL_VERIFY_DAYS = 30
+
+def _tail_path(name, ext):
+    return os.path.join(CACHE_DIR, "tail", f"{name}.{ext}")
+
+def _tail_load(name):
+    try:
+        with open(_tail_path(name, "json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(_tail_path(name, "raw"), "rb") as f:
+            body = f.read()
+        return (meta, body) if len(body) == meta.get("length") else ({}, b"")
+    except: return {}, b""
+
+def _tail_store(name, meta, body):
+    meta = {**meta, "length": len(body)}
+    _atomic_write(_tail_path(name, "raw"), body)
+    _atomic_write(_tail_path(name, "json"), json.dumps(meta, separators=(",", ":")))
+
+def _byteranges(hdrs, body):
+    """[(start, total or None, bytes)] of a 206 response, single-part or multipart/byteranges."""
+    b = re.search(r'boundary="?([^";]+)', hdrs.get("content-type", ""))
+    if not hdrs.get("content-type", "").startswith("multipart/byteranges") or not b:
+        parts = [(hdrs.get("content-range", "").encode(), body)]
+    else:
+        parts = [(head, data) for head, sep, data in (p.partition(b"\r\n\r\n") for p in body.split(b"--" + b.group(1).encode())[1:]) if sep]
+    out = []
+    for head, data in parts:
+        m = re.search(rb"bytes (\d+)-(\d+)/(\d+|\*)", head)
+        if m: out.append((int(m.group(1)), None if m.group(3) == b"*" else int(m.group(3)),
+                          data[:int(m.group(2)) - int(m.group(1)) + 1]))
+    return out
+
+def tail_fetch(url, name, overlap=256, stable=None, revised=False):
+    """
+    Returns (body bytes, keep) where body[:keep] is byte-identical to the
+    previous run's copy (keep=0 when the old bytes changed). `stable` is how
+    much of the old copy must survive unchanged (default all of it; a JSON
+    array's closing bracket is allowed to move); `overlap` should cover the
+    span upstream revises in place, and `revised` skips Range altogether for
+    files rewritten anywhere. Never raises; on network failure the stored copy
+    is returned unchanged, or (None, 0) if there is none.
+    """
+    meta, old = _tail_load(name)
+    if meta.get("url") != url: meta, old = {}, b""
+    stable = len(old) if stable is None else min(stable, len(old))
+
+    def full():
+        cond = {h: meta[k] for h, k in (("If-None-Match", "etag"), ("If-Modified-Since", "modified")) if old and meta.get(k)}
+        try:
+            status, rh, body = _fetch(url, cond)
+        except Exception as e:
+            if getattr(e, "code", None) != 304: return (old, len(old)) if old else (None, 0)
+            status = 304                                          # urllib raises on 304
+        if status == 304:                                         # the validator vouches for every byte
+            _atomic_write(_tail_path(name, "json"), json.dumps({**meta, "full": wall()}, separators=(",", ":")))
+            return old, len(old)
+        keep = stable if old and body.startswith(old[:stable]) else 0
+        _tail_store(name, {"url": url, "etag": rh.get("etag"), "modified": rh.get("last-modified"), "full": wall()}, body)
+        return body, keep
+
+    if not old or revised or wall() - meta.get("full", 0) > TAIL_VERIFY_DAYS * 86400:
+        return full()
+    off = max(0, stable - overlap)
+    if off < 2 * TAIL_PROBES * TAIL_PROBE_BYTES: off = 0          # small enough to re-read whole
+    probes = [k * off // TAIL_PROBES for k in range(TAIL_PROBES)] if off else []
+    hdrs   = {"Range": "bytes=" + ",".join([f"{a}-{a + TAIL_PROBE_BYTES - 1}" for a in probes] + [f"{off}-"])}
+    if meta.get("etag"): hdrs["If-None-Match"] = meta["etag"]
+    if meta.get("modified"): hdrs["If-Modified-Since"] = meta["modified"]
+    try:
+        status, rh, part = _fetch(url, hdrs)
+    except urllib.error.HTTPError as e:
+        return full() if e.code == 416 else (old, len(old))      # 416: shorter than our probes → rewritten
+    except: return old, len(old)
+    if status == 304: return old, len(old)
+    if status == 200:                                             # Range ignored: we have the whole body anyway
+        keep = stable if part.startswith(old[:stable]) else 0
+        _tail_store(name, {"url": url, "etag": rh.get("etag"), "modified": rh.get("last-modified"), "full": wall()}, part)
+        return part, keep
+
+    parts = _byteranges(rh, part)
+    tail  = next((p for p in parts if p[0] <= stable and p[1] is not None and p[0] + len(p[2]) == p[1] >= stable), None)
+    same  = all(d[:stable - a] == old[a:a + len(d)][:stable - a] for a, _, d in parts if a < stable)
+    if tail is None or not same or not all(any(a <= x < a + len(d) for a, _, d in parts) for x in probes):
+        return full()
+    body = old[:stable] + tail[2][stable - tail[0]:]
+    if body != old or rh.get("etag") != meta.get("etag"):
+        _tail_store(name, {**meta, "etag": rh.get("etag") or meta.get("etag"),
+                           "modified": rh.get("last-modified") or meta.get("modified")}, body)
+    return body, stable
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DATASETS — typed columnar loaders with mmap'd binary snapshots
+# Each long series is parsed once into array columns and saved to
+# CACHE_DIR/series/<name>.bin; later loads map the file instead of parsing
+# text, and within a run every chart slices the same in-memory Table.
+# ══════════════════════════════════════════════════════════════════════════════
+NAN         = float("nan")
+_SNAP_MAGIC = b"GSD1"
+_TABLES     = {}                 # per-run memo: name -> Table
+
+GISS_COLS  = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec", "jd")
+
+
+class Table:
+    """Named typed columns of equal length; `year` is the sorted key column."""
+    __slots__ = ("name", "cols", "upto", "_mm")
+
+    def __init__(self, name, cols, upto=0, mm=None):
+        self.name = name; self.cols = cols; self.upto = upto; self._mm = mm
+
+    def __getitem__(self, col):
+        return self.cols[col]
+
+    def __len__(self):
+        return len(self.cols["year"]) if "year" in self.cols else 0
+
+    def since(self, start):
+        """Index of the first row with year >= start."""
+        return bisect.bisect_left(self.cols["year"], start)
+
+    def pairs(self, col, start=None):
+        """[(year, value)] from `start` on with missing (NaN) values dropped."""
+        ys, vs = self.cols["year"], self.cols[col]
+        return [(ys[i], vs[i]) for i in range(0 if start is None else self.since(start), len(ys))
+                if vs[i] == vs[i]]
+
+
+def _snap_path(name):
+    return os.path.join(CACHE_DIR, "series", f"{name}.bin")
+
+def _snap_save(t):
+    head, blobs, off = [], [], 0
+    for col, vals in t.cols.items():
+        tc  = getattr(vals, "typecode", None) or vals.format
+        raw = array(tc, vals).tobytes() if not isinstance(vals, array) else vals.tobytes()
+        raw += b"\0" * (-len(raw) % 8)
+        head.append([col, tc, off, len(vals)]); blobs.append(raw); off += len(raw)
+    meta  = json.dumps({"cols": head, "upto": t.upto}, separators=(",", ":")).encode()
+    meta += b" " * (-(len(meta) + 8) % 8)       # keep column data 8-byte aligned
+    _atomic_write(_snap_path(t.name), _SNAP_MAGIC + struct.pack("<I", len(meta)) + meta + b"".join(blobs))
+
+def _snap_load(name):
+    try:
+        with open(_snap_path(name), "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:4] != _SNAP_MAGIC: return None
+        n    = struct.unpack_from("<I", mm, 4)[0]
+        meta = json.loads(mm[8:8 + n]); base = 8 + n
+        view = memoryview(mm)
+        cols = {col: view[base + off: base + off + cnt * array(tc).itemsize].cast(tc)
+                for col, tc, off, cnt in meta["cols"]}
+        return Table(name, cols, meta["upto"], mm)
+    except: return None
+
+def _sync_table(name, url, parse, types, refresh=True, overlap=256, revised=False):
+    """
+    Memoized load of one dataset. The snapshot is extended with rows parsed from
+    the bytes tail_fetch() reports as new; refresh=False skips the network and
+    returns the snapshot as-is (one mmap, no parsing).
+    """
+    if name in _TABLES: return _TABLES[name]
+    snap = _snap_load(name)
+    if snap is not None and not refresh:
+        _TABLES[name] = snap; return snap
+    body, keep = tail_fetch(url, name, overlap, stable=snap.upto if snap else None, revised=revised)
+    table = snap or Table(name, {c: array(tc) for c, tc in types.items()})
+    if body is not None:
+        start = snap.upto if snap and 0 < snap.upto <= keep else 0
+        try:
+            rows, upto = parse(body, start)
+        except: rows, upto = None, start
+        if rows and rows["year"]:
+            base  = snap.cols if start and snap else {}
+            cols  = {c: array(tc, base.get(c, ())) for c, tc in types.items()}
+            for c in cols: cols[c].extend(rows[c])
+            table = Table(name, cols, upto)
+            _snap_save(table)
+    _TABLES[name] = table
+    return table
+
+def _num(b):
+    b = b.strip()
+    return NAN if not b or b[:1] == b"*" else float(b)
+
+def _parse_giss(body, start):
+    end  = body.rfind(b"\n") + 1
+    rows = {c: [] for c in ("year",) + GISS_COLS}
+    for m in re.finditer(rb"^(\d{4}),([^\r\n]*)", body[start:end], re.M):
+        f = m.group(2).split(b",")
+        if len(f) < 13: continue
+        rows["year"].append(int(m.group(1)))
+        for c, x in zip(GISS_COLS, f): rows[c].append(_num(x))
+    return rows, end
+
+def _parse_co2_annual(body, start):
+    end  = body.rfind(b"\n") + 1
+    rows = {"year": [], "mean": [], "unc": []}
+    for m in re.finditer(rb"^\s*(\d{4})\s+(-?[\d.]+)\s+(-?[\d.]+)", body[start:end], re.M):
+        rows["year"].append(int(m.group(1)))
+        rows["mean"].append(float(m.group(2))); rows["unc"].append(float(m.group(3)))
+    return rows, end
+
+def _parse_co2_weekly(body, start):
+    end  = body.rfind(b"\n") + 1
+    rows = {"year": [], "ymd": [], "ppm": []}
+    for m in re.finditer(rb"^\s*(\d{4})\s+(\d+)\s+(\d+)\s+([\d.]+)\s+(-?[\d.]+)", body[start:end], re.M):
+        ppm = float(m.group(5))
+        rows["year"].append(float(m.group(4)))
+        rows["ymd"].append(int(m.group(1)) * 10000 + int(m.group(2)) * 100 + int(m.group(3)))
+        rows["ppm"].append(ppm if ppm > 0 else NAN)      # -999.99 = no data that week
+    return rows, end
+
+def _parse_solar(body, start):
+    start = start or body.index(b"[") + 1
+    text  = body[start:].decode(errors="ignore")
+    rows  = {"year": [], "ssn": [], "smoothed": []}
+    dec   = json.JSONDecoder(); i = done = 0
+    while True:
+        while i < len(text) and text[i] in ", \t\r\n": i += 1
+        if i >= len(text) or text[i] == "]": break
+        try:
+            rec, i = dec.raw_decode(text, i)
+        except ValueError: break
+        tag = rec.get("time-tag", "")
+        rows["year"].append(int(tag[:4]) + (int(tag[5:7] or 1) - 0.5) / 12)
+        for c, k in (("ssn", "ssn"), ("smoothed", "smoothed_ssn")):
+            v = rec.get(k); rows[c].append(NAN if v is None else float(v))
+        done = i
+    return rows, start + len(text[:done].encode())
+
+def load_giss(refresh=True):
+    """NASA GISS GLB.Ts+dSST — year (int32) + 12 monthly columns + annual J-D, °C anomaly."""
+    return _sync_table("giss", GISS_URL, _parse_giss,
+                       {"year": "i", **{c: "d" for c in GISS_COLS}}, refresh, revised=True)    # whole history re-estimated monthly
+
+def load_co2_annual(refresh=True):
+    """NOAA GML Mauna Loa annual mean — year, mean ppm, uncertainty."""
+    return _sync_table("co2_annmean", CO2_URL, _parse_co2_annual,
+                       {"year": "i", "mean": "d", "unc": "d"}, refresh, revised=True)          # ~3 KB: a Range saves nothing
+
+def load_co2_weekly(refresh=True):
+    """NOAA GML Mauna Loa weekly mean 1974– — decimal year, yyyymmdd, ppm."""
+    return _sync_table("co2_weekly", CO2_WEEKLY_URL, _parse_co2_weekly,
+                       {"year": "d", "ymd": "i", "ppm": "d"}, refresh, overlap=8192)   # recent weeks get revised
+
+def load_solar_cycle(refresh=True):
+    """NOAA SWPC observed solar-cycle indices 1749– — decimal year, SSN, smoothed SSN."""
+    return _sync_table("solar_cycle", SOLAR_URL, _parse_solar,
+                       {"year": "d", "ssn": "d", "smoothed": "d"}, refresh, overlap=8192)   # smoothed_ssn trails ~13 months
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# POWER STORE — NASA POWER daily point series, synced incrementally
+# Each location is one snapshot table (decimal year, yyyymmdd, parameters);
+# a sync asks POWER only for the days after the last stored row, for every
+# location concurrently, and rolling stats are computed from the local rows.
+# Parameters publish at different lags (solar radiation trails T2M), so a sync
+# restarts at the oldest of the last POWER_REVISE rows still missing a value
+# and overwrites from there.
+# ══════════════════════════════════════════════════════════════════════════════
+POWER_URL      = "https://power.larc.nasa.gov/api/temporal/daily/point"
+POWER_PARAMS   = ("ALLSKY_SFC_SW_DWN", "WS10M", "T2M")
+POWER_LAG      = 2          # days before POWER publishes a date
+POWER_BACKFILL = 400        # first sync: 30-day windows plus the same window a year earlier
+POWER_FILL     = -999
+POWER_REVISE   = 14         # trailing rows re-requested while any parameter is missing
+
+def _ymd_date(ymd):
+    return datetime(ymd // 10000, ymd // 100 % 100, ymd % 100).date()
+
+def load_power(locs):
+    """{(lat, lon): Table or None} for each location, extended with any newly published days."""
+    end    = (utcnow() - timedelta(days=POWER_LAG)).date()
+    types  = {"year": "d", "ymd": "i", **{p: "d" for p in POWER_PARAMS}}
+    tables, todo = {}, []
+    for lat, lon in locs:
+        name = f"power_{lat:+07.2f}_{lon:+07.2f}"
+        t = _TABLES.get(name) or _snap_load(name)
+        tables[(lat, lon)] = t
+        if t is not None and len(t):
+            if _ymd_date(t["ymd"][-1]) >= end: continue          # nothing new published yet
+            n = len(t)
+            k = next((i for i in range(max(0, n - POWER_REVISE), n)
+                      if any(t[p][i] != t[p][i] for p in POWER_PARAMS)), n)
+            start = _ymd_date(t["ymd"][k - 1]) + timedelta(days=1) if k else _ymd_date(t["ymd"][0])
+        else:
+            start = end - timedelta(days=POWER_BACKFILL)
+        if start <= end:
+            todo.append(((lat, lon), name, f"{POWER_URL}?parameters={','.join(POWER_PARAMS)}&community=RE"
+                         f"&longitude={lon}&latitude={lat}&start={start:%Y%m%d}&end={end:%Y%m%d}&format=JSON"))
+
+    for (loc, name, _), data in zip(todo, get_json_all([u for _, _, u in todo])):
+        try: par = data["properties"]["parameter"]
+        except: continue
+        rows = [(d, [par.get(p, {}).get(d, POWER_FILL) for p in POWER_PARAMS]) for d in sorted(par[POWER_PARAMS[0]])]
+        while rows and all(v == POWER_FILL for v in rows[-1][1]): rows.pop()   # not published yet → ask next run
+        if not rows: continue
+        old  = tables[loc]
+        cut  = bisect.bisect_left(old["ymd"], int(rows[0][0])) if old is not None else 0   # re-requested rows are replaced
+        cols = {c: array(tc, old[c][:cut] if old is not None else ()) for c, tc in types.items()}
+        for d, vals in rows:
+            day = datetime.strptime(d, "%Y%m%d")
+            cols["year"].append(day.year + (day.timetuple().tm_yday - 0.5) / 365.25)
+            cols["ymd"].append(int(d))
+            for p, v in zip(POWER_PARAMS, vals): cols[p].append(NAN if v == POWER_FILL else float(v))
+        tables[loc] = Table(name, cols)
+        _snap_save(tables[loc])
+    for t in tables.values():
+        if t is not None: _TABLES[t.name] = t
+    return tables
+
+def rolling_stats(t, col, window=30):
+    """{last, mean, anom, yoy} over the trailing `window` rows; yoy compares with the window 365 days earlier."""
+    v, n = t[col], len(t)
+    def mean(a, b):
+        xs = [x for x in v[max(0, a):max(0, b)] if x == x]
+        return sum(xs) / len(xs) if xs else NAN
+    last = next((v[i] for i in range(n - 1, -1, -1) if v[i] == v[i]), NAN)
+    m    = mean(n - window, n)
+    return {"last": last, "mean": m, "anom": last - m, "yoy": m - mean(n - window - 365, n - 365) if n > 365 + window // 2 else NAN}
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# FX STORE — daily ECB reference rates (EUR base), synced incrementally
+# One snapshot table holds the whole history; a sync asks Frankfurter's range
+# endpoint only for dates after the last stored row, so the multi-year download
+# happens once. Crosses, returns and volatility are derived locally.
+# ══════════════════════════════════════════════════════════════════════════════
+FX_URL        = "https://api.frankfurter.app"
+FX_CURRENCIES = ("USD", "GBP", "JPY", "INR", "CNY", "AUD", "CAD", "CHF", "BRL", "KRW")
+FX_START      = "2024-01-01"
+FX_CHUNK      = 366         # days per range request while backfilling
+
+def load_fx():
+    """Memoized EUR-base rate Table (year, ymd, one column per currency), extended with new ECB dates."""
+    if "fx_eur" in _TABLES: return _TABLES["fx_eur"]
+    t     = _snap_load("fx_eur")
+    last  = t["ymd"][-1] if t is not None and len(t) else 0
+    start = (_ymd_date(last) + timedelta(days=1) if last else datetime.strptime(FX_START, "%Y-%m-%d").date())
+    today = utcnow().date()
+    rows  = {}
+    while start <= today:
+        end  = min(today, start + timedelta(days=FX_CHUNK - 1))
+        data = get_json(f"{FX_URL}/{start}..{end}?from=EUR&to={','.join(FX_CURRENCIES)}")
+        if not data or "rates" not in data: break
+        for d, r in data["rates"].items():
+            if int(d.replace("-", "")) > last: rows[d] = r      # the range snaps back to the previous ECB date
+        start = end + timedelta(days=1)
+    if rows:
+        types = {"year": "d", "ymd": "i", **{c: "d" for c in FX_CURRENCIES}}
+        cols  = {c: array(tc, t[c] if t is not None else ()) for c, tc in types.items()}
+        for d in sorted(rows):
+            day = datetime.strptime(d, "%Y-%m-%d")
+            cols["year"].append(day.year + (day.timetuple().tm_yday - 0.5) / 365.25)
+            cols["ymd"].append(int(d.replace("-", "")))
+            for c in FX_CURRENCIES: cols[c].append(float(rows[d].get(c, NAN)))
+        t = Table("fx_eur", cols)
+        _snap_save(t)
+    _TABLES["fx_eur"] = t                                  # a failed sync isn't retried within the run
+    return t
+
+def fx_cross(t, base="USD"):
+    """{currency: [units per 1 base]} for every stored currency plus EUR, re-based from the EUR columns."""
+    b   = t[base]
+    out = {"EUR": [1 / x if x else NAN for x in b]}
+    for c in FX_CURRENCIES:
+        if c != base: out[c] = [x / y if y else NAN for x, y in zip(t[c], b)]
+    return out
+
+def fx_stats(cols, window=20, horizon=21):
+    """{currency: (last, 1-day %, `horizon`-day %, annualised `window`-day log-return vol %)}."""
+    out = {}
+    for c, v in cols.items():
+        v = [x for x in v if x == x and x > 0]
+        if len(v) < 2: continue
+        r   = [math.log(b / a) for a, b in zip(v[-window - 1:], v[-window:])]
+        m   = sum(r) / len(r)
+        vol = math.sqrt(sum((x - m) ** 2 for x in r) / max(1, len(r) - 1) * 252) * 100
+        out[c] = (v[-1], (v[-1] / v[-2] - 1) * 100, (v[-1] / v[max(0, len(v) - 1 - horizon)] - 1) * 100, vol)
+    return out
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TLE — two-line element sets (CelesTrak / KeepTrack text)
+# Fixed-column slicing only; shared by the satellite sections and benchmarks.
+# CelesTrak refreshes GP data about every two hours and blocks clients that
+# download unchanged sets again, so every GP request goes through gp_get():
+# one download per query per GP_TTL, kept in CACHE_DIR/gp, stale on failure.
+# Downloads are spaced GP_PACE apart; a cache hit never waits.
+# ══════════════════════════════════════════════════════════════════════════════
+MU_EARTH = 398600.4418      # km³/s²
+R_EARTH  = 6378.135         # km, WGS-72 equatorial radius (the TLE convention)
+GP_TTL   = 2 * 3600
+GP_PACE  = 0.3              # seconds between CelesTrak downloads
+GP_DIR   = os.path.join(CACHE_DIR, "gp")
+_GP_LOCK = threading.Lock()
+_GP_URLS = {}               # url -> Lock: concurrent asks for one set share a download
+_GP_NEXT = [0.0]            # earliest time.time() for the next download
+
+def _gp_pace():
+    with _GP_LOCK:
+        now   = time.time()
+        start = max(now, _GP_NEXT[0])
+        _GP_NEXT[0] = start + GP_PACE
+    if start > now: time.sleep(start - now)
+
+def gp_get(url, ttl=GP_TTL):
+    """CelesTrak GP text for `url`, downloaded at most once per `ttl` seconds; the stored copy when the fetch fails."""
+    disk = os.path.join(GP_DIR, hashlib.sha1(url.encode()).hexdigest()[:16] + ".txt")
+    with _GP_LOCK: lock = _GP_URLS.setdefault(url, threading.Lock())
+    with lock:
+        try:
+            age = wall() - os.path.getmtime(disk)
+            with open(disk, encoding="utf-8") as f: cached = f.read()
+        except OSError: age, cached = None, None
+        if cached is not None and age < ttl: return cached
+        _gp_pace()
+        text = get_text(url)
+        if not text or not parse_tle(text): return cached
+        _atomic_write(disk, text)
+        os.utime(disk, (wall(), wall()))
+        return text
+
+def parse_tle(text):
+    """[(name, line1, line2)] from 2- or 3-line TLE text; unnamed sets get their NORAD id as name."""
+    out, name, l1 = [], None, None
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line: continue
+        if line[:2] == "1 " and len(line) >= 69: l1 = line
+        elif line[:2] == "2 " and l1 is not None and len(line) >= 69:
+            out.append((name or l1[2:7].strip(), l1, line)); name = l1 = None
+        else: name, l1 = line.strip(), None
+    return out
+
+def tle_elements(l2):
+    """(inclination °, eccentricity, mean motion rev/day, perigee km, apogee km) from line 2."""
+    inc = float(l2[8:16]); ecc = float("0." + l2[26:33]); mm = float(l2[52:63])
+    a   = (MU_EARTH / (mm * 2 * math.pi / 86400) ** 2) ** (1 / 3)
+    return inc, ecc, mm, a * (1 - ecc) - R_EARTH, a * (1 + ecc) - R_EARTH
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# ORBITS — screening-grade propagation and catalog conjunction screen
+# Two-body Kepler plus J2 secular drift of node, perigee and mean anomaly and
+# the TLE's ṅ/2 term. Not SGP4 — without its short-period terms it sits ~10 km
+# off in LEO over a day — but enough for a coarse screen. Elements are packed
+# ORBIT_FIELDS-wide into one flat array('d') so a time window of the screen
+# can go to the CPU pool as shared memory. Per step: apogee/perigee shells
+# drop pairs that can never meet, a spatial hash with cells one step of
+# relative motion wide finds the rest, and a linear closest-approach test plus
+# golden-section refinement gives the TCA.
+# ══════════════════════════════════════════════════════════════════════════════
+J2_EARTH     = 1.08262668e-3
+ORBIT_FIELDS = ("epoch", "a", "e", "inc", "raan", "raan_dot", "argp", "argp_dot", "m", "m_dot", "m_ddot", "rp", "ra")
+NF           = len(ORBIT_FIELDS)
+SCREEN_STEP  = 120          # s between samples for a handful of primaries; the cell grows with it
+SCREEN_MISS  = 25.0         # km — well above the propagator's ~10 km LEO error
+V_REL_MAX    = 16.0         # km/s, head-on in LEO; bounds relative motion between samples
+A_REL_MAX    = 0.02         # km/s², relative acceleration bound for the linear test
+_NEIGH       = [(dx, dy, dz) for dx in (-1, 0, 1) for dy in (-1, 0, 1) for dz in (-1, 0, 1)]
+
+def tle_epoch(l1):
+    yy = int(l1[18:20])
+    return datetime(2000 + yy if yy < 57 else 1900 + yy, 1, 1, tzinfo=timezone.utc).timestamp() + (float(l1[20:32]) - 1) * 86400
+
+def tle_orbit(l1, l2):
+    """ORBIT_FIELDS tuple (km, rad, rad/s, rad/s², unix s) from a TLE."""
+    inc  = math.radians(float(l2[8:16])); raan = math.radians(float(l2[17:25]))
+    ecc  = float("0." + l2[26:33]);       argp = math.radians(float(l2[34:42]))
+    m    = math.radians(float(l2[43:51])); n   = float(l2[52:63]) * 2 * math.pi / 86400
+    a1   = (MU_EARTH / n ** 2) ** (1 / 3) / R_EARTH                 # un-Kozai the mean motion as SGP4 does
+    d1   = 0.75 * J2_EARTH * (3 * math.cos(inc) ** 2 - 1) / (1 - ecc ** 2) ** 1.5
+    dl   = d1 / a1 ** 2
+    n   /= 1 + d1 / (a1 * (1 - dl / 3 - dl ** 2 - 134 / 81 * dl ** 3)) ** 2
+    a    = (MU_EARTH / n ** 2) ** (1 / 3)
+    k    = 1.5 * J2_EARTH * (R_EARTH / (a * (1 - ecc ** 2))) ** 2 * n
+    si2  = math.sin(inc) ** 2
+    ndot = float(l1[33:43]) * 2 * math.pi / 86400 ** 2          # ṅ/2 as printed → M += ndot·dt²
+    return (tle_epoch(l1), a, ecc, inc, raan, -k * math.cos(inc), argp, k * (2 - 2.5 * si2),
+            m, n + k * math.sqrt(1 - ecc ** 2) * (1 - 1.5 * si2), ndot, a * (1 - ecc), a * (1 + ecc))
+
+def orbit_state(el, k, t):
+    """(x, y, z, vx, vy, vz) in km, km/s (TEME-like inertial) of object k of a packed element array at unix t."""
+    o = k * NF
+    dt = t - el[o]; a = el[o + 1]; e = el[o + 2]; inc = el[o + 3]
+    n  = el[o + 9] + 2 * el[o + 10] * dt
+    M  = (el[o + 8] + el[o + 9] * dt + el[o + 10] * dt * dt) % (2 * math.pi)
+    E  = M + e * math.sin(M)
+    for _ in range(10):
+        d = (E - e * math.sin(E) - M) / (1 - e * math.cos(E)); E -= d
+        if abs(d) < 1e-10: break
+    cE, sE = math.cos(E), math.sin(E)
+    b  = math.sqrt(1 - e * e); f = a * n / (1 - e * cE)
+    W  = el[o + 4] + el[o + 5] * dt; w = el[o + 6] + el[o + 7] * dt
+    cW, sW, cw, sw, ci, si = math.cos(W), math.sin(W), math.cos(w), math.sin(w), math.cos(inc), math.sin(inc)
+    def rot(xp, yp):                                  # perifocal → inertial: R3(-Ω)·R1(-i)·R3(-ω)
+        u, v = xp * cw - yp * sw, (xp * sw + yp * cw)
+        return u * cW - v * ci * sW, u * sW + v * ci * cW, v * si
+    return (*rot(a * (cE - e), a * b * sE), *rot(-f * sE, f * b * cE))
+
+def _plane(el, k):
+    o = k * NF; a, e, inc = el[o + 1], el[o + 2], el[o + 3]
+    return (el[o], a, e, a * math.sqrt(1 - e * e), math.cos(inc), math.sin(inc), *(el[o + f] for f in range(4, 11)))
+
+def orbit_positions(planes, ks, t, sin=math.sin, cos=math.cos, tau=2 * math.pi):
+    """[(x, y, z)] for objects ks at unix t — orbit_state's position, unrolled over _plane() constants."""
+    out = []
+    for k in ks:
+        ep, a, e, ab, ci, si, W0, Wd, w0, wd, M0, Md, Mdd = planes[k]
+        dt = t - ep; M = (M0 + dt * (Md + Mdd * dt)) % tau
+        E  = M + e * sin(M)
+        if e > 1e-3:                                  # below that the first-order guess is good to metres
+            for _ in range(10):
+                d = (E - e * sin(E) - M) / (1 - e * cos(E)); E -= d
+                if abs(d) < 1e-10: break
+        xp, yp = a * (cos(E) - e), ab * sin(E)
+        W, w = W0 + Wd * dt, w0 + wd * dt
+        cW, sW, cw, sw = cos(W), sin(W), cos(w), sin(w)
+        u, v = xp * cw - yp * sw, (xp * sw + yp * cw)
+        out.append((u * cW - v * ci * sW, u * sW + v * ci * cW, v * si))
+    return out
+
+def _gap(el, i, j, t):
+    p, q = orbit_state(el, i, t), orbit_state(el, j, t)
+    return math.dist(p[:3], q[:3]), math.dist(p[3:], q[3:]), math.hypot(*p[:3]) - R_EARTH
+
+def _tca(el, i, j, lo, hi, tol=0.05):
+    """Golden-section minimum of the i–j distance on [lo, hi] → (t, km, km/s, altitude of i)."""
+    g = (math.sqrt(5) - 1) / 2
+    c, d = hi - g * (hi - lo), lo + g * (hi - lo)
+    fc, fd = _gap(el, i, j, c)[0], _gap(el, i, j, d)[0]
+    while hi - lo > tol:
+        if fc < fd: hi, d, fd = d, c, fc; c = hi - g * (hi - lo); fc = _gap(el, i, j, c)[0]
+        else:       lo, c, fc = c, d, fd; d = lo + g * (hi - lo); fd = _gap(el, i, j, d)[0]
+    t = (lo + hi) / 2
+    return (t, *_gap(el, i, j, t))
+
+def screen_window(el, active, prim, t0, nsteps, step, miss):
+    """
+    Candidate approaches among `active` objects over t0 + [0, nsteps)·step. A pair
+    is tested only if one side has prim[k] set (all set = full catalog). Returns
+    [(i, j, steps flagged, tca, km, km/s, alt km)] with each pair's best TCA refined.
+    """
+    cell   = miss + V_REL_MAX * step / 2 + A_REL_MAX * step * step / 8
+    slack  = A_REL_MAX * step * step / 8
+    n      = len(prim)
+    planes = {k: _plane(el, k) for k in active}
+    rp, ra = [el[k * NF + 11] for k in range(n)], [el[k * NF + 12] for k in range(n)]
+    query  = [k for k in active if prim[k]]
+    pos, hits = [None] * n, {}
+    for s in range(nsteps):
+        t, grid = t0 + s * step, {}
+        for k, x in zip(active, orbit_positions(planes, active, t)):
+            pos[k] = x
+            grid.setdefault((int(x[0] // cell), int(x[1] // cell), int(x[2] // cell)), []).append(k)
+        for i in query:
+            p, vi = pos[i], None
+            cx, cy, cz = int(p[0] // cell), int(p[1] // cell), int(p[2] // cell)
+            for dx, dy, dz in _NEIGH:
+                for j in grid.get((cx + dx, cy + dy, cz + dz), ()):
+                    if j == i or (prim[j] and j < i) or rp[i] > ra[j] + miss or rp[j] > ra[i] + miss: continue
+                    q = pos[j]
+                    rx, ry, rz = q[0] - p[0], q[1] - p[1], q[2] - p[2]
+                    if rx * rx + ry * ry + rz * rz > cell * cell: continue
+                    vi = vi or orbit_state(el, i, t)
+                    vj = orbit_state(el, j, t)
+                    vx, vy, vz = vj[3] - vi[3], vj[4] - vi[4], vj[5] - vi[5]
+                    vv  = vx * vx + vy * vy + vz * vz
+                    tau = max(-step / 2, min(step / 2, -(rx * vx + ry * vy + rz * vz) / vv)) if vv else 0.0
+                    dmin = math.sqrt((rx + vx * tau) ** 2 + (ry + vy * tau) ** 2 + (rz + vz * tau) ** 2)
+                    if dmin > miss + slack: continue
+                    key = (i, j) if i < j else (j, i)
+                    h = hits.get(key)
+                    if h is None: hits[key] = [1, dmin, t + tau]
+                    else:
+                        h[0] += 1
+                        if dmin < h[1]: h[1], h[2] = dmin, t + tau
+    return [(i, j, n, *_tca(el, i, j, tb - step / 2, tb + step / 2)) for (i, j), (n, _, tb) in hits.items()]
+
+def screen_step(queries):
+    """
+    Sample spacing for `queries` primaries. Cells span the relative motion of
+    one step, so with every object a primary (full catalog) the pairs per cell
+    grow with n·step²; shrinking the step as 1/√n keeps the total near n^1.5.
+    """
+    return max(15.0, min(SCREEN_STEP, SCREEN_STEP * math.sqrt(1000 / max(1, queries))))
+
+def screen(el, prim, t0, hours=24, step=None, miss=SCREEN_MISS, chunks=None):
+    """
+    Conjunction screen of a packed catalog: [(i, j, fraction of steps flagged,
+    tca, km, km/s, alt)] under `miss` km, closest first, plus the number of
+    objects propagated. The time range is split into windows that run in the CPU pool.
+    """
+    n = len(prim)
+    ps = [k for k in range(n) if prim[k]]
+    active = array("i", (k for k in range(n) if prim[k] or any(          # shells that can meet a primary
+        el[k * NF + 11] <= el[p * NF + 12] + miss and el[p * NF + 11] <= el[k * NF + 12] + miss for p in ps)))
+    step   = step or screen_step(len(ps))
+    nsteps = int(hours * 3600 / step)
+    chunks = chunks or max(1, min(nsteps, CPU_WORKERS * 2))
+    bounds = [nsteps * c // chunks for c in range(chunks + 1)]
+    best = {}
+    for part in cpu_map(screen_window, [(el, active, prim, t0 + bounds[c] * step, bounds[c + 1] - bounds[c], step, miss)
+                                        for c in range(chunks)]):
+        for i, j, cnt, *rest in part:
+            b = best.get((i, j))
+            if b is None: best[(i, j)] = [cnt, *rest]
+            else:
+                b[0] += cnt
+                if rest[1] < b[2]: b[1:] = rest
+    out = [(i, j, cnt / nsteps, t, d, v, alt) for (i, j), (cnt, t, d, v, alt) in best.items() if d <= miss]
+    out.sort(key=lambda r: r[4])
+    return out, len(active)
+
+# ── Ground geometry: batch helpers over a time grid (array('d') columns) ──
+WGS84_F = 1 / 298.257223563
+
+def _jd(t):
+    return t / 86400 + 2440587.5
+
+def gmst(t):
+    """Greenwich mean sidereal angle (rad) at unix t."""
+    return math.radians((280.46061837 + 360.98564736629 * (_jd(t) - 2451545.0)) % 360)
+
+def sun_dir(t):
+    """Unit vector to the Sun, inertial frame (Astronomical Almanac low-precision, ~0.01°)."""
+    n = _jd(t) - 2451545.0
+    g = math.radians(357.528 + 0.9856003 * n)
+    L = math.radians(280.460 + 0.9856474 * n + 1.915 * math.sin(g) + 0.020 * math.sin(2 * g))
+    e = math.radians(23.439 - 4e-7 * n)
+    return math.cos(L), math.cos(e) * math.sin(L), math.sin(e) * math.sin(L)
+
+def orbit_track(el, k, times):
+    """(x, y, z, sunlit) columns for object k over `times`: inertial km and 1/0 outside the Earth's shadow."""
+    planes = {k: _plane(el, k)}
+    xs, ys, zs, lit = array("d"), array("d"), array("d"), array("b")
+    for t in times:
+        x, y, z = orbit_positions(planes, (k,), t)[0]
+        sx, sy, sz = sun_dir(t)
+        d = x * sx + y * sy + z * sz                     # cylindrical shadow
+        xs.append(x); ys.append(y); zs.append(z)
+        lit.append(d > 0 or (x - d * sx) ** 2 + (y - d * sy) ** 2 + (z - d * sz) ** 2 > R_EARTH ** 2)
+    return xs, ys, zs, lit
+
+def to_ecef(xs, ys, zs, times):
+    """Inertial → Earth-fixed columns (rotation by GMST; polar motion and nutation ignored)."""
+    ex, ey = array("d"), array("d")
+    for x, y, t in zip(xs, ys, times):
+        th = gmst(t); c, s = math.cos(th), math.sin(th)
+        ex.append(c * x + s * y); ey.append(-s * x + c * y)
+    return ex, ey, array("d", zs)
+
+def geodetic(ex, ey, ez):
+    """(lat °, lon °, alt km) columns from Earth-fixed km, WGS-84 (Bowring, two iterations)."""
+    e2 = WGS84_F * (2 - WGS84_F)
+    lat, lon, alt = array("d"), array("d"), array("d")
+    for x, y, z in zip(ex, ey, ez):
+        p  = math.hypot(x, y)
+        ph = math.atan2(z, p * (1 - e2))
+        for _ in range(2):
+            N  = R_EARTH / math.sqrt(1 - e2 * math.sin(ph) ** 2)
+            h  = p / math.cos(ph) - N
+            ph = math.atan2(z, p * (1 - e2 * N / (N + h)))
+        lat.append(math.degrees(ph)); lon.append(math.degrees(math.atan2(y, x))); alt.append(h)
+    return lat, lon, alt
+
+def site(lat, lon, h=0.0):
+    """(Earth-fixed position km, local up unit vector) of a WGS-84 site."""
+    e2 = WGS84_F * (2 - WGS84_F)
+    ph, la = math.radians(lat), math.radians(lon)
+    N  = R_EARTH / math.sqrt(1 - e2 * math.sin(ph) ** 2)
+    up = (math.cos(ph) * math.cos(la), math.cos(ph) * math.sin(la), math.sin(ph))
+    return ((N + h) * up[0], (N + h) * up[1], (N * (1 - e2) + h) * up[2]), up
+
+def elevations(ex, ey, ez, lat, lon):
+    """Elevation (°) of each Earth-fixed point seen from a site."""
+    (ox, oy, oz), (ux, uy, uz) = site(lat, lon)
+    out = array("d")
+    for x, y, z in zip(ex, ey, ez):
+        rx, ry, rz = x - ox, y - oy, z - oz
+        out.append(math.degrees(math.asin((rx * ux + ry * uy + rz * uz) / math.sqrt(rx * rx + ry * ry + rz * rz))))
+    return out
+
+def sun_elevation(t, lat, lon):
+    """Sun elevation (°) at a site at unix t."""
+    _, (ux, uy, uz) = site(lat, lon)
+    sx, sy, sz = sun_dir(t); th = gmst(t); c, s = math.cos(th), math.sin(th)
+    return math.degrees(math.asin((c * sx + s * sy) * ux + (-s * sx + c * sy) * uy + sz * uz))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# TLE ARCHIVE — per-satellite element-set history from SatDB, stored locally
+# Each NORAD id is one file in CACHE_DIR/tle: every TLE field as the integer it
+# is printed as (epoch in 1e-8 day, angles in 1e-4°, …), one int64 column per
+# field, delta-encoded and zlib-compressed — SatDB's hourly snapshots repeat
+# the same element set, so new epochs only are appended. A sync asks for the
+# date range after the last stored snapshot; "element set in effect at t" is a
+# bisect over the epoch column and rebuilds the exact TLE lines.
+# ══════════════════════════════════════════════════════════════════════════════
+SATDB_URL      = "https://satdb.ethz.ch/api/satellitedata/"
+TLE_DIR        = os.path.join(CACHE_DIR, "tle")
+TLE_BACKFILL   = 180        # days fetched on a satellite's first sync
+TLE_CHUNK      = 30         # days per SatDB range request
+MANEUVER_KM    = 0.3        # rise in mean semi-major axis between element sets that drag can't explain
+_TLH_MAGIC     = b"TLH1"
+TLH_COLS       = ("epoch", "ndot", "nddot", "nddot_e", "bstar", "bstar_e",
+                  "inc", "raan", "ecc", "argp", "m", "mm", "rev", "elset")
+
+def tle_checksum(line):
+    return sum(int(c) if c.isdigit() else c == "-" for c in line[:68]) % 10
+
+def _tle_ints(l1, l2):
+    """TLH_COLS integers from a TLE; exact, so tle_lines() gives the lines back."""
+    num = lambda f: int(f.strip().replace(".", "") or 0)
+    exp = lambda f: (f[0] == "-") * 10 + int(f[1])          # sign of a "-0" exponent survives
+    y   = int(l1[18:20]); y += 2000 if y < 57 else 1900
+    day = (datetime(y, 1, 1, tzinfo=timezone.utc) - datetime(1970, 1, 1, tzinfo=timezone.utc)).days
+    return (day * 10 ** 8 + num(l1[20:32]) - 10 ** 8, num(l1[33:43]), int(l1[44:50]), exp(l1[50:52]),
+            int(l1[53:59]), exp(l1[59:61]), num(l2[8:16]), num(l2[17:25]), num(l2[26:33]),
+            num(l2[34:42]), num(l2[43:51]), num(l2[52:63]), num(l2[63:68]), num(l1[64:68]))
+
+class TleHistory:
+    """Element sets of one satellite, epoch-sorted; columns are int64 arrays named by TLH_COLS."""
+    __slots__ = ("norad", "name", "intl", "upto", "cols")
+
+    def __init__(self, norad, name="", intl="", upto="", cols=None):
+        self.norad, self.name, self.intl, self.upto = norad, name, intl, upto
+        self.cols = cols or {c: array("q") for c in TLH_COLS}
+
+    def __len__(self):
+        return len(self.cols["epoch"])
+
+    def times(self):
+        """Epochs as unix seconds."""
+        return [e * 0.000864 for e in self.cols["epoch"]]
+
+    def at(self, t):
+        """Index of the element set in effect at unix t (the latest with epoch <= t), or None."""
+        i = bisect.bisect_right(self.cols["epoch"], t / 0.000864) - 1
+        return i if i >= 0 else None
+
+    def lines(self, i):
+        """(line 1, line 2) of element set i, checksums included."""
+        c   = {k: v[i] for k, v in self.cols.items()}
+        d, f = divmod(c["epoch"], 10 ** 8)
+        day = datetime(1970, 1, 1) + timedelta(days=d)
+        doy = (day - datetime(day.year, 1, 1)).days + 1
+        sgn = lambda v: "-" if v < 0 else " "
+        ex  = lambda m, e: f"{sgn(m)}{abs(m):05d}{'-+'[e < 10]}{e % 10}"
+        ang = lambda v: f"{v // 10 ** 4:3d}.{v % 10 ** 4:04d}"
+        l1  = (f"1 {self.norad:>5}U {self.intl:<8} {day.year % 100:02d}{doy:03d}.{f:08d} "
+               f"{sgn(c['ndot'])}.{abs(c['ndot']):08d} {ex(c['nddot'], c['nddot_e'])} {ex(c['bstar'], c['bstar_e'])} 0 {c['elset']:>4}")
+        l2  = (f"2 {self.norad:>5} {ang(c['inc'])} {ang(c['raan'])} {c['ecc']:07d} {ang(c['argp'])} {ang(c['m'])} "
+               f"{c['mm'] // 10 ** 8:2d}.{c['mm'] % 10 ** 8:08d}{c['rev']:>5}")
+        return l1 + str(tle_checksum(l1)), l2 + str(tle_checksum(l2))
+
+    def extend(self, tles):
+        """Append (l1, l2) sets newer than the last stored epoch; returns how many were new."""
+        rows = sorted({r[0]: r for r in (_tle_ints(l1, l2) for l1, l2 in tles)}.values())
+        last = self.cols["epoch"][-1] if len(self) else -1
+        rows = [r for r in rows if r[0] > last]
+        for r in rows:
+            for c, v in zip(TLH_COLS, r): self.cols[c].append(v)
+        return len(rows)
+
+def _tlh_path(norad):
+    return os.path.join(TLE_DIR, f"{norad}.tlh")
+
+def tlh_save(h):
+    cols = [array("q", (b - a for a, b in zip((0, *h.cols[c]), h.cols[c]))) for c in TLH_COLS]   # deltas
+    meta = json.dumps({"name": h.name, "intl": h.intl, "upto": h.upto, "n": len(h)}, separators=(",", ":")).encode()
+    _atomic_write(_tlh_path(h.norad), _TLH_MAGIC + struct.pack("<I", len(meta)) + meta
+                  + zlib.compress(b"".join(c.tobytes() for c in cols), 9))
+
+def tlh_load(norad):
+    try:
+        with open(_tlh_path(norad), "rb") as f: raw = f.read()
+        if raw[:4] != _TLH_MAGIC: return None
+        n    = struct.unpack_from("<I", raw, 4)[0]
+        meta = json.loads(raw[8:8 + n])
+        body = zlib.decompress(raw[8 + n:]); w = meta["n"] * 8
+        cols = {}
+        for k, c in enumerate(TLH_COLS):
+            d = array("q"); d.frombytes(body[k * w:(k + 1) * w])
+            cols[c] = array("q", accumulate(d))
+        return TleHistory(norad, meta["name"], meta["intl"], meta["upto"], cols)
+    except: return None
+
+def _satdb_pages(url):
+    """Every result of a paginated SatDB query (follows `next`); None when a page fails."""
+    out = []
+    while url:
+        data = get_json(url)
+        if data is None: return None
+        out += data.get("results") or []
+        url = data.get("next")
+    return out
+
+def load_tle_history(norads):
+    """{norad: TleHistory} synced up to now; all satellites' range requests run concurrently, chunk by chunk."""
+    now  = utcnow().replace(second=0, microsecond=0, tzinfo=None)
+    hist = {n: tlh_load(n) or TleHistory(n) for n in norads}
+    start = {n: datetime.fromisoformat(h.upto) if h.upto else now - timedelta(days=TLE_BACKFILL) for n, h in hist.items()}
+    dirty, failed = set(), set()
+    while todo := [n for n in norads if n not in failed and start[n] < now]:
+        ends = {n: min(now, start[n] + timedelta(days=TLE_CHUNK)) for n in todo}
+        urls = [f"{SATDB_URL}?norad-id={n}&start-datetime={start[n]:%Y%m%dT%H%M}&end-datetime={ends[n]:%Y%m%dT%H%M}"
+                f"&page-size=1000" for n in todo]
+        got  = list(_RACE_POOL.map(lambda fn: fn(), [_carry_deadline(lambda u=u: _satdb_pages(u)) for u in urls]))
+        for n, res in zip(todo, got):
+            if res is None: failed.add(n); continue             # keep `upto`; the next run retries from there
+            sets = [t[0] for t in (parse_tle(r.get("norad_str") or "") for r in res) if t]
+            if sets:
+                hist[n].name = hist[n].name or re.sub(r"^0 ", "", sets[-1][0])      # 3LE names carry a "0 " prefix
+                hist[n].intl = hist[n].intl or sets[-1][1][9:17].strip()
+                hist[n].extend([(l1, l2) for _, l1, l2 in sets])
+            hist[n].upto, start[n] = ends[n].isoformat(), ends[n]
+            dirty.add(n)
+    for n in dirty: tlh_save(hist[n])
+    return hist
+
+def tle_altitudes(h):
+    """Mean altitude (km) per element set, from the mean-motion column."""
+    return [(MU_EARTH / (mm * 1e-8 * 2 * math.pi / 86400) ** 2) ** (1 / 3) - R_EARTH for mm in h.cols["mm"]]
+
+def tle_maneuvers(h, alts=None):
+    """[(unix t, Δaltitude km, Δinclination °)] where the orbit rose by more than MANEUVER_KM or changed plane."""
+    alts, inc, ts = alts or tle_altitudes(h), h.cols["inc"], h.times()
+    return [(ts[i], alts[i] - alts[i - 1], (inc[i] - inc[i - 1]) * 1e-4) for i in range(1, len(alts))
+            if alts[i] - alts[i - 1] > MANEUVER_KM or abs(inc[i] - inc[i - 1]) > 50]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SERIES PYRAMIDS — raw / monthly / yearly levels with min-max envelopes
+# Long histories are pre-aggregated once per run; a chart asks pick_level()
+# for the finest level that fits its point budget over the visible range.
+# ══════════════════════════════════════════════════════════════════════════════
+PYRAMID_LEVELS = (("monthly", 1 / 12), ("yearly", 1.0))   # bucket width in years
+
+def pyramid(t, v, levels=PYRAMID_LEVELS):
+    """
+    {"raw": {t, v}, "monthly": {t, mean, min, max}, "yearly": {...}} for a
+    series sorted by decimal year. NaNs are dropped; a level that is not
+    coarser than the one below it (e.g. monthly over monthly data) is skipped.
+    """
+    pts = [(a, b) for a, b in zip(t, v) if b == b]
+    out = {"raw": {"t": [a for a, _ in pts], "v": [b for _, b in pts]}}
+    prev = len(pts)
+    for name, width in levels:
+        lv  = {"t": [], "mean": [], "min": [], "max": []}
+        key = None
+        for a, b in pts + [(None, None)]:
+            k = None if a is None else math.floor(a / width + 1e-9)
+            if k != key and key is not None:
+                lv["t"].append(round((key + 0.5) * width, 4)); lv["mean"].append(acc / n)
+                lv["min"].append(lo); lv["max"].append(hi)
+            if a is None: break
+            if k != key:
+                key, n, acc, lo, hi = k, 0, 0.0, b, b
+            n += 1; acc += b; lo = min(lo, b); hi = max(hi, b)
+        if len(lv["t"]) < prev:
+            out[name] = lv; prev = len(lv["t"])
+    return out
+
+def pick_level(pyr, t0=None, t1=None, max_points=300):
+    """(name, columns sliced to [t0, t1]) for the finest level with <= max_points points."""
+    name = lv = None
+    for name, lv in pyr.items():
+        i = 0 if t0 is None else bisect.bisect_left(lv["t"], t0)
+        j = len(lv["t"]) if t1 is None else bisect.bisect_right(lv["t"], t1)
+        if j - i <= max_points: break
+    return name, {k: col[i:j] for k, col in lv.items()}
+
+def giss_monthly():
+    """GISS monthly anomalies flattened to (decimal year, °C) columns."""
+    g = load_giss(); t = []; v = []
+    for r in range(len(g)):
+        for m, c in enumerate(GISS_COLS[:12]):
+            t.append(g["year"][r] + (m + 0.5) / 12); v.append(g[c][r])
+    return t, v
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# CPU STAGE — process pool for CPU-bound work, arrays through shared memory
+# Sections fetch on threads; anything that would hold the GIL for long
+# (propagation, grid aggregation, downsampling, SVG rendering) goes through
+# cpu_call()/cpu_map() to a process pool sized to the runner's cores. Typed
+# arrays / memoryviews of SHARE_MIN bytes or more travel as SharedMemory
+# handles instead of pickles — in both directions — and the caller unlinks
+# them. The first call of a function runs inline and is timed; a batch whose
+# estimate stays under CPU_INLINE is not worth a pool round trip (or its
+# start-up) and runs inline too. With one core (or DASHBOARD_CPU=1)
+# everything runs inline.
+# ══════════════════════════════════════════════════════════════════════════════
+CPU_WORKERS = int(os.environ.get("DASHBOARD_CPU", "0")) or os.cpu_count() or 1
+SHARE_MIN   = 64 * 1024      # bytes; smaller arrays are cheaper to pickle
+CPU_INLINE  = 0.25           # s of estimated work below which a batch runs inline
+_CPU_COST   = {}             # fn → seconds per call, from its last inline run
+_CPU_POOL   = None
+_CPU_LOCK   = threading.Lock()
+
+@dataclass(slots=True, frozen=True)
+class SharedArray:
+    name: str
+    typecode: str
+    n: int
+
+def _share(buf):
+    """(SharedArray handle, SharedMemory) holding a copy of a typed buffer's bytes."""
+    mv  = memoryview(buf)
+    raw = mv.cast("B") if mv.format != "B" else mv
+    shm = shared_memory.SharedMemory(create=True, size=max(1, raw.nbytes))
+    shm.buf[:raw.nbytes] = raw
+    return SharedArray(shm.name, mv.format, len(mv)), shm
+
+def _attach(h):
+    # Workers share the parent's resource tracker (forkserver / spawn), which keeps
+    # a set of names: attaching re-registers a name harmlessly, while unregistering
+    # here would drop the owner's entry and its unlink would then trip a KeyError.
+    shm = shared_memory.SharedMemory(name=h.name)
+    return shm, shm.buf[:h.n * array(h.typecode).itemsize].cast(h.typecode)
+
+def _big(a):
+    return isinstance(a, (array, memoryview)) and memoryview(a).nbytes >= SHARE_MIN
+
+def _cpu_entry(fn, args, kwargs):
+    """Worker side: SharedArray args → zero-copy memoryviews; a big array result goes back the same way."""
+    held = []
+    def load(a):
+        if not isinstance(a, SharedArray): return a
+        shm, mv = _attach(a); held.append((shm, mv)); return mv
+    try:
+        res = fn(*map(load, args), **{k: load(v) for k, v in kwargs.items()})
+        if _big(res):
+            h, shm = _share(res)             # stays registered until the caller unlinks it
+            shm.close(); res = h
+        return res
+    finally:
+        for shm, mv in held:
+            try: mv.release(); shm.close()
+            except BufferError: pass        # fn kept a view; the mapping goes with the process
+
+def _cpu_pool():
+    global _CPU_POOL
+    with _CPU_LOCK:
+        if _CPU_POOL is None and CPU_WORKERS > 1:
+            methods = multiprocessing.get_all_start_methods()   # never fork: sections hold locks on other threads
+            ctx = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _CPU_POOL = ProcessPoolExecutor(CPU_WORKERS, mp_context=ctx)
+        return _CPU_POOL
+
+def _cpu_result(res):
+    if not isinstance(res, SharedArray): return res
+    shm = shared_memory.SharedMemory(name=res.name)
+    out = array(res.typecode)
+    out.frombytes(shm.buf[:res.n * out.itemsize])
+    shm.close(); shm.unlink()
+    return out
+
+def _cpu_drop(f):
+    """Unlinks the shared result of a finished future that will not be read."""
+    if f.cancelled() or f.exception() is not None or not isinstance(f.result(), SharedArray): return
+    try:
+        shm = shared_memory.SharedMemory(name=f.result().name)
+        shm.close(); shm.unlink()
+    except FileNotFoundError: pass
+
+def _cpu_release(owned, running):
+    """Unlinks the input segments now, or once the tasks still running on them are done."""
+    def unlink():
+        for shm in owned: shm.close(); shm.unlink()
+    if not running: return unlink()
+    left = [len(running)]
+    def done(f):
+        _cpu_drop(f)
+        with _CPU_LOCK:
+            left[0] -= 1
+            if left[0]: return
+        unlink()
+    for f in running: f.add_done_callback(done)
+
+def _inline(fn, calls):
+    t0  = time.perf_counter()
+    out = [fn(*c) for c in calls]
+    if calls: _CPU_COST[fn] = (time.perf_counter() - t0) / len(calls)
+    return out
+
+def cpu_map(fn, calls):
+    """[fn(*args) for args in calls] across the process pool; fn must be module-level (picklable)."""
+    calls, head = [tuple(c) for c in calls], []
+    if not calls or CPU_WORKERS <= 1: return _inline(fn, calls)
+    if fn not in _CPU_COST:
+        head, calls = _inline(fn, calls[:1]), calls[1:]
+    if _CPU_COST[fn] * len(calls) < CPU_INLINE: return head + _inline(fn, calls)
+    pool = _cpu_pool()
+    if pool is None: return head + _inline(fn, calls)
+    owned, futs, out = [], [], []
+    def pack(a):
+        if not _big(a): return a
+        h, shm = _share(a); owned.append(shm); return h
+    try:
+        try: futs = [pool.submit(_cpu_entry, fn, [pack(a) for a in c], {}) for c in calls]
+        except (RuntimeError, OSError): return head + _inline(fn, calls)     # pool broken or shut down
+        dl = getattr(_TLS, "deadline", None)
+        _, pending = wait(futs, timeout=None if dl is None else max(0, dl - time.time()))
+        if pending:
+            raise TimeoutError(f"run budget exhausted: {len(pending)} of {len(futs)} {fn.__name__} tasks unfinished")
+        for f in futs: out.append(_cpu_result(f.result()))
+        return head + out
+    finally:
+        running = []
+        for f in futs[len(out):]:                # results nobody will read: unlink them now or on arrival
+            if f.cancel() or f.done(): _cpu_drop(f)
+            else: running.append(f)
+        _cpu_release(owned, running)
+
+def cpu_call(fn, *args):
+    return cpu_map(fn, [args])[0]
+
+def cpu_shutdown():
+    global _CPU_POOL
+    with _CPU_LOCK:
+        if _CPU_POOL is not None: _CPU_POOL.shutdown(wait=False, cancel_futures=True); _CPU_POOL = None
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SECTION REGISTRY — fetch once, render many
+# A section's fetch() returns compact records (slotted dataclasses); renderers
+# turn the same records into README Markdown, bundle JSON or a standalone SVG.
+# records() is memoized per run, so a new output format costs no network I/O.
+# ══════════════════════════════════════════════════════════════════════════════
+class Section:
+    __slots__ = ("tag", "fetch", "md", "chart", "cpu")
+
+    def __init__(self, tag, fetch, md, chart=None, cpu=None):
+        self.tag, self.fetch, self.md, self.chart, self.cpu = tag, fetch, md, chart, cpu
+
+SECTIONS = {}
+_RECORDS = {}   # per-run memo: tag -> records (None when the fetch came back empty)
+
+def section(tag, fetch, md, chart=None, cpu=None):
+    """cpu: optional module-level records → records stage, run in the CPU process pool after fetch."""
+    SECTIONS[tag] = Section(tag, fetch, md, chart, cpu)
+
+def records(tag):
+    if tag not in _RECORDS:
+        sec  = SECTIONS[tag]
+        recs = sec.fetch()
+        _RECORDS[tag] = cpu_call(sec.cpu, recs) if sec.cpu and recs is not None else recs
+    return _RECORDS[tag]
+
+def _jsonable(o):
+    """Records → plain JSON values (dataclass → dict, NaN → null)."""
+    if is_dataclass(o):           return {k: _jsonable(v) for k, v in asdict(o).items()}
+    if isinstance(o, dict):       return {k: _jsonable(v) for k, v in o.items()}
+    if isinstance(o, (list, tuple, array)): return [_jsonable(v) for v in o]
+    if isinstance(o, float) and o != o: return None
+    return o
+
+def _esc(s):
+    return str(s).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
+def svg_chart(cfg, w=600, h=300):
+    """
+    Chart.js-style config (the same dict make_chart() sends to QuickChart) →
+    standalone dark SVG. Covers the line / bar / scatter / bubble charts the
+    registered sections use; no legend, 5 y ticks, sparse x labels.
+    """
+    kind, data, opt = cfg["type"], cfg["data"], cfg.get("options", {})
+    sets, labels = data["datasets"], data.get("labels") or []
+    xy = kind in ("scatter", "bubble")
+    pts = [[(p["x"], p["y"], p.get("r", 3)) for p in ds["data"]] if xy else
+           [(i, v, 3) for i, v in enumerate(ds["data"]) if v is not None] for ds in sets]
+    flat = [p for s in pts for p in s] or [(0, 0, 0)]
+    sc = opt.get("scales", {})
+    def lim(axis, i, pad):
+        ticks = (sc.get(axis) or [{}])[0].get("ticks", {})
+        lo, hi = min(p[i] for p in flat), max(p[i] for p in flat)
+        if kind == "bar" and i == 1: lo, hi = min(lo, 0), max(hi, 0)
+        lo, hi = ticks.get("min", lo - pad), ticks.get("max", hi + pad)
+        return (lo, hi) if hi > lo else (lo - 1, hi + 1)
+    x0, x1 = lim("xAxes", 0, 0.5 if kind == "bar" else 0)
+    y0, y1 = lim("yAxes", 1, 0)
+    L, R, T, B = 52, 12, 30, 30
+    X = lambda x: L + (x - x0) / (x1 - x0) * (w - L - R)
+    Y = lambda y: h - B - (y - y0) / (y1 - y0) * (h - T - B)
+    base = Y(0 if y0 < 0 < y1 else y0)
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}" height="{h}" viewBox="0 0 {w} {h}" '
+           f'font-family="sans-serif" font-size="10">',
+           f'<rect width="{w}" height="{h}" fill="#0D1117"/>',
+           f'<text x="{w / 2:.0f}" y="18" fill="#E0E0E0" font-size="13" text-anchor="middle">'
+           f'{_esc(opt.get("title", {}).get("text", ""))}</text>']
+    for k in range(5):
+        v = y0 + (y1 - y0) * k / 4
+        out.append(f'<line x1="{L}" x2="{w - R}" y1="{Y(v):.1f}" y2="{Y(v):.1f}" stroke="#2a2f36"/>'
+                   f'<text x="{L - 4}" y="{Y(v) + 3:.1f}" fill="#B0B0B0" text-anchor="end">{v:.4g}</text>')
+    step = max(1, len(labels) // 10)
+    for i in range(0, len(labels), step):
+        out.append(f'<text x="{X(i):.1f}" y="{h - B + 14}" fill="#B0B0B0" text-anchor="middle">{_esc(labels[i])}</text>')
+    for ds, ps in zip(sets, pts):
+        col = ds.get("borderColor") or ds.get("backgroundColor") or "#4FC3F7"
+        if kind == "line" and ps:
+            line = " ".join(f"{X(x):.1f},{Y(y):.1f}" for x, y, _ in ps)
+            if ds.get("fill"):
+                out.append(f'<polygon points="{X(ps[0][0]):.1f},{base:.1f} {line} {X(ps[-1][0]):.1f},{base:.1f}" '
+                           f'fill="{ds.get("backgroundColor", "none")}"/>')
+            out.append(f'<polyline points="{line}" fill="none" stroke="{col}" stroke-width="2"/>')
+        elif kind == "bar":
+            bw = 0.8 * (w - L - R) / (x1 - x0)
+            fills = ds.get("backgroundColor")
+            for x, y, _ in ps:
+                f = fills[x] if isinstance(fills, list) else (fills or col)
+                top, bot = min(Y(y), base), max(Y(y), base)
+                out.append(f'<rect x="{X(x) - bw / 2:.1f}" y="{top:.1f}" width="{bw:.1f}" height="{max(bot - top, 1):.1f}" fill="{f}"/>')
+        else:
+            fill = ds.get("pointBackgroundColor") or ds.get("backgroundColor") or col
+            for x, y, r in ps:
+                out.append(f'<circle cx="{X(x):.1f}" cy="{Y(y):.1f}" r="{r}" fill="{fill}" stroke="{col}"/>')
+    out.append("</svg>")
+    return "\n".join(out)
+
+def _svg_or_none(*spec):
+    try: return svg_chart(*spec)
+    except: return None
+
+def _render_svg(sec, recs):
+    spec = sec.chart(recs) if sec.chart and recs is not None else None
+    return svg_chart(*spec) if spec else None
+
+RENDERERS = {
+    "md":   lambda sec, recs: sec.md(recs),
+    "json": lambda sec, recs: _jsonable(recs),
+    "svg":  _render_svg,
+}
+
+def render(tag, kind="md"):
+    return RENDERERS[kind](SECTIONS[tag], records(tag))
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # SECTION 1 — TIMESTAMP
 # ══════════════════════════════════════════════════════════════════════════════
@@ -121,55 +2005,93 @@ def _wb_fetch(indicator, iso_codes, fallback):
 
 
 # ══════════════════════════════════════════════════════════════════════════════
-# SECTION 4 — EARTHQUAKES (USGS FDSNWS)
+# SECTION 4 — EARTHQUAKES (USGS real-time feed, M5+ past week)
+# The same feed is the bundle's usgs_week, so the pages cost no extra request.
 # ══════════════════════════════════════════════════════════════════════════════
-def get_earthquakes():
-    data = get_json("https://earthquake.usgs.gov/fdsnws/event/1/query"
-                    "?format=geojson&minmagnitude=5.0&limit=40&orderby=time")
+USGS_WEEK_URL = "https://earthquake.usgs.gov/earthquakes/feed/v1.0/summary/5.0_week.geojson"
+
+@dataclass(slots=True)
+class Quake:
+    mag: float
+    place: str
+    t: float        # epoch seconds
+    lon: float
+    lat: float
+    depth: float    # km
+
+def fetch_earthquakes():
+    data = get_json(USGS_WEEK_URL)
     if not data or "features" not in data:
-        return "_Seismic data unavailable_"
-
-    features = data["features"]
-    points = []
-    rows   = []
-
-    for f in features:
-        c   = f["geometry"]["coordinates"]
-        mag = f["properties"]["mag"]
-        points.append({"x": round(c[0], 2), "y": round(c[1], 2), "r": round(mag * 2.4, 1)})
-        place = (f["properties"]["place"] or "Unknown")[:45]
-        t     = datetime.utcfromtimestamp(f["properties"]["time"]/1000).strftime("%m-%d %H:%M")
-        depth = c[2]
-        rows.append((mag, place, t, depth))
+        return None
+    out = []
+    for f in data["features"][:40]:                     # newest first
+        c, p = f["geometry"]["coordinates"], f["properties"]
+        out.append(Quake(p["mag"], (p["place"] or "Unknown")[:45], p["time"] / 1000, c[0], c[1], c[2]))
+    return out
 
+def chart_earthquakes(quakes):
     cfg = {
         "type": "bubble",
         "data": {"datasets": [{
             "label": "M5+ Events (bubble = magnitude)",
-            "data":  points,
+            "data":  [{"x": round(q.lon, 2), "y": round(q.lat, 2), "r": round(q.mag * 2.4, 1)} for q in quakes],
             "backgroundColor": "rgba(231,76,60,0.45)",
             "borderColor":     "rgba(231,76,60,0.85)",
             "borderWidth": 1
         }]},
         "options": {
-            "title":  _title(f"Global Seismic Activity — M5+ (last {len(features)} events)"),
+            "title":  _title(f"Global Seismic Activity — M5+ (last {len(quakes)} events)"),
             "legend": _legend(),
             "scales": _axes(x_label="Longitude (°)", x_min=-180, x_max=180,
                             y_label="Latitude (°)",  y_min=-90,  y_max=90)
         }
     }
-    img   = make_chart(cfg, 700, 340)
-    top10 = rows[:10]
+    return cfg, 700, 340
+
+def md_earthquakes(quakes):
+    if quakes is None:
+        return "_Seismic data unavailable_"
+    grid = EventGrid(depth=4, bucket_s=86400)
+    for q in quakes:
+        grid.add(q.lat, q.lon, q.t, 10 ** (1.5 * q.mag))
+
+    img   = make_chart(*chart_earthquakes(quakes))
     table = "| Mag | Location | UTC | Depth |\n|:----|:---------|:----|------:|\n"
-    for mag, place, t, depth in top10:
-        table += f"| **{mag:.1f}** | {place} | {t} | {depth:.0f} km |\n"
+    for q in quakes[:10]:
+        t = datetime.fromtimestamp(q.t, timezone.utc).strftime("%m-%d %H:%M")
+        table += f"| **{q.mag:.1f}** | {q.place} | {t} | {q.depth:.0f} km |\n"
+
+    # Σ 10^(1.5·M) ∝ radiated energy — region share of seismic moment
+    regions = grid.regions()
+    energy  = sum(e for _, e in regions.values()) or 1
+    table += "\n| Region | Events | Energy share |\n|:-------|-------:|-------------:|\n"
+    for reg, (cnt, e) in sorted(regions.items(), key=lambda x: (-x[1][1], x[0])):
+        if cnt: table += f"| {reg} | {cnt} | {100 * e / energy:.0f}% |\n"
 
-    return f"{img}\n\n{table}\n<sub>Source: [USGS FDSNWS](https://earthquake.usgs.gov/fdsnws/event/1/)</sub>"
+    return f"{img}\n\n{table}\n<sub>Source: [USGS real-time feeds](https://earthquake.usgs.gov/earthquakes/feed/v1.0/geojson.php)</sub>"
+
+section("EARTHQUAKES", fetch_earthquakes, md_earthquakes, chart_earthquakes)
+
+def get_earthquakes():
+    return render("EARTHQUAKES")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # SECTION 5 — ARXIV RESEARCH FEED (10 domains)
 # ══════════════════════════════════════════════════════════════════════════════
+ATOM_NS = {"atom": "http://www.w3.org/2005/Atom"}
+
+def arxiv_entries(root, limit=None):
+    """[(title, arXiv id, first two authors, published date)] from an arXiv Atom feed."""
+    out = []
+    for entry in root.findall("atom:entry", ATOM_NS)[:limit]:
+        title   = entry.find("atom:title", ATOM_NS).text.strip().replace("\n", " ")[:80]
+        aid     = entry.find("atom:id",    ATOM_NS).text.split("/abs/")[-1]
+        authors = [a.find("atom:name", ATOM_NS).text for a in entry.findall("atom:author", ATOM_NS)[:2]]
+        pub     = entry.find("atom:published", ATOM_NS).text[:10]
+        out.append((title, aid, ", ".join(authors), pub))
+    return out
+
 def get_arxiv():
     categories = [
         ("astro-ph",   "Astrophysics"),
@@ -189,13 +2111,7 @@ def get_arxiv():
                 f"&start=0&max_results=1&sortBy=submittedDate&sortOrder=descending")
         root = get_xml(url)
         if not root: continue
-        ns = {"atom": "http://www.w3.org/2005/Atom"}
-        for entry in root.findall("atom:entry", ns)[:1]:
-            title   = entry.find("atom:title", ns).text.strip().replace("\n", " ")[:80]
-            aid     = entry.find("atom:id",    ns).text.split("/abs/")[-1]
-            authors = [a.find("atom:name", ns).text for a in entry.findall("atom:author", ns)[:2]]
-            pub     = entry.find("atom:published", ns).text[:10]
-            papers.append((label, title, aid, ", ".join(authors), pub))
+        papers += [(label, *p) for p in arxiv_entries(root, 1)]
 
     if not papers: return "_No papers fetched._"
     rows = ["| # | Domain | Title | Authors | Date |",
@@ -250,81 +2166,68 @@ def get_weather_global():
 # ══════════════════════════════════════════════════════════════════════════════
 # SECTION 7 — CLIMATE: CO2 + TEMPERATURE (NASA GISS + NOAA fallback)
 # ══════════════════════════════════════════════════════════════════════════════
-def get_temperature_trend():
-    FALLBACK_YEARS = list(range(2010, 2025))
-    FALLBACK_TEMPS = [0.70,0.60,0.64,0.66,0.74,0.87,0.99,1.01,0.92,0.95,1.02,0.84,1.04,1.17,1.29]
-    years, temps = FALLBACK_YEARS, FALLBACK_TEMPS
-    try:
-        url  = "https://data.giss.nasa.gov/gistemp/tabledata_v4/GLB.Ts+dSST.csv"
-        text = get_text(url)
-        if text:
-            lines = text.strip().splitlines()
-            hi    = next((i for i, l in enumerate(lines) if l.startswith("Year")), None)
-            if hi is not None:
-                py, pt = [], []
-                for line in lines[hi + 1:]:
-                    parts = line.split(",")
-                    if len(parts) < 14: continue
-                    try:
-                        yr = int(parts[0]); jd = parts[13].strip()
-                        if yr >= 2010 and jd not in ("", "****", "***"):
-                            py.append(yr); pt.append(round(float(jd), 2))
-                    except: continue
-                if len(py) >= 5:
-                    years, temps = py, pt
-    except: pass
-
+@dataclass(slots=True)
+class YearSeries:
+    years: list
+    values: list
+    fallback: bool   # True when the live source was short/unavailable
+
+def fetch_temperature():
+    # live tail sync vs. last run's mmap snapshot; hard-coded values only if both fail
+    rows = first_good(lambda: load_giss().pairs("jd", 2010),
+                      lambda: _snap_load("giss").pairs("jd", 2010),
+                      valid=lambda r: len(r) >= 5)
+    if rows:
+        return YearSeries([y for y, _ in rows], [round(t, 2) for _, t in rows], False)
+    return YearSeries(list(range(2010, 2025)),
+                      [0.70,0.60,0.64,0.66,0.74,0.87,0.99,1.01,0.92,0.95,1.02,0.84,1.04,1.17,1.29], True)
+
+def chart_temperature(s):
     cfg = {
         "type": "line",
         "data": {"datasets": [{
             "label": "Anomaly vs 1951–1980 (°C)",
-            "data":  temps,
+            "data":  s.values,
             "borderColor": "#e74c3c",
             "backgroundColor": "rgba(231,76,60,0.12)",
             "fill": True, "pointBackgroundColor": "#e74c3c", "pointRadius": 4
         }]},
         "options": {
-            "title":  _title(f"Global Temperature Anomaly 2010–{years[-1]} — NASA GISS"),
+            "title":  _title(f"Global Temperature Anomaly 2010–{s.years[-1]} — NASA GISS"),
             "legend": _legend(),
             "scales": _axes(x_label="Year", y_label="Anomaly (°C)"),
         }
     }
-    cfg["data"]["labels"] = years
-    return make_chart(cfg, 900, 300) + "\n\n<sub>Source: [NASA GISS](https://data.giss.nasa.gov/gistemp/tabledata_v4/GLB.Ts+dSST.csv)</sub>"
+    cfg["data"]["labels"] = s.years
+    return cfg, 900, 300
 
+def md_temperature(s):
+    return make_chart(*chart_temperature(s)) + "\n\n<sub>Source: [NASA GISS](https://data.giss.nasa.gov/gistemp/tabledata_v4/GLB.Ts+dSST.csv)</sub>"
 
-def get_co2():
-    """Atmospheric CO2 — NOAA Mauna Loa monthly (no auth)."""
-    FALLBACK_YEARS = list(range(2015, 2025))
-    FALLBACK_CO2   = [400.8, 403.1, 405.0, 407.4, 409.8, 412.5, 414.7, 417.1, 419.5, 421.9]
-    years, vals = FALLBACK_YEARS, FALLBACK_CO2
+section("TEMPERATURE", fetch_temperature, md_temperature, chart_temperature)
 
-    try:
-        url  = "https://gml.noaa.gov/webdata/ccgg/trends/co2/co2_annmean_mlo.txt"
-        text = get_text(url)
-        if text:
-            py, pv = [], []
-            for line in text.splitlines():
-                if line.startswith("#") or not line.strip(): continue
-                parts = line.split()
-                if len(parts) >= 2:
-                    try:
-                        yr  = int(parts[0])
-                        val = float(parts[1])
-                        if yr >= 2010:
-                            py.append(yr); pv.append(val)
-                    except: continue
-            if len(py) >= 5:
-                years, vals = py, pv
-    except: pass
+def get_temperature_trend():
+    return render("TEMPERATURE")
 
+
+def fetch_co2():
+    """Atmospheric CO2 — NOAA Mauna Loa annual mean (no auth)."""
+    rows = first_good(lambda: load_co2_annual().pairs("mean", 2010),
+                      lambda: _snap_load("co2_annmean").pairs("mean", 2010),
+                      valid=lambda r: len(r) >= 5)
+    if rows:
+        return YearSeries([y for y, _ in rows], [v for _, v in rows], False)
+    return YearSeries(list(range(2015, 2025)),
+                      [400.8, 403.1, 405.0, 407.4, 409.8, 412.5, 414.7, 417.1, 419.5, 421.9], True)
+
+def chart_co2(s):
     cfg = {
         "type": "line",
         "data": {
-            "labels": years,
+            "labels": s.years,
             "datasets": [{
                 "label": "CO₂ ppm (annual mean, Mauna Loa)",
-                "data":  vals,
+                "data":  s.values,
                 "borderColor": "#f39c12",
                 "backgroundColor": "rgba(243,156,18,0.1)",
                 "fill": True, "pointRadius": 3, "pointBackgroundColor": "#f39c12"
@@ -336,27 +2239,52 @@ def get_co2():
             "scales": _axes(x_label="Year", y_label="CO₂ (ppm)", y_min=380)
         }
     }
-    return make_chart(cfg, 900, 300) + "\n\n<sub>Source: [NOAA GML](https://gml.noaa.gov/ccgg/trends/) — Mauna Loa Observatory</sub>"
+    return cfg, 900, 300
+
+def md_co2(s):
+    return make_chart(*chart_co2(s)) + "\n\n<sub>Source: [NOAA GML](https://gml.noaa.gov/ccgg/trends/) — Mauna Loa Observatory</sub>"
+
+section("CO2_ATMO", fetch_co2, md_co2, chart_co2)
+
+def get_co2():
+    return render("CO2_ATMO")
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # SECTION 8 — WORLD BANK: GDP, Inflation, Trade, Renewable Energy, CO2 Emissions
 # ══════════════════════════════════════════════════════════════════════════════
-def get_gdp_growth():
+@dataclass(slots=True)
+class Indicator:
+    code: str
+    year: str
+    values: dict    # country name -> latest value
+
+def fetch_gdp_growth():
     iso = {"IND":"India","CHN":"China","USA":"USA","DEU":"Germany",
            "GBR":"UK","JPN":"Japan","BRA":"Brazil","ZAF":"S.Africa"}
     fb  = {"India":6.3,"China":5.2,"USA":2.5,"Germany":-0.3,"UK":0.1,"Japan":1.9,"Brazil":2.9,"S.Africa":0.6}
     data, year = _wb_fetch("NY.GDP.MKTP.KD.ZG", iso, fb)
-    vals   = [round(v, 2) for v in data.values()]
+    return Indicator("NY.GDP.MKTP.KD.ZG", year, {k: round(v, 2) for k, v in data.items()})
+
+def chart_gdp_growth(ind):
+    vals   = list(ind.values.values())
     colors = ["#2ecc71" if v >= 0 else "#e74c3c" for v in vals]
     cfg = {
         "type": "bar",
-        "data": {"labels": list(data.keys()),
-                 "datasets": [{"label": f"GDP Growth % ({year})", "data": vals, "backgroundColor": colors}]},
-        "options": {"title": _title(f"GDP Growth Rate — Major Economies ({year})"),
+        "data": {"labels": list(ind.values),
+                 "datasets": [{"label": f"GDP Growth % ({ind.year})", "data": vals, "backgroundColor": colors}]},
+        "options": {"title": _title(f"GDP Growth Rate — Major Economies ({ind.year})"),
                     "legend": _legend(), "scales": _axes(y_label="Growth Rate (%)")}
     }
-    return make_chart(cfg, 560, 320) + f"\n\n<sub>Source: World Bank [NY.GDP.MKTP.KD.ZG](https://data.worldbank.org/indicator/NY.GDP.MKTP.KD.ZG)</sub>"
+    return cfg, 560, 320
+
+def md_gdp_growth(ind):
+    return make_chart(*chart_gdp_growth(ind)) + f"\n\n<sub>Source: World Bank [NY.GDP.MKTP.KD.ZG](https://data.worldbank.org/indicator/NY.GDP.MKTP.KD.ZG)</sub>"
+
+section("GDP", fetch_gdp_growth, md_gdp_growth, chart_gdp_growth)
+
+def get_gdp_growth():
+    return render("GDP")
 
 def get_inflation():
     iso = {"ARG":"Argentina","TUR":"Turkey","NGA":"Nigeria","BRA":"Brazil",
@@ -459,35 +2387,51 @@ def get_life_expectancy():
 # ══════════════════════════════════════════════════════════════════════════════
 # SECTION 9 — OPEN DISEASE DATA (disease.sh — COVID + flu)
 # ══════════════════════════════════════════════════════════════════════════════
-def get_disease_stats():
+@dataclass(slots=True)
+class CovidCount:
+    name: str
+    cases: int
+    deaths: int
+    recovered: int
+    tests_per_1m: float
+
+@dataclass(slots=True)
+class CovidStats:
+    world: CovidCount | None
+    top: list       # [CovidCount], most cases first
+
+def fetch_disease_stats():
     """
     disease.sh — free, no auth, COVID-19 + historical global data.
     """
     global_data = get_json("https://disease.sh/v3/covid-19/all")
-    countries   = get_json("https://disease.sh/v3/covid-19/countries?sort=cases&limit=8")
+    countries   = get_json("https://disease.sh/v3/covid-19/countries?sort=cases&limit=12")   # the pages' top 12
+    row = lambda d, name: CovidCount(name, d.get("cases", 0), d.get("deaths", 0),
+                                     d.get("recovered", 0), d.get("testsPerOneMillion", 0))
+    return CovidStats(row(global_data, "World") if global_data else None,
+                      [row(c, c.get("country", "—")) for c in (countries or [])[:8]])
 
+def md_disease_stats(s):
     lines = ["#### Global COVID-19 Cumulative Summary\n"]
-    if global_data:
-        cases      = f"{global_data.get('cases', 0):,}"
-        deaths     = f"{global_data.get('deaths', 0):,}"
-        recovered  = f"{global_data.get('recovered', 0):,}"
+    if s.world:
         lines.append(f"| Cases | Deaths | Recovered |\n|------:|-------:|----------:|")
-        lines.append(f"| {cases} | {deaths} | {recovered} |")
+        lines.append(f"| {s.world.cases:,} | {s.world.deaths:,} | {s.world.recovered:,} |")
 
     lines.append("\n#### Top Countries by Cases\n")
-    if countries:
+    if s.top:
         lines.append("| Country | Cases | Deaths | Tests/1M |")
         lines.append("|:--------|------:|-------:|---------:|")
-        for c in countries[:8]:
-            name  = c.get("country","—")[:15]
-            cases = f"{c.get('cases',0):,}"
-            deaths= f"{c.get('deaths',0):,}"
-            t1m   = f"{c.get('testsPerOneMillion',0):,.0f}"
-            lines.append(f"| {name} | {cases} | {deaths} | {t1m} |")
+        for c in s.top:
+            lines.append(f"| {c.name[:15]} | {c.cases:,} | {c.deaths:,} | {c.tests_per_1m:,.0f} |")
 
     lines.append("\n<sub>Source: [disease.sh](https://disease.sh) — Open Disease Data API, no auth</sub>")
     return "\n".join(lines)
 
+section("DISEASE", fetch_disease_stats, md_disease_stats)
+
+def get_disease_stats():
+    return render("DISEASE")
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # SECTION 10 — OPEN FOOD FACTS (world.openfoodfacts.org)
@@ -542,8 +2486,7 @@ def get_open_library():
 # ══════════════════════════════════════════════════════════════════════════════
 def get_apod_visual():
     ASSET = "assets/apod.jpg"
-    MD    = "./assets/apod.jpg"
-    today = datetime.now(timezone.utc)
+    today = utcnow()
     yyyy  = today.strftime("%Y"); mm = today.strftime("%m"); dd = today.strftime("%d")
     url   = f"https://api.wikimedia.org/feed/v1/wikipedia/en/featured/{yyyy}/{mm}/{dd}"
     data  = get_json(url)
@@ -558,8 +2501,9 @@ def get_apod_visual():
             thumb = (img_data.get("image", {}) or {}).get("source", "")
         day_str  = today.strftime("%B_%-d,_%Y")
         wiki_page = f"https://en.wikipedia.org/wiki/Wikipedia:Picture_of_the_day/{day_str}"
-        if thumb and _download_image(thumb, ASSET):
-            return (f"[![{title}]({MD})]({wiki_page})\n\n"
+        path = thumb and _download_image(thumb, ASSET)
+        if path:
+            return (f"[![{title}](./{path})]({wiki_page})\n\n"
                     f"**{title}**\n\n_{desc}_\n\n"
                     f"<sub>Source: [Wikimedia Commons](https://commons.wikimedia.org) via featured API</sub>")
     return "_([Browse Wikimedia Commons](https://commons.wikimedia.org))_"
@@ -577,12 +2521,11 @@ def get_protein_visual():
         ("4HHB", "Deoxyhaemoglobin"),
         ("1CRN", "Crambin — Smallest known protein"),
     ]
-    pdb, name = entries[datetime.now().day % len(entries)]
+    pdb, name = entries[utcnow().day % len(entries)]
     img_url   = f"https://cdn.rcsb.org/images/structures/{pdb.lower()}_assembly-1.jpeg"
-    asset     = "assets/protein.jpg"
-    md        = "./assets/protein.jpg"
-    if _download_image(img_url, asset):
-        return (f'<img src="{md}" width="100%" style="border-radius:6px;" />\n\n'
+    path      = _download_image(img_url, "assets/protein.jpg")
+    if path:
+        return (f'<img src="./{path}" width="100%" style="border-radius:6px;" />\n\n'
                 f"**{name}** &nbsp; `{pdb}`\n\n"
                 f"<sub>Source: [RCSB PDB](https://www.rcsb.org/structure/{pdb})</sub>")
     return (f"**{name}** `{pdb}`\n\n"
@@ -646,9 +2589,72 @@ def get_internet_bgp():
     return "\n".join(rows)
 
 
+# ══════════════════════════════════════════════════════════════════════════════
+# GBIF FACETS — counts for many taxa / countries / months in one request
+# occurrence/search with limit=0 and facet=… returns only the aggregate
+# counts, and repeated taxonKey filters are OR'ed, so N species cost one
+# request per GBIF_BATCH instead of N. Names resolve to GBIF keys once via
+# species/match and stay in CACHE_DIR/gbif_taxa.json.
+# ══════════════════════════════════════════════════════════════════════════════
+GBIF_API   = "https://api.gbif.org/v1"
+GBIF_TAXA  = os.path.join(CACHE_DIR, "gbif_taxa.json")
+GBIF_BATCH = 100            # taxonKey filters per request, well inside URL limits
+
+def gbif_keys(names):
+    """{scientific name: GBIF species key} — cached names first, the rest matched concurrently."""
+    try:
+        with open(GBIF_TAXA, encoding="utf-8") as f: keys = json.load(f)
+    except: keys = {}
+    todo = [n for n in names if n not in keys]
+    if todo:
+        for n, m in zip(todo, get_json_all([f"{GBIF_API}/species/match?name={urllib.parse.quote(n)}" for n in todo])):
+            k = m and (m.get("speciesKey") or m.get("usageKey"))
+            if k and m.get("matchType") != "NONE": keys[n] = k
+        if any(n in keys for n in todo): _atomic_write(GBIF_TAXA, json.dumps(keys, indent=1, sort_keys=True))
+    return {n: keys[n] for n in names if n in keys}
+
+def gbif_facet_url(facets, limit=10, **filters):
+    """occurrence/search URL returning only `facets` counts; list-valued filters repeat (OR)."""
+    q = [("limit", 0), *(("facet", f) for f in facets), ("facetLimit", limit)]
+    for k, v in filters.items():
+        q += [(k, x) for x in v] if isinstance(v, (list, tuple)) else [(k, v)]
+    return f"{GBIF_API}/occurrence/search?" + urllib.parse.urlencode(
+        [(k, str(v).lower() if isinstance(v, bool) else v) for k, v in q])
+
+def gbif_parse(data):
+    """(total, {facet: {value: count}}) from a facet response; facet names as asked (camelCase)."""
+    if not data: return None, {}
+    camel = lambda f: re.sub(r"_([a-z])", lambda m: m[1].upper(), f.lower())
+    return data.get("count"), {camel(x["field"]): {c["name"]: c["count"] for c in x.get("counts", [])}
+                               for x in data.get("facets", [])}
+
+def gbif_species_counts(names, **filters):
+    """{scientific name: occurrence count} for any number of species in ⌈n / GBIF_BATCH⌉ requests."""
+    keys  = gbif_keys(names)
+    ks    = sorted(set(keys.values()))
+    parts = get_json_all([gbif_facet_url(("speciesKey",), len(b), taxonKey=b, **filters)
+                          for b in (ks[i:i + GBIF_BATCH] for i in range(0, len(ks), GBIF_BATCH))])
+    got   = {}
+    for data in parts:
+        if data is None: return {}                  # partial counts would read as zeros
+        got.update(gbif_parse(data)[1].get("speciesKey", {}))
+    return {n: got.get(str(k), 0) for n, k in keys.items()}
+
+
 # ══════════════════════════════════════════════════════════════════════════════
 # SECTION 16 — GLOBAL FISHING WATCH (fishing vessel activity, free API key)
 # ══════════════════════════════════════════════════════════════════════════════
+FISH_TAXA = [   # (scientific name, common name) — counted with one GBIF facet query
+    ("Gadus morhua",        "Atlantic Cod"),
+    ("Thunnus thynnus",     "Atlantic Bluefin Tuna"),
+    ("Salmo salar",         "Atlantic Salmon"),
+    ("Clupea harengus",     "Atlantic Herring"),
+    ("Engraulis encrasicolus", "European Anchovy"),
+    ("Scomber scombrus",    "Atlantic Mackerel"),
+    ("Merluccius merluccius","European Hake"),
+    ("Solea solea",         "Common Sole"),
+]
+
 def get_fishing():
     """
     Global Fishing Watch public API — free registration key.
@@ -659,10 +2665,26 @@ def get_fishing():
     
     Also queries FishWatch (NOAA) for fish stock status — no key.
     """
+    FISHWATCH_URL = "https://www.fishwatch.gov/api/species"
+    GFW_URL       = ("https://gateway.api.globalfishingwatch.org/v3/vessels/search"
+                     "?query=&datasets[0]=public-global-fishing-watch:v20231026&limit=1")
+    today     = utcnow()
+    month_ago = (today - timedelta(days=30)).strftime("%Y-%m-%d")
+    m11       = today.year * 12 + today.month - 12                     # 11 months back, 0-based month index
+    trend_from = f"{m11 // 12:04d}-{m11 % 12 + 1:02d}-01"                 # whole months only: one bar per month
+    today_str = today.strftime("%Y-%m-%d")
+    fish      = dict(taxonKey=11592253, hasCoordinate=True, occurrenceStatus="PRESENT")   # Actinopterygii — ray-finned fishes
+    url_recent = gbif_facet_url(("country",), 5, eventDate=f"{month_ago},{today_str}", **fish)
+    url_trend  = gbif_facet_url(("month",), 12, eventDate=f"{trend_from},{today_str}", **fish)
+
+    # The sources are independent, not fallbacks for one another — fetch them all at once
+    fw, recent, trend, gfw = get_json_all([FISHWATCH_URL, url_recent, url_trend, GFW_URL])
+    recent, trend = gbif_parse(recent), gbif_parse(trend)
+    counts = gbif_species_counts([sci for sci, _ in FISH_TAXA], hasCoordinate=True)
+
     lines = []
 
     # ── NOAA FishWatch — US fish stock status (no auth) ──────────────────────
-    fw = get_json("https://www.fishwatch.gov/api/species")
     if fw and isinstance(fw, list):
         # Filter to marine species with stock status info
         marine = [s for s in fw if s.get("Fishing Rate") and s.get("Population Status")]
@@ -677,25 +2699,8 @@ def get_fishing():
             lines.append(f"| {name} | {frate} | {pop} | {habitat} |")
         lines.append(f"\n_Total species in NOAA database: {len(fw)}_\n")
 
-    # ── GBIF — Marine species occurrence counts (no auth) ────────────────────
-    marine_taxa = [
-        ("Gadus morhua",        "Atlantic Cod"),
-        ("Thunnus thynnus",     "Atlantic Bluefin Tuna"),
-        ("Salmo salar",         "Atlantic Salmon"),
-        ("Clupea harengus",     "Atlantic Herring"),
-        ("Engraulis encrasicolus", "European Anchovy"),
-        ("Scomber scombrus",    "Atlantic Mackerel"),
-        ("Merluccius merluccius","European Hake"),
-        ("Solea solea",         "Common Sole"),
-    ]
-    gbif_rows = []
-    for sci_name, common_name in marine_taxa:
-        url  = (f"https://api.gbif.org/v1/occurrence/search"
-                f"?scientificName={urllib.parse.quote(sci_name)}&limit=1&hasCoordinate=true")
-        data = get_json(url)
-        if data:
-            count = data.get("count", 0)
-            gbif_rows.append((common_name, sci_name, f"{count:,}"))
+    # ── GBIF — Marine species occurrence counts (no auth, one facet query) ──
+    gbif_rows = [(common, sci, f"{counts[sci]:,}") for sci, common in FISH_TAXA if sci in counts]
 
     if gbif_rows:
         lines.append("#### GBIF Marine Species — Observation Records\n")
@@ -705,24 +2710,28 @@ def get_fishing():
             lines.append(f"| {common} | _{sci}_ | {count} |")
         lines.append("")
 
-    # ── GBIF — Recent marine occurrence events (last month) ──────────────────
-    from datetime import timedelta
-    today    = datetime.now(timezone.utc)
-    month_ago = (today - timedelta(days=30)).strftime("%Y-%m-%d")
-    today_str = today.strftime("%Y-%m-%d")
-    url_recent = (f"https://api.gbif.org/v1/occurrence/search"
-                  f"?hasCoordinate=true&occurrenceStatus=PRESENT"
-                  f"&taxonKey=11592253"   # Actinopterygii — ray-finned fishes
-                  f"&eventDate={month_ago},{today_str}&limit=1")
-    recent = get_json(url_recent)
-    if recent:
-        count = recent.get("count", 0)
-        lines.append(f"_Ray-finned fish (Actinopterygii) observations in last 30 days: **{count:,}** records_\n")
+    # ── GBIF — Recent marine occurrence events (last month, by country) ──────
+    if recent[0] is not None:
+        top = ", ".join(f"{c} {n:,}" for c, n in recent[1].get("country", {}).items())
+        lines.append(f"_Ray-finned fish (Actinopterygii) observations in last 30 days: **{recent[0]:,}** records"
+                     + (f" — top countries: {top}" if top else "") + "_\n")
+
+    # ── GBIF — 12-month trend (month facet) ──────────────────────────────────
+    months = trend[1].get("month", {})
+    if months:
+        order = [(today.month + i) % 12 + 1 for i in range(12)]            # oldest month first
+        cfg = {
+            "type": "bar",
+            "data": {"labels": [datetime(2000, m, 1).strftime("%b") for m in order],
+                     "datasets": [{"label": "Ray-finned fish records", "data": [months.get(str(m), 0) for m in order],
+                                   "backgroundColor": "#1abc9c"}]},
+            "options": {"title": title_opt("GBIF — Actinopterygii Occurrences, Last 12 Months"),
+                        "legend": legend_opt, "scales": axes(yl="Records", yn=0)}
+        }
+        lines.append(chart(cfg, 800, 260) + "\n")
 
     # ── Global Fishing Watch vessel stats (public summary, no key needed) ────
     # GFW public vessel search — basic stats without key
-    gfw = get_json("https://gateway.api.globalfishingwatch.org/v3/vessels/search"
-                   "?query=&datasets[0]=public-global-fishing-watch:v20231026&limit=1")
     if gfw and gfw.get("total"):
         total_vessels = gfw["total"]
         lines.append(f"_Global Fishing Watch — Vessels in public registry: **{total_vessels:,}**_\n")
@@ -737,23 +2746,78 @@ def get_fishing():
 # ══════════════════════════════════════════════════════════════════════════════
 # SECTION 17 — EXCHANGE RATES (exchangerate-api.com / frankfurter.app)
 # ══════════════════════════════════════════════════════════════════════════════
-def get_forex():
+@dataclass(slots=True)
+class FxRates:
+    date: str
+    base: str
+    rates: dict     # currency -> units per 1 base
+    moves: dict = field(default_factory=dict)   # currency -> (1-day %, 21-day %, 20-day vol %)
+
+def fetch_forex():
     """
-    Frankfurter.app — free, no auth, ECB exchange rates.
+    Frankfurter.app — free, no auth, ECB exchange rates, read from the local
+    FX store; the `latest` endpoint only answers when the store is unavailable.
     """
-    data = get_json("https://api.frankfurter.app/latest?from=USD&to=EUR,GBP,JPY,INR,CNY,BRL,RUB,CHF,AUD,CAD")
-    if not data: return "_Forex data unavailable_"
-
-    date  = data.get("date", "—")
-    rates = data.get("rates", {})
-    rows  = [f"**USD Base Rates — {date} (ECB)**\n",
-             "| Currency | Rate vs USD |",
-             "|:---------|------------:|"]
-    for cur, rate in sorted(rates.items()):
-        rows.append(f"| {cur} | {rate:.4f} |")
+    t = load_fx()
+    if t is not None and len(t):
+        d     = str(t["ymd"][-1])
+        stats = fx_stats(fx_cross(t, "USD"))
+        return FxRates(f"{d[:4]}-{d[4:6]}-{d[6:]}", "USD",
+                       {c: round(s[0], 6) for c, s in sorted(stats.items())},
+                       {c: tuple(round(x, 3) for x in s[1:]) for c, s in sorted(stats.items())})
+    data = get_json(f"{FX_URL}/latest?from=USD&to=EUR,{','.join(c for c in FX_CURRENCIES if c != 'USD')}")
+    if not data: return None
+    return FxRates(data.get("date", "—"), data.get("base", "USD"), dict(sorted(data.get("rates", {}).items())))
+
+def chart_forex(fx):
+    if fx.moves:
+        # 21-day % change puts every currency on one axis, whatever its rate level
+        cur = sorted(fx.moves, key=lambda c: fx.moves[c][1])
+        chg = [fx.moves[c][1] for c in cur]
+        cfg = {
+            "type": "bar",
+            "data": {"labels": cur,
+                     "datasets": [{"label": f"Units per 1 {fx.base}, 21-day % change", "data": chg,
+                                   "backgroundColor": ["#e74c3c" if v < 0 else "#2ecc71" for v in chg]}]},
+            "options": {"title": _title(f"Currencies vs {fx.base} — 21-day change to {fx.date} (ECB)"),
+                        "legend": _legend(), "scales": _axes(y_label="%")}
+        }
+        return cfg, 560, 280
+    # rates span ~0.8 (GBP) to ~150 (JPY); only the near-parity ones share a readable axis
+    near = {k: v for k, v in fx.rates.items() if v < 10}
+    cfg = {
+        "type": "bar",
+        "data": {"labels": list(near),
+                 "datasets": [{"label": f"Units per 1 {fx.base}", "data": list(near.values()),
+                               "backgroundColor": "#4FC3F7"}]},
+        "options": {"title": _title(f"{fx.base} Exchange Rates — {fx.date} (ECB)"),
+                    "legend": _legend(), "scales": _axes(y_label=f"per {fx.base}")}
+    }
+    return cfg, 560, 280
+
+def md_forex(fx):
+    if fx is None: return "_Forex data unavailable_"
+    if fx.moves:
+        rows = [f"**{fx.base} Base Rates — {fx.date} (ECB)**\n",
+                f"| Currency | Rate vs {fx.base} | 1d | 21d | 20d vol (ann.) |",
+                "|:---------|------------:|----:|----:|----:|"]
+        for cur, rate in fx.rates.items():
+            d1, d21, vol = fx.moves[cur]
+            rows.append(f"| {cur} | {rate:.4f} | {d1:+.2f}% | {d21:+.2f}% | {vol:.1f}% |")
+    else:
+        rows = [f"**{fx.base} Base Rates — {fx.date} (ECB)**\n",
+                f"| Currency | Rate vs {fx.base} |",
+                "|:---------|------------:|"]
+        for cur, rate in fx.rates.items():
+            rows.append(f"| {cur} | {rate:.4f} |")
     rows.append("\n<sub>Source: [Frankfurter.app](https://www.frankfurter.app) — ECB rates, no auth</sub>")
     return "\n".join(rows)
 
+section("FOREX", fetch_forex, md_forex, chart_forex)
+
+def get_forex():
+    return render("FOREX")
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # SECTION 18 — GITHUB TRENDING (via GitHub API)
@@ -763,7 +2827,7 @@ def get_github_trending():
     GitHub Search API — no auth for public, 10 req/min.
     Most starred repos created in last 7 days.
     """
-    since = datetime.now(timezone.utc)
+    since = utcnow()
     since_str = since.strftime("%Y-%m-%d")
     url   = (f"https://api.github.com/search/repositories"
              f"?q=created:>{since_str}&sort=stars&order=desc&per_page=8")
@@ -790,7 +2854,7 @@ def get_wikipedia_trending():
     """
     Wikimedia Pageviews API — top viewed Wikipedia articles, no auth.
     """
-    today = datetime.now(timezone.utc)
+    today = utcnow()
     # Use yesterday's data (today may not be finalized)
     from datetime import timedelta
     yesterday = today - timedelta(days=1)
@@ -855,7 +2919,7 @@ def get_country_signals():
 # MAIN
 # ══════════════════════════════════════════════════════════════════════════════
 
-import csv, io
+import csv
 FIRMS_KEY = os.environ.get("FIRMS_MAP_KEY", "")
 QC = QC_BASE
 BG = DARK_BG
@@ -877,136 +2941,274 @@ legend_opt = {"labels": {"fontColor": "#B0B0B0"}}
 
 
 def get_timestamp():
-    ts = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    ts = utcnow().strftime("%Y-%m-%d %H:%M UTC")
     return f"<sub>Last Updated: **{ts}**</sub>"
 
-def get_iss():
-    pos  = jget("https://api.wheretheiss.at/v1/satellites/25544")
+# The ISS panel is computed from its TLE (ORBITS) — the same CelesTrak request
+# get_key_satellites makes — and only falls back to polling wheretheiss.at.
+ISS_TLE_URL  = "https://celestrak.org/NORAD/elements/gp.php?CATNR=25544&FORMAT=TLE"
+PASS_CITIES  = [(n, float(a), float(b)) for n, a, b in (c.split(":") for c in     # DASHBOARD_CITIES="Name:lat:lon;..."
+                os.environ.get("DASHBOARD_CITIES", "").split(";") if c.count(":") == 2)] or [
+    ("New York",  40.71, -74.01),
+    ("London",    51.51,  -0.13),
+    ("Tokyo",     35.69, 139.69),
+    ("Mumbai",    19.08,  72.88),
+    ("São Paulo", -23.55, -46.63),
+    ("Sydney",    -33.87, 151.21),
+]
+PASS_HOURS   = 72
+PASS_STEP    = 10           # s, pass-search grid
+PASS_MIN_EL  = 10.0         # degrees above the horizon
+TRACK_ORBITS = 3
+TRACK_STEP   = 30           # s, ground-track grid
+
+@dataclass(slots=True)
+class IssPass:
+    city: str
+    start: float                # unix seconds, rising through PASS_MIN_EL
+    end: float
+    max_el: float               # degrees
+    visible: bool               # ISS sunlit while the sky at the city is dark
+
+@dataclass(slots=True)
+class IssState:
+    lat: float | None = None
+    lon: float | None = None
+    alt: float = 0.0            # km
+    vel: float = 0.0            # km/s
+    visibility: str = "—"
+    footprint: float = 0.0      # km diameter
+    crew: list | None = None    # names aboard the ISS
+    in_space: int | str = "—"
+    tle: tuple | None = None    # (line 1, line 2) when the panel is propagated locally
+    t0: float = 0.0             # propagation start, unix seconds
+    track: list | None = None   # [(lat, lon)] over the next TRACK_ORBITS orbits
+    passes: list | None = None  # [IssPass] over the next PASS_HOURS
+
+def fetch_iss():
+    tle  = parse_tle(gp_get(ISS_TLE_URL) or "")
     crew = jget("http://api.open-notify.org/astros.json")
-    out  = []
-
-    if pos:
-        lat = float(pos["latitude"]);  lon = float(pos["longitude"])
-        alt = float(pos["altitude"]);  vel = float(pos["velocity"])
-        vis = pos.get("visibility", "—")
-        foot = float(pos.get("footprint", 0))
+    s = IssState()
+    if tle:
+        s.tle, s.t0 = tle[0][1:], wall() // 60 * 60
+    elif pos := jget("https://api.wheretheiss.at/v1/satellites/25544"):
+        s.lat, s.lon = float(pos["latitude"]), float(pos["longitude"])
+        s.alt, s.vel = float(pos["altitude"]), float(pos["velocity"]) / 3600     # km/h
+        s.visibility = pos.get("visibility", "—")
+        s.footprint  = float(pos.get("footprint", 0))
+    if crew and crew.get("people"):
+        s.crew     = [p["name"] for p in crew["people"] if p.get("craft") == "ISS"]
+        s.in_space = crew.get("number", "—")
+    return s
+
+def _passes(times, ex, ey, ez, lit, city, lat, lon):
+    """[IssPass] for one site from the Earth-fixed track; crossings interpolated between grid points."""
+    el  = elevations(ex, ey, ez, lat, lon)
+    cut = lambda i: times[i - 1] + (times[i] - times[i - 1]) * (PASS_MIN_EL - el[i - 1]) / (el[i] - el[i - 1])
+    out, i = [], 1
+    while i < len(el):
+        if el[i] >= PASS_MIN_EL and el[i - 1] < PASS_MIN_EL:
+            j = i
+            while j < len(el) and el[j] >= PASS_MIN_EL: j += 1
+            if j == len(el): break                                          # still up at the horizon's end
+            seen = any(lit[k] and sun_elevation(times[k], lat, lon) < -6 for k in range(i, j))
+            out.append(IssPass(city, cut(i), cut(j), max(el[i:j]), seen))
+            i = j
+        i += 1
+    return out
 
-        cfg = {
-            "type": "scatter",
-            "data": {"datasets": [{
-                "label": f"ISS @ {lat:.2f}°N  {lon:.2f}°E",
-                "data":  [{"x": round(lon, 2), "y": round(lat, 2)}],
-                "pointRadius": 14, "pointBackgroundColor": "#4FC3F7",
-                "pointBorderColor": "#ffffff", "pointBorderWidth": 2
-            }]},
-            "options": {
-                "title":  title_opt(f"ISS Live Position — Alt {alt:.0f} km · {vel:.2f} km/s"),
-                "legend": legend_opt,
-                "scales": axes("Longitude (°)", "Latitude (°)", -180, 180, -90, 90)
-            }
+def iss_orbits(s):
+    """CPU stage: position, ground track and city passes from the TLE."""
+    if s.tle is None: return s
+    el = array("d", tle_orbit(*s.tle))
+    x, y, z, *v = orbit_state(el, 0, s.t0)
+    lat, lon, alt = geodetic(*to_ecef((x,), (y,), (z,), (s.t0,)))
+    s.lat, s.lon, s.alt, s.vel = lat[0], lon[0], alt[0], math.hypot(*v)
+    s.visibility = "daylight" if orbit_track(el, 0, (s.t0,))[3][0] else "eclipsed"
+    s.footprint  = 2 * R_EARTH * math.acos(R_EARTH / (R_EARTH + s.alt))
+
+    times = array("d", (s.t0 + i * TRACK_STEP for i in range(int(TRACK_ORBITS * 2 * math.pi / el[9] / TRACK_STEP) + 1)))
+    xs, ys, zs, _ = orbit_track(el, 0, times)
+    lat, lon, _ = geodetic(*to_ecef(xs, ys, zs, times))
+    s.track = [(round(a, 2), round(b, 2)) for a, b in zip(lat, lon)]
+
+    times = array("d", (s.t0 + i * PASS_STEP for i in range(PASS_HOURS * 3600 // PASS_STEP + 1)))
+    xs, ys, zs, lit = orbit_track(el, 0, times)
+    ecef = to_ecef(xs, ys, zs, times)
+    s.passes = sorted((p for c in PASS_CITIES for p in _passes(times, *ecef, lit, *c)), key=lambda p: p.start)
+    return s
+
+def chart_iss(s):
+    if s.lat is None: return None
+    sets = [{
+        "label": f"ISS @ {s.lat:.2f}°N  {s.lon:.2f}°E",
+        "data":  [{"x": round(s.lon, 2), "y": round(s.lat, 2)}],
+        "pointRadius": 14, "pointBackgroundColor": "#4FC3F7",
+        "pointBorderColor": "#ffffff", "pointBorderWidth": 2
+    }]
+    if s.track:
+        sets.append({"label": f"Next {TRACK_ORBITS} orbits", "data": [{"x": b, "y": a} for a, b in s.track],
+                     "pointRadius": 1.5, "pointBackgroundColor": "rgba(79,195,247,0.6)", "borderWidth": 0})
+        sets.append({"label": "Pass cities", "data": [{"x": lon, "y": lat} for _, lat, lon in PASS_CITIES],
+                     "pointRadius": 5, "pointStyle": "triangle", "pointBackgroundColor": "#f39c12"})
+    cfg = {
+        "type": "scatter",
+        "data": {"datasets": sets},
+        "options": {
+            "title":  title_opt(f"ISS {'Ground Track' if s.track else 'Live Position'} — Alt {s.alt:.0f} km · {s.vel:.2f} km/s"),
+            "legend": legend_opt,
+            "scales": axes("Longitude (°)", "Latitude (°)", -180, 180, -90, 90)
         }
-        out.append(chart(cfg, 700, 320))
+    }
+    return cfg, 700, 320
+
+def md_iss(s):
+    out = []
+    if s.lat is not None:
+        out.append(chart(*chart_iss(s)))
         out.append(f"""
 | Parameter | Value |
 |:----------|------:|
-| Latitude  | {lat:.4f}° |
-| Longitude | {lon:.4f}° |
-| Altitude  | {alt:.1f} km |
-| Velocity  | {vel:.3f} km/s |
-| Visibility | {vis} |
-| Footprint  | {foot:.0f} km diameter |
+| Latitude  | {s.lat:.4f}° |
+| Longitude | {s.lon:.4f}° |
+| Altitude  | {s.alt:.1f} km |
+| Velocity  | {s.vel:.3f} km/s |
+| Visibility | {s.visibility} |
+| Footprint  | {s.footprint:.0f} km diameter |
 """)
-    if crew and crew.get("people"):
-        iss_crew = [p["name"] for p in crew["people"] if p.get("craft") == "ISS"]
-        out.append(f"**Crew aboard ISS ({len(iss_crew)}):** {' · '.join(iss_crew)}")
-        out.append(f"\n_Total humans currently in space: **{crew.get('number', '—')}**_")
-
-    out.append("\n<sub>Sources: [wheretheiss.at](https://wheretheiss.at) · [Open Notify](http://open-notify.org/) — no auth, live</sub>")
+    if s.passes is not None:
+        seen = [p for p in s.passes if p.visible]
+        out.append(f"**Visible passes, next {PASS_HOURS} h** (≥ {PASS_MIN_EL:.0f}° up, ISS sunlit, sky dark) — "
+                   f"{len(seen)} of {len(s.passes)} passes over {len(PASS_CITIES)} cities\n")
+        if seen:
+            out.append("| City | Rises (UTC) | Duration | Max elevation |")
+            out.append("|:-----|:------------|---------:|--------------:|")
+            for p in seen[:12]:
+                rise = datetime.fromtimestamp(p.start, timezone.utc).strftime("%a %H:%M")
+                out.append(f"| {p.city} | {rise} | {(p.end - p.start) / 60:.1f} min | {p.max_el:.0f}° |")
+            out.append("")
+    if s.crew is not None:
+        out.append(f"**Crew aboard ISS ({len(s.crew)}):** {' · '.join(s.crew)}")
+        out.append(f"\n_Total humans currently in space: **{s.in_space}**_")
+
+    src = ("[CelesTrak](https://celestrak.org) TLE, propagated locally" if s.tle
+           else "[wheretheiss.at](https://wheretheiss.at)")
+    out.append(f"\n<sub>Sources: {src} · [Open Notify](http://open-notify.org/) — no auth, live</sub>")
     return "\n".join(out)
 
-def get_space_weather():
+section("ISS", fetch_iss, md_iss, chart_iss, cpu=iss_orbits)
+
+def get_iss():
+    return render("ISS")
+
+@dataclass(slots=True)
+class SolarWind:
+    speed: float = 0.0          # km/s
+    density: float = 0.0        # p/cm³
+    temp: float = 0.0           # ×10³ K
+    bt: float = 0.0             # nT
+    bz: float = 0.0             # nT
+    kp: float = 0.0
+    xflux: float = 0.0          # W/m²
+    pflux: float = 0.0          # pfu
+    speed_hist: list = field(default_factory=list)
+
+def fetch_space_weather():
     plasma = get_json("https://services.swpc.noaa.gov/products/solar-wind/plasma-2-hour.json")
     mag    = get_json("https://services.swpc.noaa.gov/products/solar-wind/mag-2-hour.json")
     kpdata = get_json("https://services.swpc.noaa.gov/json/planetary_k_index_1m.json")
     xray   = get_json("https://services.swpc.noaa.gov/json/goes/primary/xrays-1-day.json")
     proton = get_json("https://services.swpc.noaa.gov/json/goes/primary/integral-protons-1-day.json")
-
-    speed = density = temp = bt = bz = kp = xflux = pflux = 0.0
-    speed_hist = []
+    s = SolarWind()
 
     if plasma and len(plasma) > 1:
         for row in plasma[1:]:
-            try: speed_hist.append(round(float(row[2]), 0))
+            try: s.speed_hist.append(round(float(row[2]), 0))
             except: pass
         try:
-            speed   = float(plasma[-1][2])
-            density = float(plasma[-1][1])
-            temp    = float(plasma[-1][3]) / 1000
+            s.speed   = float(plasma[-1][2])
+            s.density = float(plasma[-1][1])
+            s.temp    = float(plasma[-1][3]) / 1000
         except: pass
     if mag and len(mag) > 1:
-        try: bt = float(mag[-1][6]); bz = float(mag[-1][3])
+        try: s.bt = float(mag[-1][6]); s.bz = float(mag[-1][3])
         except: pass
     if kpdata:
-        try: kp = float(kpdata[-1]["kp_index"])
+        try: s.kp = float(kpdata[-1]["kp_index"])
         except: pass
     if xray and len(xray) > 1:
-        try: xflux = float(xray[-1]["flux"])
+        try: s.xflux = float(xray[-1]["flux"])
         except: pass
     if proton and len(proton) > 1:
-        try: pflux = float(proton[-1]["flux"])
+        try: s.pflux = float(proton[-1]["flux"])
         except: pass
+    return s
+
+def chart_space_weather(s):
+    # FIX: limit to 25 pts to keep QuickChart URL short enough to render
+    pts = s.speed_hist[-25:]
+    if len(pts) < 5: return None
+    sw_col = "#e74c3c" if s.kp >= 5 else ("#f39c12" if s.kp >= 3 else "#2ecc71")
+    cfg = {
+        "type": "line",
+        "data": {
+            "labels": list(range(len(pts))),
+            "datasets": [{"label": "Solar Wind Speed (km/s)", "data": pts,
+                          "borderColor": sw_col,
+                          "backgroundColor": "rgba(79,195,247,0.07)",
+                          "fill": True, "pointRadius": 0, "borderWidth": 2}]
+        },
+        "options": {
+            "title":  _title(f"Solar Wind Speed — Recent Readings ({s.speed:.0f} km/s now)"),
+            "legend": _legend(),
+            "scales": _axes(y_label="km/s")
+        }
+    }
+    return cfg, 900, 200
 
+def md_space_weather(s):
     def flare_class(f):
         if f >= 1e-4: return "**X-class** — major flare"
         if f >= 1e-5: return "**M-class** — moderate"
         if f >= 1e-6: return "**C-class** — minor"
         return "**A/B-class** — quiet"
 
-    status = "STORM" if kp >= 5 else ("ACTIVE" if kp >= 3 else "QUIET")
-    sw_col = "#e74c3c" if kp >= 5 else ("#f39c12" if kp >= 3 else "#2ecc71")
-
-    # FIX: limit to 25 pts to keep QuickChart URL short enough to render
-    trend_chart = ""
-    pts = speed_hist[-25:]
-    if len(pts) >= 5:
-        try:
-            cfg = {
-                "type": "line",
-                "data": {
-                    "labels": list(range(len(pts))),
-                    "datasets": [{"label": "Solar Wind Speed (km/s)", "data": pts,
-                                  "borderColor": sw_col,
-                                  "backgroundColor": "rgba(79,195,247,0.07)",
-                                  "fill": True, "pointRadius": 0, "borderWidth": 2}]
-                },
-                "options": {
-                    "title":  _title(f"Solar Wind Speed — Recent Readings ({speed:.0f} km/s now)"),
-                    "legend": _legend(),
-                    "scales": _axes(y_label="km/s")
-                }
-            }
-            trend_chart = make_chart(cfg, 900, 200)
-        except: pass
+    status = "STORM" if s.kp >= 5 else ("ACTIVE" if s.kp >= 3 else "QUIET")
+    spec   = chart_space_weather(s)
+    trend_chart = make_chart(*spec) if spec else ""
 
     table = f"""
 | Parameter | Value | Satellite Operations Impact |
 |:----------|------:|:----------------------------|
-| Solar Wind Speed | **{speed:.0f} km/s** | {"Elevated LEO drag" if speed > 500 else "Normal drag"} |
-| Solar Wind Density | {density:.1f} p/cm³ | {"High ram pressure" if density > 10 else "Normal"} |
-| Temperature | {temp:.0f} ×10³ K | — |
-| IMF Bz | **{bz:.1f} nT** | {"Storm driver — southward" if bz < -5 else "Quiet — northward" if bz > 2 else "Neutral"} |
-| IMF Bt (total) | {bt:.1f} nT | — |
-| Kp Index | **{kp:.1f}** | **{status}** — {"GPS disruption, radiation belt" if kp >= 4 else "Nominal satellite ops"} |
-| X-ray Flux (GOES) | {xflux:.2e} W/m² | {flare_class(xflux)} |
-| Proton Flux | {pflux:.2e} pfu | {"Radiation belt enhancement" if pflux > 10 else "Nominal"} |
+| Solar Wind Speed | **{s.speed:.0f} km/s** | {"Elevated LEO drag" if s.speed > 500 else "Normal drag"} |
+| Solar Wind Density | {s.density:.1f} p/cm³ | {"High ram pressure" if s.density > 10 else "Normal"} |
+| Temperature | {s.temp:.0f} ×10³ K | — |
+| IMF Bz | **{s.bz:.1f} nT** | {"Storm driver — southward" if s.bz < -5 else "Quiet — northward" if s.bz > 2 else "Neutral"} |
+| IMF Bt (total) | {s.bt:.1f} nT | — |
+| Kp Index | **{s.kp:.1f}** | **{status}** — {"GPS disruption, radiation belt" if s.kp >= 4 else "Nominal satellite ops"} |
+| X-ray Flux (GOES) | {s.xflux:.2e} W/m² | {flare_class(s.xflux)} |
+| Proton Flux | {s.pflux:.2e} pfu | {"Radiation belt enhancement" if s.pflux > 10 else "Nominal"} |
 """
     return (trend_chart + table +
             "\n<sub>Source: [NOAA SWPC](https://www.swpc.noaa.gov) — solar wind plasma · IMF mag · Kp · GOES X-ray · proton, no auth</sub>")
 
-def get_neos():
-    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    data  = jget(f"https://api.nasa.gov/neo/rest/v1/feed?start_date={today}&end_date={today}&api_key={NASA_KEY}")
-    if not data: return "_NEO data unavailable_"
+section("SPACE_WEATHER", fetch_space_weather, md_space_weather, chart_space_weather)
+
+def get_space_weather():
+    return render("SPACE_WEATHER")
+
+@dataclass(slots=True)
+class Neo:
+    name: str
+    hazardous: bool
+    miss_km: float
+    vel_kms: float
+    diam_m: float
+
+def fetch_neos():
+    today = utcnow().strftime("%Y-%m-%d")
+    data  = nasa_get("neo/rest/v1/feed", 0, ttl=6 * 3600, start_date=today, end_date=today)
+    if not data: return None
 
     neos = []
     for _, objs in data.get("near_earth_objects", {}).items():
@@ -1015,16 +3217,39 @@ def get_neos():
             dist = float(ca.get("miss_distance",{}).get("kilometers",0))
             vel  = float(ca.get("relative_velocity",{}).get("kilometers_per_second",0))
             diam = o.get("estimated_diameter",{}).get("meters",{}).get("estimated_diameter_max",0)
-            neos.append((o.get("name","—"), o.get("is_potentially_hazardous_asteroid",False), dist, vel, diam))
-    neos.sort(key=lambda x: x[2])
+            neos.append(Neo(o.get("name","—"), o.get("is_potentially_hazardous_asteroid",False), dist, vel, diam))
+    neos.sort(key=lambda n: (n.miss_km, n.name))
+    return neos
+
+def chart_neos(neos):
+    if not neos: return None
+    cfg = {
+        "type": "bubble",
+        "data": {"datasets": [{
+            "label": "Today's approaches (bubble = diameter)",
+            "data":  [{"x": round(n.miss_km / 1e6, 3), "y": round(n.vel_kms, 2),
+                       "r": round(min(18, 3 + n.diam_m ** 0.5 / 3), 1)} for n in neos],
+            "backgroundColor": "rgba(155,89,182,0.45)", "borderColor": "rgba(155,89,182,0.9)"
+        }]},
+        "options": {"title": _title("Near-Earth Objects — Miss Distance vs Velocity"),
+                    "legend": _legend(), "scales": _axes(x_label="Miss distance (10⁶ km)", y_label="km/s", x_min=0)}
+    }
+    return cfg, 700, 300
 
+def md_neos(neos):
+    if neos is None: return "_NEO data unavailable_"
     out  = f"**Today's near-Earth approaches: {len(neos)}**\n\n"
     out += "| Object | Hazardous | Miss Distance | Velocity | Diameter |\n"
     out += "|:-------|:---------:|--------------:|---------:|---------:|\n"
-    for name, haz, dist, vel, diam in neos[:10]:
-        out += f"| {name[:30]} | {'**YES**' if haz else 'no'} | {dist:,.0f} km | {vel:.2f} km/s | {diam:.0f} m |\n"
+    for n in neos[:10]:
+        out += f"| {n.name[:30]} | {'**YES**' if n.hazardous else 'no'} | {n.miss_km:,.0f} km | {n.vel_kms:.2f} km/s | {n.diam_m:.0f} m |\n"
     return out + f"\n<sub>Source: [NASA NeoWs](https://api.nasa.gov) — Near Earth Objects, DEMO_KEY</sub>"
 
+section("NEOS", fetch_neos, md_neos, chart_neos)
+
+def get_neos():
+    return render("NEOS")
+
 def get_celestrak():
     groups = [
         ("stations",   "Space Stations"),
@@ -1055,11 +3280,10 @@ def get_celestrak():
     table  = "| Category | Tracked Objects |\n|:---------|----------------:|\n"
 
     for gid, label in groups:
-        txt = tget(f"https://celestrak.org/NORAD/elements/gp.php?GROUP={gid}&FORMAT=TLE")
+        txt = gp_get(f"https://celestrak.org/NORAD/elements/gp.php?GROUP={gid}&FORMAT=TLE")
         cnt = len([l for l in (txt or "").splitlines() if l.strip()]) // 3
         labels.append(label); counts.append(cnt)
         table += f"| {label} | {cnt:,} |\n"
-        time.sleep(0.3)
 
     cfg = {
         "type": "horizontalBar",
@@ -1077,52 +3301,41 @@ def get_celestrak():
     return (chart(cfg, 900, 520) + "\n\n" + table +
             "\n<sub>Source: [CelesTrak](https://celestrak.org) — no auth, NORAD GP data updated daily</sub>")
 
-def get_key_satellites():
-    MU  = 398600.4418   # km³/s²
-    RE  = 6378.135      # km Earth radius
-
-    sats = [
-        ("25544", "ISS (ZARYA)"),
-        ("48274", "CSS Tiangong"),
-        ("43013", "NOAA-20"),
-        ("41335", "GOES-16"),
-        ("43226", "GOES-17"),
-        ("51850", "GOES-18"),
-        ("40697", "Sentinel-2A"),
-        ("42063", "Sentinel-2B"),
-        ("39634", "Landsat 8"),
-        ("49260", "Landsat 9"),
-        ("28654", "Terra EOS AM-1"),
-        ("27424", "Aqua EOS PM-1"),
-        ("37849", "Suomi NPP"),
-        ("43205", "ICESat-2"),
-        ("25338", "GPS IIR-2"),
-        ("44985", "Starlink-1007"),
-        ("36516", "TanDEM-X"),
-        ("32060", "ALOS"),
-    ]
+KEY_SATS = [
+    ("25544", "ISS (ZARYA)"),
+    ("48274", "CSS Tiangong"),
+    ("43013", "NOAA-20"),
+    ("41335", "GOES-16"),
+    ("43226", "GOES-17"),
+    ("51850", "GOES-18"),
+    ("40697", "Sentinel-2A"),
+    ("42063", "Sentinel-2B"),
+    ("39634", "Landsat 8"),
+    ("49260", "Landsat 9"),
+    ("28654", "Terra EOS AM-1"),
+    ("27424", "Aqua EOS PM-1"),
+    ("37849", "Suomi NPP"),
+    ("43205", "ICESat-2"),
+    ("25338", "GPS IIR-2"),
+    ("44985", "Starlink-1007"),
+    ("36516", "TanDEM-X"),
+    ("32060", "ALOS"),
+]
 
+def get_key_satellites():
+    sats = KEY_SATS
     rows = []
     for norad, name in sats:
         url  = f"https://celestrak.org/NORAD/elements/gp.php?CATNR={norad}&FORMAT=TLE"
-        txt  = tget(url)
+        txt  = gp_get(url)
         if not txt: continue
-        lines = [l for l in txt.splitlines() if l.strip()]
-        if len(lines) < 3: continue
         try:
-            l2   = lines[2]
-            mm   = float(l2[52:63])          # rev/day
-            ecc  = float("0." + l2[26:33])
-            inc  = float(l2[8:16])
-            n    = mm * 2 * math.pi / 86400
-            a    = (MU / n**2) ** (1/3)
-            apo  = round(a * (1 + ecc) - RE, 0)
-            per  = round(a * (1 - ecc) - RE, 0)
+            inc, ecc, mm, per, apo = tle_elements(parse_tle(txt)[0][2])
+            apo, per = round(apo, 0), round(per, 0)
             period = round(1440 / mm, 1)
             otype = "LEO" if apo < 2000 else ("MEO" if apo < 35000 else "GEO")
             rows.append((name, norad, f"{inc:.1f}", str(int(per)), str(int(apo)), str(period), otype))
         except: pass
-        time.sleep(0.15)
 
     if not rows: return "_TLE data unavailable_"
     tbl = "| Satellite | NORAD | Inc° | Perigee | Apogee | Period | Orbit |\n"
@@ -1131,13 +3344,94 @@ def get_key_satellites():
         tbl += f"| {n} | {nd} | {inc} | {pe} km | {ap} km | {pr} min | {ot} |\n"
     return tbl + "\n<sub>Source: [CelesTrak GP](https://celestrak.org) — no auth, TLE-derived params</sub>"
 
-def get_donki():
-    today = datetime.now(timezone.utc)
-    start = (today - timedelta(days=7)).strftime("%Y-%m-%d")
-    end   = today.strftime("%Y-%m-%d")
-    out   = []
+# Close approaches: KEY_SATS screened against the whole active catalog (ORBITS)
+CATALOG_URL  = "https://celestrak.org/NORAD/elements/gp.php?GROUP=active&FORMAT=TLE"
+SCREEN_HOURS = 24
+TLE_MAX_AGE  = 14 * 86400   # older element sets are skipped, not extrapolated
+
+@dataclass(slots=True)
+class Approach:
+    sat: str
+    sat_norad: str
+    other: str
+    other_norad: str
+    tca: float                  # unix seconds
+    miss_km: float
+    vel_kms: float
+    alt_km: float
+
+@dataclass(slots=True)
+class Conjunctions:
+    approaches: list
+    catalog: int = 0            # element sets screened
+    active: int = 0             # ... of which in shells a key satellite can reach
+    colocated: int = 0          # docked / formation pairs dropped
+    t0: float = 0.0             # screen start, unix seconds
+    secs: float = 0.0
+
+def fetch_conjunctions():
+    txt = gp_get(CATALOG_URL)
+    if not txt: return None
+    started = time.time()
+    now     = started // 60 * 60
+    names, norads, el = [], [], array("d")
+    for name, l1, l2 in parse_tle(txt):
+        try: orb = tle_orbit(l1, l2)
+        except: continue
+        if abs(now - orb[0]) > TLE_MAX_AGE: continue
+        names.append(name); norads.append(l1[2:7].strip()); el.extend(orb)
+    keys = {norad for norad, _ in KEY_SATS}
+    prim = array("b", (nd in keys for nd in norads))
+    if not any(prim): return None
+    hits, active = screen(el, prim, now, SCREEN_HOURS)
+    out = Conjunctions([], len(names), active, t0=now)
+    for i, j, flagged, t, d, v, alt in hits:
+        if flagged > 0.5: out.colocated += 1; continue            # close all day: docked or flying in formation
+        if not prim[i]: i, j = j, i
+        out.approaches.append(Approach(names[i], norads[i], names[j], norads[j], t, d, v, alt))
+    out.secs = time.time() - started
+    return out
+
+def chart_conjunctions(c):
+    if not c or not c.approaches: return None
+    cfg = {
+        "type": "bubble",
+        "data": {"datasets": [{
+            "label": "Approach (bubble = relative speed)",
+            "data":  [{"x": round((a.tca - c.t0) / 3600, 2), "y": round(a.miss_km, 2),
+                       "r": round(2 + a.vel_kms, 1)} for a in c.approaches],
+            "backgroundColor": "rgba(231,76,60,0.45)", "borderColor": "rgba(231,76,60,0.9)"
+        }]},
+        "options": {"title": _title(f"Close Approaches — next {SCREEN_HOURS} h"), "legend": _legend(),
+                    "scales": _axes(x_label="Hours from now", y_label="Miss distance (km)",
+                                    x_min=0, x_max=SCREEN_HOURS, y_min=0)}
+    }
+    return cfg, 700, 300
+
+def md_conjunctions(c):
+    if c is None: return "_Conjunction screen unavailable_"
+    out  = (f"**Close approaches in the next {SCREEN_HOURS} h (< {SCREEN_MISS:.0f} km):** {len(c.approaches)} — "
+            f"{len(KEY_SATS)} key satellites vs {c.catalog:,} active objects "
+            f"({c.active:,} in reachable shells), screened in {c.secs:.0f} s\n\n")
+    if not c.approaches: return out + "_No approaches under the screening distance._"
+    out += chart(*chart_conjunctions(c)) + "\n\n"
+    out += "| TCA (UTC) | Satellite | Object | Miss | Rel. speed | Alt |\n"
+    out += "|:----------|:----------|:-------|-----:|-----------:|----:|\n"
+    for a in c.approaches[:12]:
+        tca = datetime.fromtimestamp(a.tca, timezone.utc).strftime("%m-%d %H:%M")
+        out += (f"| {tca} | {a.sat[:22]} | {a.other[:24]} ({a.other_norad}) | {a.miss_km:.1f} km "
+                f"| {a.vel_kms:.2f} km/s | {a.alt_km:.0f} km |\n")
+    return out + ("\n<sub>Screening grade — Kepler + J2 from [CelesTrak](https://celestrak.org) TLEs, "
+                  "~10 km error in LEO; not a collision warning.</sub>")
+
+section("CONJUNCTIONS", fetch_conjunctions, md_conjunctions, chart_conjunctions)
+
+def get_conjunctions():
+    return render("CONJUNCTIONS")
 
-    cmes = jget(f"https://api.nasa.gov/DONKI/CME?startDate={start}&endDate={end}&api_key={NASA_KEY}")
+def get_donki():
+    out  = []
+    cmes = donki_events("CME", 8)
     if cmes:
         out.append(f"**Coronal Mass Ejections (CME): {len(cmes)} events in last 7 days**\n")
         out.append("| Date UTC | Speed | Type | Note |")
@@ -1147,7 +3441,7 @@ def get_donki():
             out.append(f"| {c.get('startTime','—')[:16]} | {an.get('speed','—')} km/s | {an.get('type','—')} | {str(an.get('note',''))[:40]} |")
         out.append("")
 
-    flares = jget(f"https://api.nasa.gov/DONKI/FLR?startDate={start}&endDate={end}&api_key={NASA_KEY}")
+    flares = donki_events("FLR", 8)
     if flares:
         out.append(f"**Solar Flares: {len(flares)} events in last 7 days**\n")
         out.append("| Date UTC | Class | End Time | Linked CME |")
@@ -1156,7 +3450,7 @@ def get_donki():
             out.append(f"| {f.get('beginTime','—')[:16]} | {f.get('classType','—')} | {f.get('endTime','—')[:16]} | {'Yes' if f.get('linkedEvents') else 'No'} |")
         out.append("")
 
-    gsts = jget(f"https://api.nasa.gov/DONKI/GST?startDate={start}&endDate={end}&api_key={NASA_KEY}")
+    gsts = donki_events("GST", 8)
     if gsts:
         out.append(f"**Geomagnetic Storms: {len(gsts)} events in last 7 days**\n")
         out.append("| Date UTC | Max Kp | G-Scale | Satellite Impact |")
@@ -1174,7 +3468,7 @@ def get_donki():
     return "\n".join(out)
 
 def get_epic():
-    data = jget(f"https://api.nasa.gov/EPIC/api/natural?api_key={NASA_KEY}")
+    data = jget("https://epic.gsfc.nasa.gov/api/natural")   # same archive as api.nasa.gov/EPIC, no key or quota
     if not data: return "_EPIC imagery unavailable_"
 
     latest   = data[0]
@@ -1184,12 +3478,12 @@ def get_epic():
     ds_pos   = latest.get("dscovr_j2000_position", {})
 
     dist = round(math.sqrt(sum(ds_pos.get(k,0)**2 for k in ["x","y","z"])), 0) if ds_pos else 0
-    img_url = (f"https://api.nasa.gov/EPIC/archive/natural/{date_str}/jpg/{img_name}.jpg"
-               f"?api_key={NASA_KEY}")
+    img_url = f"https://epic.gsfc.nasa.gov/archive/natural/{date_str}/jpg/{img_name}.jpg"
 
     out = f"**DSCOVR/EPIC — {latest['date'][:16]} UTC**\n\n_{caption}_\n\n"
-    if save_img(img_url, "assets/epic.jpg"):
-        out += "![Earth from DSCOVR L1](./assets/epic.jpg)\n\n"
+    path = save_img(img_url, "assets/epic.jpg")
+    if path:
+        out += f"![Earth from DSCOVR L1](./{path})\n\n"
 
     cc = latest.get("centroid_coordinates", {})
     out += f"""| EPIC Param | Value |
@@ -1202,6 +3496,25 @@ def get_epic():
     out += f"\n<sub>Source: [NASA EPIC](https://api.nasa.gov) — DSCOVR at Sun-Earth L1, DEMO_KEY</sub>"
     return out
 
+def parse_firms(text):
+    """FIRMS area CSV → (row count, bubble points, EventGrid of detections weighted by FRP)."""
+    rows   = list(csv.DictReader(io.StringIO(text)))
+    points = []
+    grid   = EventGrid(depth=4)
+    for row in rows:
+        try:
+            lat = float(row.get("latitude", 0))
+            lon = float(row.get("longitude", 0))
+            frp = float(row.get("frp", 3))
+            hhmm = str(row.get("acq_time", "0")).zfill(4)
+            t   = datetime.strptime(f"{row.get('acq_date', '1970-01-01')} {hhmm}",
+                                    "%Y-%m-%d %H%M").replace(tzinfo=timezone.utc).timestamp()
+            points.append({"x": round(lon,1), "y": round(lat,1),
+                           "r": min(round(frp / 5, 1), 10)})
+            grid.add(lat, lon, t, frp)
+        except: pass
+    return len(rows), points, grid
+
 def get_firms():
     out = []
     if FIRMS_KEY:
@@ -1209,26 +3522,8 @@ def get_firms():
         text = tget(url)
         if text:
             try:
-                rows   = list(csv.DictReader(io.StringIO(text)))
-                total  = len(rows)
-                points = []
-                regions = {"N.America": 0, "S.America": 0, "Africa": 0,
-                           "Europe": 0, "Asia": 0, "Australia": 0, "Other": 0}
-                for row in rows:
-                    try:
-                        lat = float(row.get("latitude", 0))
-                        lon = float(row.get("longitude", 0))
-                        frp = float(row.get("frp", 3))
-                        points.append({"x": round(lon,1), "y": round(lat,1),
-                                       "r": min(round(frp / 5, 1), 10)})
-                        if   lon < -30 and lat >  0: regions["N.America"] += 1
-                        elif lon < -30 and lat <= 0: regions["S.America"] += 1
-                        elif -20<=lon<=55 and lat<40: regions["Africa"] += 1
-                        elif lon < 40 and lat >= 35:  regions["Europe"] += 1
-                        elif lon > 40 and lat > 0:    regions["Asia"] += 1
-                        elif lon > 110 and lat < 0:   regions["Australia"] += 1
-                        else: regions["Other"] += 1
-                    except: pass
+                total, points, grid = parse_firms(text)
+                regions = grid.regions()
 
                 cfg = {
                     "type": "bubble",
@@ -1242,9 +3537,16 @@ def get_firms():
                 }
                 out.append(f"**Active fire detections (VIIRS NOAA-20, last 24h): {total:,}**\n")
                 out.append(chart(cfg, 900, 420))
-                out.append("\n| Region | Detections |\n|:-------|----------:|")
-                for reg, cnt in sorted(regions.items(), key=lambda x: -x[1]):
-                    out.append(f"| {reg} | {cnt:,} |")
+                out.append("\n| Region | Detections | Total FRP (MW) |\n|:-------|----------:|--------------:|")
+                for reg, (cnt, frp) in sorted(regions.items(), key=lambda x: (-x[1][0], x[0])):
+                    out.append(f"| {reg} | {cnt:,} | {frp:,.0f} |")
+                hot = grid.hotspots(level=3, k=8)
+                if hot:
+                    out.append("\n**Fire hotspots (~156 km geohash cells)**\n")
+                    out.append("| Cell | Lat | Lon | Detections | Mean FRP |")
+                    out.append("|:-----|----:|----:|-----------:|---------:|")
+                    for gh, lat, lon, cnt, frp in hot:
+                        out.append(f"| `{gh}` | {lat:.1f} | {lon:.1f} | {cnt:,} | {frp / cnt:.1f} |")
             except Exception as e:
                 out.append(f"_FIRMS parse error: {e}_")
     else:
@@ -1261,7 +3563,7 @@ def get_firms():
     return "\n".join(out)
 
 def get_gibs():
-    yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%d")
+    yesterday = (utcnow() - timedelta(days=1)).strftime("%Y-%m-%d")
     base = "https://gibs.earthdata.nasa.gov/wms/epsg4326/best/wms.cgi"
 
     layers = [
@@ -1279,8 +3581,9 @@ def get_gibs():
         url = (f"{base}?SERVICE=WMS&REQUEST=GetMap&VERSION=1.3.0"
                f"&LAYERS={layer_id}&CRS=EPSG:4326&BBOX=-90,-180,90,180"
                f"&WIDTH=720&HEIGHT=360&FORMAT=image/png&TIME={yesterday}")
-        if save_img(url, asset):
-            imgs.append(f"**{label}**\n\n![{label}](./{asset})")
+        path = save_img(url, asset)
+        if path:
+            imgs.append(f"**{label}**\n\n![{label}](./{path})")
 
     out.extend(imgs if imgs else ["_GIBS imagery could not be downloaded_"])
     out.append(f"""
@@ -1367,7 +3670,7 @@ def get_mars_rovers():
     out = []
     rovers = [("curiosity", "Curiosity"), ("perseverance", "Perseverance")]
     for rover, label in rovers:
-        data = jget(f"https://api.nasa.gov/mars-photos/api/v1/rovers/{rover}/latest_photos?api_key={NASA_KEY}")
+        data = nasa_get(f"mars-photos/api/v1/rovers/{rover}/latest_photos", 2, ttl=12 * 3600)
         if not data or not data.get("latest_photos"): continue
         photos = data["latest_photos"]
         p      = photos[0]
@@ -1378,8 +3681,9 @@ def get_mars_rovers():
 
         asset = f"assets/mars_{rover}.jpg"
         out.append(f"**{label}** — Sol {sol} ({earth_date}) — Camera: {cam}")
-        if img_url and save_img(img_url, asset):
-            out.append(f"\n![{label} Mars photo](./{asset})\n")
+        path  = img_url and save_img(img_url, asset)
+        if path:
+            out.append(f"\n![{label} Mars photo](./{path})\n")
         out.append(f"_Photos available this sol: {len(photos)}_\n")
 
     out.append(f"<sub>Source: [NASA Mars Photos API](https://api.nasa.gov) — DEMO_KEY</sub>")
@@ -1406,10 +3710,6 @@ def get_nasa_power():
     Satellite-derived solar radiation, wind, and temperature data.
     No API key, no auth. Data from CERES, GEWEX, GEOS-5 satellite models.
     """
-    today     = datetime.now(timezone.utc)
-    end_date  = (today - timedelta(days=2)).strftime("%Y%m%d")   # 2-day lag
-    start_date = (today - timedelta(days=32)).strftime("%Y%m%d")
-
     # 6 major cities — solar radiation + wind signal
     cities = [
         ("New York",   40.71, -74.01),
@@ -1419,57 +3719,40 @@ def get_nasa_power():
         ("Sydney",    -33.87, 151.21),
         ("Mumbai",     19.08,  72.88),
     ]
-
+    tables = load_power([(lat, lon) for _, lat, lon in cities])
     rows = []
     for name, lat, lon in cities:
-        url = (f"https://power.larc.nasa.gov/api/temporal/daily/point"
-               f"?parameters=ALLSKY_SFC_SW_DWN,WS10M,T2M"
-               f"&community=RE&longitude={lon}&latitude={lat}"
-               f"&start={start_date}&end={end_date}&format=JSON")
-        data = jget(url)
-        if not data: continue
-        try:
-            props = data["properties"]["parameter"]
-            # Get latest non-fill value
-            sw_vals = [v for v in props.get("ALLSKY_SFC_SW_DWN", {}).values() if v != -999]
-            ws_vals = [v for v in props.get("WS10M", {}).values() if v != -999]
-            t_vals  = [v for v in props.get("T2M", {}).values() if v != -999]
-            sw = round(sw_vals[-1], 2) if sw_vals else "—"
-            ws = round(ws_vals[-1], 2) if ws_vals else "—"
-            t  = round(t_vals[-1],  1) if t_vals  else "—"
-            rows.append((name, sw, ws, t))
-        except: pass
+        t = tables.get((lat, lon))
+        if t is None or not len(t): continue
+        rows.append((name, *(rolling_stats(t, p) for p in POWER_PARAMS)))
 
     if not rows:
         return "_NASA POWER data unavailable_\n\n<sub>Source: [NASA POWER](https://power.larc.nasa.gov/api/) — satellite-derived met data, no auth</sub>"
 
-    # Solar radiation bar chart
-    labels = [r[0] for r in rows]
-    sw_vals = [r[1] if isinstance(r[1], float) else 0 for r in rows]
+    fmt = lambda v, nd, sign="": "—" if v != v else f"{v:{sign}.{nd}f}"
+    val = lambda v: 0 if v != v else round(v, 2)
     c = chart({
         "type": "bar",
-        "data": {"labels": labels,
-                 "datasets": [{"label": "Solar Radiation (kW-hr/m2/day)",
-                               "data": sw_vals,
-                               "backgroundColor": ["#f39c12","#4FC3F7","#e74c3c",
-                                                   "#2ecc71","#9b59b6","#1abc9c"]}]},
-        "options": {"title": title_opt("NASA POWER — Satellite Solar Radiation (today)"),
+        "data": {"labels": [r[0] for r in rows],
+                 "datasets": [{"label": "Latest day", "data": [val(r[1]["last"]) for r in rows],
+                               "backgroundColor": "#f39c12"},
+                              {"label": "30-day mean", "data": [val(r[1]["mean"]) for r in rows],
+                               "backgroundColor": "#4FC3F7"}]},
+        "options": {"title": title_opt("NASA POWER — Satellite Solar Radiation (latest vs 30-day mean)"),
                     "legend": legend_opt, "scales": axes(yl="kW-hr/m2/day", yn=0)}
     }, 900, 260)
 
-    table = "| City | Solar Rad (kW-hr/m2/d) | Wind 10m (m/s) | Temp 2m (C) |\n"
-    table += "|:-----|----------------------:|---------------:|------------:|\n"
+    table  = "| City | Solar Rad (kW-hr/m2/d) | 30-d mean | Wind 10m (m/s) | Temp 2m (C) | vs 30-d | 30-d vs last year |\n"
+    table += "|:-----|----------------------:|----------:|---------------:|------------:|--------:|------------------:|\n"
     for name, sw, ws, t in rows:
-        table += f"| {name} | {sw} | {ws} | {t} |\n"
+        table += (f"| {name} | {fmt(sw['last'], 2)} | {fmt(sw['mean'], 2)} | {fmt(ws['last'], 2)} | "
+                  f"{fmt(t['last'], 1)} | {fmt(t['anom'], 1, '+')} | {fmt(t['yoy'], 1, '+')} |\n")
 
     return (c + "\n\n" + table +
             "\n<sub>Source: [NASA POWER](https://power.larc.nasa.gov/api/) — CERES/GEOS-5 satellite data, no auth</sub>")
 
 def get_enlil():
-    today = datetime.now(timezone.utc)
-    start = (today - timedelta(days=14)).strftime("%Y-%m-%d")
-    end   = today.strftime("%Y-%m-%d")
-    data  = jget(f"https://api.nasa.gov/DONKI/WSAEnlilSimulations?startDate={start}&endDate={end}&api_key={NASA_KEY}")
+    data = donki_events("WSAEnlilSimulations", 15, priority=2)
 
     if not data:
         return "_WSA-Enlil data unavailable_\n\n<sub>Source: [NASA DONKI WSA-Enlil](https://api.nasa.gov) — DEMO_KEY</sub>"
@@ -1492,34 +3775,42 @@ def get_enlil():
 def get_satdb():
     """
     SatDB ETH Zurich: archives TLEs from CelesTrak hourly since 2013.
-    Allows historical TLE lookup by NORAD ID and date range.
-    No auth required.
+    The TLE ARCHIVE keeps each key satellite's element-set history locally;
+    a run only asks SatDB for the snapshots since the last one, and the decay
+    and maneuver figures below come from the stored columns.
     """
-    # Query a few key satellites — latest TLE
-    sats = [
-        (25544, "ISS"),
-        (48274, "Tiangong CSS"),
-        (41335, "GOES-16"),
-        (40697, "Sentinel-2A"),
-        (37849, "Suomi NPP"),
-        (39634, "Landsat 8"),
-    ]
-    out = ["#### SatDB ETH Zurich — TLE Archive (sampled)\n"]
-    out.append("| Satellite | NORAD | TLE Epoch | TLE Line 1 (truncated) |")
-    out.append("|:----------|------:|:----------|:----------------------|")
-    for norad, name in sats:
-        url  = f"https://satdb.ethz.ch/api/satellitedata/?norad-id={norad}&page-size=1&ordering=-datetime"
-        data = jget(url)
-        if not data or not data.get("results"): continue
-        r   = data["results"][0]
-        tle = r.get("norad_str", "")
-        lines = [l for l in tle.splitlines() if l.strip()]
-        l1   = lines[1][:40] + "..." if len(lines) > 1 else "—"
-        epoch = lines[1][18:32].strip() if len(lines) > 1 else "—"
-        out.append(f"| {name} | {norad} | {epoch} | `{l1}` |")
-        time.sleep(0.2)
-
-    out.append(f"\n_SatDB archives TLEs hourly from CelesTrak. Query by NORAD ID + date range for historical orbit reconstruction._")
+    hist = load_tle_history([norad for norad, _ in KEY_SATS])
+    now  = wall()
+    out  = ["#### SatDB ETH Zurich — TLE History (local archive)\n"]
+    rows, sets = [], []
+    for norad, name in KEY_SATS:
+        h = hist[norad]
+        if not len(h): continue
+        ts, alts = h.times(), tle_altitudes(h)
+        mans = tle_maneuvers(h, alts)
+        i30  = h.at(now - 30 * 86400) or 0
+        drift = sum(d for d in (b - a for a, b in zip(alts[i30:], alts[i30 + 1:])) if d <= MANEUVER_KM)
+        last = datetime.fromtimestamp(mans[-1][0], timezone.utc).strftime("%Y-%m-%d") if mans else "—"
+        rows.append(f"| {name} | {norad} | {len(h):,} | {datetime.fromtimestamp(ts[0], timezone.utc):%Y-%m-%d} "
+                    f"| {alts[-1]:,.1f} km | {drift:+.2f} km | {len(mans)} | {last} |")
+        if alts[-1] < 2000:
+            k = max(1, len(ts) // 200)
+            sets.append({"label": name, "data": [{"x": round((t - now) / 86400, 2), "y": round(a, 2)}
+                                                 for t, a in zip(ts[::k], alts[::k])],
+                         "showLine": True, "fill": False, "pointRadius": 0, "borderWidth": 1.5})
+    if not rows: return "_SatDB history unavailable_"
+    if sets:
+        cfg = {
+            "type": "scatter",
+            "data": {"datasets": sets},
+            "options": {"title":  title_opt("LEO Key Satellites — Mean Altitude (decay and reboosts)"),
+                        "legend": legend_opt, "scales": axes("Days ago", "Mean altitude (km)", xx=0)}
+        }
+        out.append(chart(cfg, 900, 360) + "\n")
+    out.append("| Satellite | NORAD | Element sets | Since | Mean alt | 30-day drift | Maneuvers | Last maneuver |")
+    out.append("|:----------|------:|-------------:|:------|---------:|-------------:|----------:|:--------------|")
+    out += rows
+    out.append(f"\n_Drift excludes rises above {MANEUVER_KM} km between element sets, which are counted as maneuvers._")
     out.append(f"\n<sub>Source: [SatDB ETH Zurich](https://satdb.ethz.ch/api-documentation/) — TLE archive API, no auth</sub>")
     return "\n".join(out)
 
@@ -1543,30 +3834,23 @@ def get_keeptrack():
     out.append("| Satellite | NORAD | Lat | Lon | Alt (km) | Inc | Period |")
     out.append("|:----------|------:|----:|----:|---------:|----:|-------:|")
 
-    import math
-    MU = 398600.4418; RE = 6378.135
-
-    for norad, name in key_sats:
+    for i, (norad, name) in enumerate(key_sats):
         url  = f"https://api.keeptrack.space/v2/sat/{norad}"
+        if i and ("json", url) not in _MEMO: time.sleep(0.15)      # pace real requests only
         data = jget(url)
         if not data: continue
         try:
             tle1 = data.get("TLE_LINE_1", "")
             tle2 = data.get("TLE_LINE_2", "")
             if len(tle2) < 63: continue
-            mm  = float(tle2[52:63])
-            ecc = float("0." + tle2[26:33])
-            inc = float(tle2[8:16])
-            n   = mm * 2 * math.pi / 86400
-            a   = (MU / n**2) ** (1/3)
-            alt = round(a * (1 + ecc) - RE, 0)
+            inc, ecc, mm, _, alt = tle_elements(tle2)
+            alt = round(alt, 0)
             period = round(1440 / mm, 1)
             # KeepTrack doesn't return live lat/lon without propagation lib,
             # but returns TLE epoch which we can note
             epoch = tle1[18:32].strip() if tle1 else "—"
             out.append(f"| {name} | {norad} | TLE | epoch | {alt:.0f} | {inc:.1f}° | {period} min |")
         except: pass
-        time.sleep(0.15)
 
     out.append(f"\n_KeepTrack covers 63,000+ objects. Use with [ootk](https://github.com/thkruz/ootk) to propagate real-time lat/lon/alt._")
     out.append(f"\n<sub>Source: [KeepTrack API](https://keeptrack.space/api) — no auth, 63k+ objects</sub>")
@@ -1577,29 +3861,33 @@ def get_keeptrack():
 # ══════════════════════════════════════════════════════════════════════════════
 # QUOTE OF THE DAY · ZenQuotes + Quotable (free, no auth)
 # ══════════════════════════════════════════════════════════════════════════════
-def get_quote_of_day():
+def _zenquotes():
     data = get_json("https://zenquotes.io/api/today")
     if data and isinstance(data, list):
         q = data[0]
         quote = q.get("q",""); author = q.get("a","Unknown")
         if quote:
             return f'> *\"{quote}\"*\n>\n> — **{author}**\n\n<sub>Source: [ZenQuotes.io](https://zenquotes.io) — free, no auth</sub>'
-    data2 = get_json("https://api.quotable.io/quotes/random?limit=1")
-    if data2 and isinstance(data2, list):
-        q = data2[0]
+
+def _quotable():
+    data = get_json("https://api.quotable.io/quotes/random?limit=1")
+    if data and isinstance(data, list):
+        q = data[0]
         quote = q.get("content",""); author = q.get("author","Unknown")
         tags = ", ".join(q.get("tags",[])[:3])
         if quote:
             return (f'> *\"{quote}\"*\n>\n> — **{author}**\n\n'
                     f'_{tags}_\n\n<sub>Source: [Quotable.io](https://api.quotable.io) — free, no auth</sub>')
-    return "_Quote unavailable today_"
+
+def get_quote_of_day():
+    return first_good(_zenquotes, _quotable) or "_Quote unavailable today_"
 
 
 # ══════════════════════════════════════════════════════════════════════════════
 # ON THIS DAY IN HISTORY · Wikipedia REST API (free, no auth)
 # ══════════════════════════════════════════════════════════════════════════════
 def get_on_this_day():
-    today = datetime.now(timezone.utc)
+    today = utcnow()
     mm = today.strftime("%m"); dd = today.strftime("%d")
     data = get_json(f"https://en.wikipedia.org/api/rest_v1/feed/onthisday/all/{mm}/{dd}")
     if not data: return "_On This Day data unavailable_"
@@ -1640,19 +3928,13 @@ def get_historical_patterns():
     out = []
 
     # ── 1. SOLAR CYCLE HISTORY 1749-present (NOAA SWPC) ──────────────────────
-    solar = get_json("https://services.swpc.noaa.gov/json/solar-cycle/observed-solar-cycle-indices.json")
-    if solar and isinstance(solar, list):
-        yearly = {}
-        for rec in solar:
-            try:
-                yr  = int(rec.get("time-tag","")[:4])
-                ssn = float(rec.get("smoothed_ssn", 0) or 0)
-                if yr >= 1749 and (yr not in yearly or ssn > yearly[yr]):
-                    yearly[yr] = ssn
-            except: pass
-        yrs = sorted(yearly); vals = [yearly[y] for y in yrs]
-        # Downsample: every 3rd point for clean URL
-        yd = yrs[::3]; vd = vals[::3]
+    solar = load_solar_cycle()
+    if len(solar):
+        # Yearly max of the smoothed SSN from the pyramid — no ad-hoc [::3] decimation
+        pyr  = pyramid(solar["year"], solar["smoothed"])
+        yrs  = [int(t) for t in pyr["yearly"]["t"]]; vals = pyr["yearly"]["max"]
+        _, lv = pick_level({"yearly": pyr["yearly"]}, 1749, max_points=300)
+        yd = [int(t) for t in lv["t"]]; vd = [round(x, 1) for x in lv["max"]]
         cfg = {"type":"line","data":{"labels":yd,"datasets":[{"label":"Smoothed Sunspot Number",
                "data":vd,"borderColor":"#f39c12","backgroundColor":"rgba(243,156,18,0.08)",
                "fill":True,"pointRadius":0,"borderWidth":1.2}]},
@@ -1702,64 +3984,44 @@ def get_historical_patterns():
         out.append("")
 
     # ── 3. GLOBAL TEMPERATURE 1880-present (NASA GISS) ───────────────────────
-    text = get_text("https://data.giss.nasa.gov/gistemp/tabledata_v4/GLB.Ts+dSST.csv")
-    if text:
-        csv_lines = text.strip().splitlines()
-        hi = next((i for i,l in enumerate(csv_lines) if l.startswith("Year")), None)
-        if hi is not None:
-            ay=[]; at=[]
-            for line in csv_lines[hi+1:]:
-                parts = line.split(",")
-                if len(parts)<14: continue
-                try:
-                    yr=int(parts[0]); jd=parts[13].strip()
-                    if jd not in ("","****","***"): ay.append(yr); at.append(round(float(jd),2))
-                except: pass
-            if len(ay) > 10:
-                colors=["#e74c3c" if t>0.5 else "#f39c12" if t>0 else "#3498db" for t in at]
-                cfg3={"type":"bar","data":{"labels":ay,"datasets":[{"label":"Temp Anomaly vs 1951–80 baseline (°C)",
-                      "data":at,"backgroundColor":colors,"borderWidth":0}]},
-                      "options":{"title":_title(f"Global Temperature Anomaly 1880–{ay[-1]} (145 yrs) — NASA GISS"),
-                                 "legend":_legend(),"scales":_axes(x_label="Year",y_label="°C anomaly")}}
-                out.append("\n### Global Temperature — 145 Years (1880–present) · NASA GISS\n")
-                out.append(make_chart(cfg3, 900, 280))
-                warming = round(at[-1]-at[0], 2)
-                hottest = ay[at.index(max(at))]
-                out.append(f"\n_Total warming since 1880: **+{warming}°C** · Hottest year on record: **{hottest}**_\n")
-                out.append("**30-Year Period Averages**\n")
-                out.append("| Period | Avg Anomaly | Trend |")
-                out.append("|:-------|------------:|:------|")
-                for s in range(1880, max(ay)-28, 30):
-                    e2=s+29
-                    vals=[t for y,t in zip(ay,at) if s<=y<=e2]
-                    if vals:
-                        avg=round(sum(vals)/len(vals),2)
-                        trend="Warming" if avg>0.3 else "Neutral" if avg>-0.1 else "Cool"
-                        out.append(f"| {s}–{e2} | {avg:+.2f}°C | {trend} |")
-                out.append("")
+    giss = load_giss().pairs("jd")
+    ay = [y for y, _ in giss]; at = [round(t, 2) for _, t in giss]
+    if len(ay) > 10:
+        colors=["#e74c3c" if t>0.5 else "#f39c12" if t>0 else "#3498db" for t in at]
+        cfg3={"type":"bar","data":{"labels":ay,"datasets":[{"label":"Temp Anomaly vs 1951–80 baseline (°C)",
+              "data":at,"backgroundColor":colors,"borderWidth":0}]},
+              "options":{"title":_title(f"Global Temperature Anomaly 1880–{ay[-1]} (145 yrs) — NASA GISS"),
+                         "legend":_legend(),"scales":_axes(x_label="Year",y_label="°C anomaly")}}
+        out.append("\n### Global Temperature — 145 Years (1880–present) · NASA GISS\n")
+        out.append(make_chart(cfg3, 900, 280))
+        warming = round(at[-1]-at[0], 2)
+        hottest = ay[at.index(max(at))]
+        out.append(f"\n_Total warming since 1880: **+{warming}°C** · Hottest year on record: **{hottest}**_\n")
+        out.append("**30-Year Period Averages**\n")
+        out.append("| Period | Avg Anomaly | Trend |")
+        out.append("|:-------|------------:|:------|")
+        for s in range(1880, max(ay)-28, 30):
+            e2=s+29
+            vals=[t for y,t in zip(ay,at) if s<=y<=e2]
+            if vals:
+                avg=round(sum(vals)/len(vals),2)
+                trend="Warming" if avg>0.3 else "Neutral" if avg>-0.1 else "Cool"
+                out.append(f"| {s}–{e2} | {avg:+.2f}°C | {trend} |")
+        out.append("")
 
     # ── 4. CO2 KEELING CURVE 1958-present (NOAA) ─────────────────────────────
-    co2t = get_text("https://gml.noaa.gov/webdata/ccgg/trends/co2/co2_annmean_mlo.txt")
-    if co2t:
-        cy=[]; cv=[]
-        for line in co2t.splitlines():
-            if line.startswith("#") or not line.strip(): continue
-            parts=line.split()
-            if len(parts)>=2:
-                try:
-                    yr=int(parts[0]); val=float(parts[1])
-                    if yr>=1958: cy.append(yr); cv.append(val)
-                except: pass
-        if cy:
-            cfg4={"type":"line","data":{"labels":cy,"datasets":[{"label":"CO₂ ppm (Mauna Loa annual mean)",
-                  "data":cv,"borderColor":"#e67e22","backgroundColor":"rgba(230,126,34,0.1)",
-                  "fill":True,"pointRadius":0,"borderWidth":1.8}]},
-                  "options":{"title":_title(f"CO₂ Keeling Curve 1958–{cy[-1]} — NOAA Mauna Loa (65+ years)"),
-                             "legend":_legend(),"scales":_axes(x_label="Year",y_label="CO₂ (ppm)",y_min=310)}}
-            out.append("\n### CO₂ Keeling Curve — 65+ Years · NOAA Mauna Loa\n")
-            out.append(make_chart(cfg4, 900, 240))
-            rate=round((cv[-1]-cv[-10])/10,2) if len(cv)>=10 else "—"
-            out.append(f"\n_Current: **{cv[-1]} ppm** · 10-yr rise rate: **+{rate} ppm/yr** · Pre-industrial baseline: ~280 ppm_\n")
+    co2 = load_co2_annual().pairs("mean", 1958)
+    cy = [y for y, _ in co2]; cv = [v for _, v in co2]
+    if cy:
+        cfg4={"type":"line","data":{"labels":cy,"datasets":[{"label":"CO₂ ppm (Mauna Loa annual mean)",
+              "data":cv,"borderColor":"#e67e22","backgroundColor":"rgba(230,126,34,0.1)",
+              "fill":True,"pointRadius":0,"borderWidth":1.8}]},
+              "options":{"title":_title(f"CO₂ Keeling Curve 1958–{cy[-1]} — NOAA Mauna Loa (65+ years)"),
+                         "legend":_legend(),"scales":_axes(x_label="Year",y_label="CO₂ (ppm)",y_min=310)}}
+        out.append("\n### CO₂ Keeling Curve — 65+ Years · NOAA Mauna Loa\n")
+        out.append(make_chart(cfg4, 900, 240))
+        rate=round((cv[-1]-cv[-10])/10,2) if len(cv)>=10 else "—"
+        out.append(f"\n_Current: **{cv[-1]} ppm** · 10-yr rise rate: **+{rate} ppm/yr** · Pre-industrial baseline: ~280 ppm_\n")
 
     # ── 5. PATTERN PROBABILITY SUMMARY ───────────────────────────────────────
     out.append("""
@@ -1829,56 +4091,715 @@ def get_nobel_data():
     return "\n".join(out)
 
 
-def main():
+# ══════════════════════════════════════════════════════════════════════════════
+# MEMORY BUDGETS — tracemalloc accounting per section, over-budget ones served stale
+# With --memory (or DASHBOARD_MEMORY=1) the sections run under tracemalloc. An
+# allocation belongs to a section when its traceback passes through the source
+# lines of the section's function, its lambdas on the race pool included (a
+# body read on a hedge thread counts once the section decodes it). A watcher
+# polls the traced total; once growth since a section started passes its
+# budget it snapshots and sums per section. An offender is marked over budget:
+# its further _fetch calls are refused and, once it returns, _settle serves the
+# last good content. Peaks are upper bounds when sections overlap and exact for
+# a section that ran alone; retained memory is exact. tracemalloc slows
+# allocation-heavy parsing several times over, so this is opt-in.
+# ══════════════════════════════════════════════════════════════════════════════
+MEM_NFRAME  = 32            # traceback depth; deeper allocations go unattributed
+MEM_POLL    = 0.1
+MEM_DEFAULT = 192           # MiB per section
+MEM_BUDGETS = {"CELESTRAK": 256, **{k: int(v) for k, v in (kv.split("=") for kv in
+               os.environ.get("DASHBOARD_MEM_BUDGETS", "").split(",") if "=" in kv)}}
+MEM_REPORT  = {}            # tag -> {"peak", "retained", "budget", "over"} (bytes)
+_MEM_RUN    = {}            # tag -> {"start", "peak", "over", "solo"} while running
+_MEM_SPANS  = {}            # tag -> (filename, first line, last line) of its function
+_MEM_LOCK   = threading.Lock()
+
+class MemoryBudgetExceeded(Exception):
+    pass
+
+def mem_budget(tag):
+    return MEM_BUDGETS.get(tag, MEM_DEFAULT) * 2**20
+
+def _mem_span(fn):
+    """(filename, first, last line) of fn's source, nested functions and lambdas included."""
+    code = getattr(fn, "__wrapped__", fn).__code__
+    lines, todo = [], [code]
+    while todo:
+        c = todo.pop()
+        lines += [l for _, _, l in c.co_lines() if l]
+        todo  += [k for k in c.co_consts if hasattr(k, "co_lines")]
+    return code.co_filename, code.co_firstlineno, max(lines, default=code.co_firstlineno)
+
+def _mem_by_section(tags):
+    """{tag: bytes currently traced under that section's function}, for the given tags."""
+    spans, acc = {t: _MEM_SPANS[t] for t in tags if t in _MEM_SPANS}, dict.fromkeys(tags, 0)
+    for st in tracemalloc.take_snapshot().statistics("traceback"):     # one entry per distinct traceback
+        for tag, (fname, lo, hi) in spans.items():
+            if any(f.lineno and lo <= f.lineno <= hi and f.filename == fname for f in st.traceback):
+                acc[tag] += st.size
+    return acc
+
+def _mem_watch(stop):
+    quiet = 0                       # after a snapshot with no offender, wait for 25% more growth
+    while not stop.wait(MEM_POLL):
+        cur, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        with _MEM_LOCK:
+            for r in _MEM_RUN.values(): r["peak"] = max(r["peak"], peak - r["start"])
+            suspect = [t for t, r in _MEM_RUN.items() if cur - r["start"] > mem_budget(t)]
+        if not suspect or cur < quiet: continue
+        by, quiet = _mem_by_section(suspect), cur * 1.25
+        with _MEM_LOCK:
+            for t in suspect:
+                if t in _MEM_RUN and by[t] > mem_budget(t): _MEM_RUN[t]["over"] = max(_MEM_RUN[t]["over"], by[t])
+
+def mem_guarded(tag, fn):
+    """fn wrapped for accounting under `tag`; raises MemoryBudgetExceeded after it returns if it went over budget."""
+    def run():
+        prev, _TLS.section = getattr(_TLS, "section", None), tag
+        with _MEM_LOCK:
+            for r in _MEM_RUN.values(): r["solo"] = False
+            _MEM_SPANS[tag] = _mem_span(fn)
+            _MEM_RUN[tag] = {"start": tracemalloc.get_traced_memory()[0], "peak": 0, "over": 0, "solo": not _MEM_RUN}
+        try: res = fn()
+        finally:
+            _TLS.section = prev
+            with _MEM_LOCK:
+                st = _MEM_RUN.pop(tag)
+            peak = max(st["peak"], tracemalloc.get_traced_memory()[1] - st["start"], 0)
+            if st["solo"] and peak > mem_budget(tag): st["over"] = max(st["over"], peak)
+            MEM_REPORT[tag] = {"peak": peak, "retained": 0, "budget": mem_budget(tag), "over": st["over"]}
+        if st["over"]:
+            raise MemoryBudgetExceeded(f"{st['over'] / 2**20:.0f} MiB > {mem_budget(tag) / 2**20:.0f} MiB budget")
+        return res
+    return run
+
+def mem_check():
+    """Refuses new downloads for a section the watcher has marked over budget."""
+    tag = getattr(_TLS, "section", None)
+    if tag and _MEM_RUN.get(tag, {}).get("over"): raise MemoryBudgetExceeded(f"{tag} over memory budget")
+
+@contextmanager
+def memory_accounting():
+    """tracemalloc + budget watcher for the block; per-section retained bytes land in MEM_REPORT."""
+    tracemalloc.start(MEM_NFRAME)
+    stop = threading.Event()
+    th = threading.Thread(target=_mem_watch, args=(stop,), daemon=True, name="mem-watch"); th.start()
+    try: yield MEM_REPORT
+    finally:
+        stop.set(); th.join()
+        for tag, b in _mem_by_section([t for t in MEM_REPORT if t in _MEM_SPANS]).items():
+            MEM_REPORT[tag]["retained"] = b
+        tracemalloc.stop()
+
+def mem_note(tag):
+    m = MEM_REPORT.get(tag)
+    return f" [peak ≤{m['peak'] / 2**20:.1f} MiB, kept {m['retained'] / 2**20:.1f} / {m['budget'] / 2**20:.0f} MiB]" if m else ""
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# RUN BUDGET — hard ceiling per run, last good content when a source misses it
+# Sections run concurrently until the deadline; any that is still running, has
+# raised, or came back as an "_... unavailable_" placeholder is re-injected
+# from .cache/lastgood.json with an "as of" marker instead of blanking a panel.
+# ══════════════════════════════════════════════════════════════════════════════
+RUN_BUDGET     = float(os.environ.get("DASHBOARD_BUDGET", "240"))   # seconds for the whole run
+BUNDLE_RESERVE = 30                                                  # of which held back for bundle + charts
+LASTGOOD_PATH  = os.path.join(CACHE_DIR, "lastgood.json")
+_PLACEHOLDER   = re.compile(r"_[^_\n]*_")
+
+@contextmanager
+def deadline(t):
+    """Every _fetch on this thread gives up at epoch `t` (timeouts shrink to fit)."""
+    prev, _TLS.deadline = getattr(_TLS, "deadline", None), t
+    try: yield
+    finally: _TLS.deadline = prev
+
+def _is_placeholder(content):
+    return not content or not content.strip() or bool(_PLACEHOLDER.fullmatch(content.strip()))
+
+def load_lastgood():
+    try:
+        with open(LASTGOOD_PATH, encoding="utf-8") as f: return json.load(f)
+    except: return {}
+
+def save_lastgood(lastgood):
+    _atomic_write(LASTGOOD_PATH, json.dumps(lastgood, ensure_ascii=False, separators=(",", ":")))
+
+def _stale(entry, why):
+    return f"{entry['content']}\n\n<sub>⏳ as of {entry['at']} — source {why}, showing last good data</sub>"
+
+def _settle(tag, fut, lastgood, now):
+    """(content or None, status) for one finished / unfinished section future."""
+    content, why = None, "timed out"
+    if fut.done() and not fut.cancelled():
+        try: content = fut.result()
+        except Exception as e: why = f"errored ({e})"
+    if content is not None and not _is_placeholder(content):
+        lastgood[tag] = {"content": content, "at": now}
+        return content, "OK"
+    if tag in lastgood:
+        return (_stale(lastgood[tag], "unavailable" if content is not None else why),
+                f"STALE (as of {lastgood[tag]['at']})")
+    if content is not None:
+        return content, "OK (placeholder)"
+    return None, f"FAILED: {why}"
+
+def run_sections(steps, until, lastgood, workers=8, late=None, grace=0):
+    """
+    Runs (tag, fn) steps on a thread pool and stops waiting at epoch `until`.
+    Returns {tag: (content or None, status)}; fresh content also updates
+    `lastgood` in place. Stragglers are abandoned, and their next _fetch fails
+    fast because the deadline travels with the worker thread — unless `late`
+    is a dict: then they keep `grace` extra seconds and their futures land in
+    it so a long-running caller can inject the result once it arrives.
+    """
+    def run(tag, fn):
+        t0, _TLS.section = time.time(), tag
+        try:
+            with deadline(until + grace): return (mem_guarded(tag, fn) if tracemalloc.is_tracing() else fn)()
+        finally:
+            _TLS.section = None
+            stats_section(tag, time.time() - t0)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="section")
+    futs = {tag: pool.submit(run, tag, fn) for tag, fn in steps}
+    wait(futs.values(), timeout=max(0, until - time.time()))
+    pool.shutdown(wait=False, cancel_futures=late is None)
+
+    now, out = utcnow().strftime("%Y-%m-%d %H:%M UTC"), {}
+    for tag, fut in futs.items():
+        out[tag] = _settle(tag, fut, lastgood, now)
+        if late is not None and not fut.done(): late[tag] = fut
+    return out
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# RUN HISTORY — per-section wall time, bytes and requests across runs
+# Every _fetch is charged to the section on its thread (pool threads inherit
+# it through _carry_deadline). main() appends each run to .cache/history.json;
+# a section regresses when the median of its last few runs is REGRESSION_RATIO×
+# the median of the HISTORY_WINDOW runs before them and a one-sided Mann–Whitney
+# test agrees, and the host whose time grew most is named. The same medians
+# order the executor: longest sections are submitted first.
+# ══════════════════════════════════════════════════════════════════════════════
+HISTORY_PATH     = os.path.join(CACHE_DIR, "history.json")
+HISTORY_KEEP     = 200
+HISTORY_WINDOW   = 50
+HISTORY_RECENT   = 5
+HISTORY_MIN      = 10       # baseline runs needed before judging
+REGRESSION_RATIO = 2.0
+REGRESSION_P     = 0.01
+_STATS      = {}            # tag -> {"t", "bytes", "reqs", "hosts": {host: [reqs, bytes, secs]}} this run
+_STATS_LOCK = threading.Lock()
+
+def _stat(tag):
+    return _STATS.setdefault(tag, {"t": None, "bytes": 0, "reqs": 0, "hosts": {}})
+
+def stats_fetch(url, nbytes, secs):
+    tag, host = getattr(_TLS, "section", None) or "OTHER", urllib.parse.urlsplit(url).netloc
+    with _STATS_LOCK:
+        st = _stat(tag); st["bytes"] += nbytes; st["reqs"] += 1
+        h = st["hosts"].setdefault(host, [0, 0, 0.0])
+        h[0] += 1; h[1] += nbytes; h[2] = round(h[2] + secs, 3)
+
+def stats_section(tag, secs):
+    with _STATS_LOCK: _stat(tag)["t"] = round(secs, 3)
+
+def load_history():
+    try:
+        with open(HISTORY_PATH, encoding="utf-8") as f: return json.load(f)
+    except: return []
+
+def save_history(hist):
+    _atomic_write(HISTORY_PATH, json.dumps(hist[-HISTORY_KEEP:], separators=(",", ":")))
+
+def _median(xs):
+    xs = sorted(xs); n = len(xs)
+    return (xs[n // 2] + xs[(n - 1) // 2]) / 2 if xs else 0.0
+
+def _mwu_p(a, b):
+    """One-sided p-value that `a` tends larger than `b` (Mann–Whitney U, normal approximation, tie-corrected)."""
+    allv = sorted((v, i < len(a)) for i, v in enumerate(a + b))
+    r_a = ties = i = 0
+    while i < len(allv):
+        j = i
+        while j < len(allv) and allv[j][0] == allv[i][0]: j += 1
+        r_a  += (i + j + 1) / 2 * sum(in_a for _, in_a in allv[i:j])     # tied values share the mean rank
+        ties += (j - i) ** 3 - (j - i); i = j
+    n1, n2 = len(a), len(b); n = n1 + n2
+    u    = r_a - n1 * (n1 + 1) / 2
+    var  = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if var <= 0: return 1.0
+    return 0.5 * math.erfc((u - n1 * n2 / 2 - 0.5) / math.sqrt(2 * var))
+
+def regressions(hist):
+    """["TAG: median 3.1s vs 1.2s over 50 runs (p=0.002) — host api.example.org +1.8s"] for the newest run."""
+    out = []
+    if len(hist) < HISTORY_MIN + 1: return out
+    recent, base = hist[-HISTORY_RECENT:], hist[-HISTORY_RECENT - HISTORY_WINDOW:-HISTORY_RECENT]
+    for tag in hist[-1]["sections"]:
+        a = [r["sections"][tag]["t"] for r in recent if tag in r["sections"]]
+        b = [r["sections"][tag]["t"] for r in base if tag in r["sections"]]
+        if len(b) < HISTORY_MIN or len(a) < 2: continue
+        ma, mb = _median(a), _median(b)
+        if ma < REGRESSION_RATIO * max(mb, 0.05) or (p := _mwu_p(a, b)) > REGRESSION_P: continue
+        host_t = lambda runs, h: _median([r["sections"][tag]["hosts"].get(h, [0, 0, 0])[2]
+                                          for r in runs if tag in r["sections"]])
+        hosts  = {h for r in recent if tag in r["sections"] for h in r["sections"][tag]["hosts"]}
+        worst  = max(hosts, key=lambda h: host_t(recent, h) - host_t(base, h), default=None)
+        why    = f" — host {worst} +{host_t(recent, worst) - host_t(base, worst):.1f}s" if worst else ""
+        bytes_ = [_median([r["sections"][tag]["bytes"] for r in rs if tag in r["sections"]]) for rs in (recent, base)]
+        if bytes_[1] and bytes_[0] >= REGRESSION_RATIO * bytes_[1]: why += f", bytes ×{bytes_[0] / bytes_[1]:.1f}"
+        out.append(f"{tag}: median {ma:.1f}s vs {mb:.1f}s over {len(b)} runs (p={p:.3f}){why}")
+    return out
+
+def record_run(hist):
+    """Appends this run's _STATS to `hist`; returns the regression lines."""
+    with _STATS_LOCK:
+        hist.append({"at": utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+                     "sections": json.loads(json.dumps(_STATS))})
+    return regressions(hist)
+
+def longest_first(steps, hist, window=HISTORY_WINDOW):
+    """`steps` reordered by median wall time over the last `window` runs, slowest first; unseen sections lead."""
+    med = {tag: _median([r["sections"][tag]["t"] for r in hist[-window:] if tag in r["sections"]])
+           for tag, _ in steps}
+    return sorted(steps, key=lambda s: -med[s[0]] if med[s[0]] else float("-inf"))
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DATA BUNDLE — data.json + data.json.gz for the HTML dashboards
+# The pages read one same-origin file instead of fanning out to NOAA, NASA,
+# USGS, Frankfurter, ... from every visitor's browser; they fall back to the
+# live APIs only when a key is missing from the bundle. Every raw feed is a
+# request a README section makes anyway, so after a run the feeds come from
+# the per-run memo or a disk store; sections' records render through "json".
+# ══════════════════════════════════════════════════════════════════════════════
+BUNDLE_VERSION = 1
+
+def _bundle_feeds():
+    """Raw payloads the pages read: each is a request a README section already made, or a local store."""
+    end = utcnow().strftime("%Y-%m-%d")
+    return {
+        "swpc_plasma":  ("json", "https://services.swpc.noaa.gov/products/solar-wind/plasma-2-hour.json"),   # SPACE_WEATHER
+        "swpc_mag":     ("json", "https://services.swpc.noaa.gov/products/solar-wind/mag-2-hour.json"),
+        "swpc_kp":      ("json", "https://services.swpc.noaa.gov/json/planetary_k_index_1m.json"),
+        "usgs_week":    ("json", USGS_WEEK_URL),                                                           # EARTHQUAKES
+        "donki_cme":    ("call", lambda: donki_events("CME", 8, priority=1)),                              # DONKI's day store
+        "donki_flr":    ("call", lambda: donki_events("FLR", 8, priority=1)),
+        "donki_gst":    ("call", lambda: donki_events("GST", 8, priority=1)),
+        "neo_today":    ("call", lambda: _neo_slim(nasa_get("neo/rest/v1/feed", 1, ttl=6 * 3600, start_date=end, end_date=end))),   # NEOS
+        "astros":       ("json", "http://api.open-notify.org/astros.json"),                                # ISS
+        "fx_eur":       ("call", _fx_latest),                                                              # FX store
+        "covid_all":    ("json", "https://disease.sh/v3/covid-19/all"),                                    # DISEASE
+        "covid_top":    ("json", "https://disease.sh/v3/covid-19/countries?sort=cases&limit=12"),
+        "stations_tle": ("call", lambda: gp_get("https://celestrak.org/NORAD/elements/gp.php?GROUP=stations&FORMAT=TLE")),   # CELESTRAK
+    }
+
+def _fx_latest():
+    """Frankfurter's `latest?from=EUR` payload, rebuilt from the last ECB day in the FX store."""
+    t = load_fx()
+    if t is None or not len(t): return None
+    d = str(t["ymd"][-1])
+    return {"amount": 1.0, "base": "EUR", "date": f"{d[:4]}-{d[4:6]}-{d[6:]}",
+            "rates": {c: t[c][-1] for c in FX_CURRENCIES if t[c][-1] == t[c][-1]}}
+
+def bundle_feeds():
+    """{key: payload} for the pages; after a README run every entry comes from the per-run memo or a store."""
+    feeds = {}
+    for key, (kind, src) in _bundle_feeds().items():
+        data = src() if kind == "call" else get_json(src) if kind == "json" else get_text(src)
+        if data is not None: feeds[key] = _scrub(data)
+    if isinstance(feeds.get("swpc_kp"), list):
+        feeds["swpc_kp"] = feeds["swpc_kp"][-90:]          # 1-minute Kp: pages plot the last 60–90
+    return feeds
+
+def _neo_slim(feed):
+    """NeoWs feed cut to the fields the pages plot; its `links` carry the api_key."""
+    if not isinstance(feed, dict): return None
+    obj = lambda o: {
+        "name": o.get("name"), "is_potentially_hazardous_asteroid": o.get("is_potentially_hazardous_asteroid"),
+        "estimated_diameter": {"meters": {"estimated_diameter_max":
+                               ((o.get("estimated_diameter") or {}).get("meters") or {}).get("estimated_diameter_max")}},
+        "close_approach_data": [{"miss_distance": {"kilometers": (ca.get("miss_distance") or {}).get("kilometers")},
+                                 "relative_velocity": {"kilometers_per_second": (ca.get("relative_velocity") or {}).get("kilometers_per_second")}}
+                                for ca in (o.get("close_approach_data") or [])[:1]]}
+    return {"element_count": feed.get("element_count"),
+            "near_earth_objects": {d: [obj(o) for o in objs] for d, objs in (feed.get("near_earth_objects") or {}).items()}}
+
+def _scrub(o):
+    """Drops `links` members and api_key query parameters anywhere in a feed before it is published."""
+    if isinstance(o, dict): return {k: _scrub(v) for k, v in o.items() if k != "links"}
+    if isinstance(o, list): return [_scrub(v) for v in o]
+    if isinstance(o, str) and "api_key=" in o: return re.sub(r"([?&])api_key=[^&#]*&?", r"\1", o).rstrip("?&")
+    return o
+
+def _jcol(vals, nd=4):
+    """Array column → JSON list, NaN → null."""
+    return [None if v != v else (round(v, nd) if isinstance(v, float) else v) for v in vals]
+
+def build_bundle():
+    feeds = bundle_feeds()
+    giss, co2a, co2w, solar = load_giss(), load_co2_annual(), load_co2_weekly(), load_solar_cycle()
+    series = {
+        "giss":        {"year": _jcol(giss["year"]),  "jd":  _jcol(giss["jd"], 2)},
+        "co2_annual":  {"year": _jcol(co2a["year"]),  "ppm": _jcol(co2a["mean"], 2)},
+        "solar_cycle": {"year": _jcol(solar["year"], 3), "smoothed": _jcol(solar["smoothed"], 1)},
+    }
+    fx = load_fx()
+    if fx is not None:
+        series["fx_eur"] = {"ymd": _jcol(fx["ymd"]), **{c: _jcol(fx[c], 5) for c in FX_CURRENCIES}}
+    gm_t, gm_v = giss_monthly()
+    pyramids = dict(zip(("co2_weekly", "giss_monthly", "solar_cycle"), cpu_map(pyramid, [
+        (co2w["year"], co2w["ppm"]),
+        (array("d", gm_t), array("d", gm_v)),
+        (solar["year"], solar["smoothed"]),
+    ])))
+    return {"version": BUNDLE_VERSION,
+            "generated": utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "series": {k: v for k, v in series.items() if v[next(iter(v))]},
+            "pyramids": {k: p for k, p in pyramids.items() if p["raw"]["t"]},
+            "feeds": feeds,
+            "breaker": {"threshold": BREAKER_THRESHOLD, "cooldown_s": BREAKER_COOLDOWN, "max_s": BREAKER_MAX,
+                        "probe_s": BREAKER_PROBE, "http": sorted(BREAKER_HTTP)},
+            "records": _bundle_records()}
+
+def _bundle_records():
+    """Every registered section's records as JSON — served from the per-run memo."""
+    out = {}
+    for tag in SECTIONS:
+        try: out[tag] = render(tag, "json")
+        except: pass
+    return out
+
+def write_charts(dirname="charts"):
+    """charts/<tag>.svg for each section with a chart (rewritten only on change); returns the count."""
+    specs = {}
+    for tag, sec in SECTIONS.items():
+        try: recs = records(tag)
+        except: continue
+        try: spec = sec.chart(recs) if sec.chart and recs is not None else None
+        except: continue
+        if spec: specs[tag] = spec
+    n = 0
+    for tag, svg in zip(specs, cpu_map(_svg_or_none, specs.values())):
+        if svg: _write_if_changed(os.path.join(dirname, tag.lower() + ".svg"), svg); n += 1
+    return n
+
+def _pyramid_index(name, pyr, inline_max):
+    """Bundle entry for one pyramid: per-level size/span/file, small levels inlined."""
+    levels, inline = {}, {}
+    for lvl, cols in pyr.items():
+        t = cols["t"]
+        levels[lvl] = {"n": len(t), "t0": t[0], "t1": t[-1], "file": f"pyramid/{name}.{lvl}.json"}
+        if len(t) <= inline_max: inline[lvl] = cols
+    return {"levels": levels, "inline": inline}
+
+def write_bundle(bundle, path="data.json", inline_max=400):
+    """
+    Writes data.json and a gzip -9 copy next to it; returns the raw size in bytes.
+    Every pyramid level also goes to pyramid/<name>.<level>.json so the pages
+    fetch fine levels only when zoomed in; only small levels ride in the bundle.
+    Files whose content is unchanged (ignoring "generated") are not rewritten.
+    """
+    dump = lambda o: json.dumps(o, separators=(",", ":"), ensure_ascii=False, allow_nan=False).encode("utf-8")
+    base = os.path.dirname(path)
+    index = {}
+    for name, pyr in bundle.get("pyramids", {}).items():
+        pyr = {lvl: {k: _jcol(col, 4 if k == "t" else 3) for k, col in cols.items()} for lvl, cols in pyr.items()}
+        for lvl, cols in pyr.items():
+            _write_if_changed(os.path.join(base, "pyramid", f"{name}.{lvl}.json"), dump(cols))
+        index[name] = _pyramid_index(name, pyr, inline_max)
+    raw = dump({**bundle, "pyramids": index})
+    try:                                     # same payload, only "generated" moved → keep the old files
+        with open(path, "rb") as f: prev = json.loads(f.read())
+        if {**prev, "generated": None} == {**json.loads(raw), "generated": None}: return len(raw)
+    except: pass
+    _atomic_write(path, raw)
+    _atomic_write(path + ".gz", gzip.compress(raw, 9, mtime=0))
+    return len(raw)
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PROFILING — --profile DIR: per-section cProfile stats + sampled stacks
+# Each section runs under its own cProfile (DIR/<TAG>.prof, for pstats or
+# snakeviz) while a sampler thread records its Python stack every few ms into
+# DIR/stacks.folded, rooted at the tag — the collapsed format flamegraph.pl,
+# speedscope and inferno read. Sections run one at a time when profiling.
+# ══════════════════════════════════════════════════════════════════════════════
+PROFILE_INTERVAL = 0.005
+
+def _frame_name(f):
+    return f"{f.f_code.co_name} ({os.path.basename(f.f_code.co_filename)}:{f.f_code.co_firstlineno})"
+
+def profiled(tag, fn, out_dir, interval=PROFILE_INTERVAL):
+    """fn wrapped so that calling it profiles the calling thread into out_dir."""
+    def run():
+        prof, ident, stacks, stop = cProfile.Profile(), threading.get_ident(), {}, threading.Event()
+        def sample():
+            while not stop.wait(interval):
+                f, st = sys._current_frames().get(ident), []
+                while f is not None: st.append(_frame_name(f)); f = f.f_back
+                key = ";".join([tag] + st[::-1])
+                stacks[key] = stacks.get(key, 0) + 1
+        th = threading.Thread(target=sample, daemon=True); th.start()
+        try: return prof.runcall(fn)
+        finally:
+            stop.set(); th.join()
+            os.makedirs(out_dir, exist_ok=True)
+            prof.dump_stats(os.path.join(out_dir, f"{tag}.prof"))
+            with open(os.path.join(out_dir, "stacks.folded"), "a", encoding="utf-8") as f:
+                f.writelines(f"{k} {v}\n" for k, v in stacks.items())
+    run.__wrapped__ = fn                     # memory accounting attributes by the section's own source lines
+    return run
+
+
+README_STEPS = [
+    # ── Header ──────────────────────────────────────
+    ("TIME",          get_timestamp),
+    # ── Space (open by default) ─────────────────────
+    ("ISS",           get_iss),
+    ("SPACE_WEATHER", get_space_weather),
+    ("NEOS",          get_neos),
+    # ── Earth ───────────────────────────────────────
+    ("EARTHQUAKES",   get_earthquakes),
+    ("CO2_ATMO",      get_co2),
+    ("WEATHER",       get_weather_global),
+    # ── Research ────────────────────────────────────
+    ("TICKER",        get_arxiv),
+    ("APOD",          get_apod_visual),
+    ("ON_THIS_DAY",   get_on_this_day),
+    # ── Satellites ──────────────────────────────────
+    ("CELESTRAK",     get_celestrak),
+    ("CONJUNCTIONS",  get_conjunctions),
+    ("DONKI",         get_donki),
+    ("EXOPLANETS",    get_exoplanets),
+    # ── World ───────────────────────────────────────
+    ("GDP",           get_gdp_growth),
+    ("FOREX",         get_forex),
+    ("DISEASE",       get_disease_stats),
+    # ── Footer ──────────────────────────────────────
+    ("QUOTE",         get_quote_of_day),
+]
+
+
+# ══════════════════════════════════════════════════════════════════════════════
+# DAEMON — python update_readme.py --daemon [--port 8787]
+# One long-lived process: connections stay open (KEEPALIVE), parsed datasets
+# and the memoized records stay in memory, and every section refreshes on its
+# own period. README.md / data.json are rewritten atomically only when their
+# content changed; GET /status on localhost reports per-section freshness.
+# ══════════════════════════════════════════════════════════════════════════════
+SECTION_PERIODS = {               # seconds between refreshes; others default to DAEMON_PERIOD
+    "TIME": 60, "ISS": 60, "SPACE_WEATHER": 300, "EARTHQUAKES": 300, "WEATHER": 900,
+    "DONKI": 1800, "FOREX": 3600, "NEOS": 3600, "TICKER": 3600, "CELESTRAK": 3600,
+    "CONJUNCTIONS": 3600,
+    "APOD": 21600, "ON_THIS_DAY": 21600, "DISEASE": 21600,
+    "CO2_ATMO": 86400, "EXOPLANETS": 86400, "GDP": 86400, "QUOTE": 86400,
+}
+DAEMON_PERIOD  = 3600
+DAEMON_BUDGET  = 45       # seconds a tick waits before injecting last-good content
+DAEMON_GRACE   = 300      # ... after which a slow section keeps refreshing in the background
+BUNDLE_PERIOD  = 600      # minimum seconds between data.json rebuilds
+TABLES_TTL     = 3600     # re-run tail sync on the parsed datasets this often
+
+def _status_server(state, port):
+    """GET /status → JSON freshness per section; served from a daemon thread on localhost."""
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip("/") not in ("", "/status"):
+                self.send_error(404); return
+            now  = time.time()
+            body = json.dumps({
+                "uptime_s": round(now - state["started"]),
+                "bundle":   {"built_at": state["bundle_at"], "age_s": state["bundle_at"] and round(now - state["bundle_at"])},
+                "sections": {tag: {**st, "age_s": st["ok_at"] and round(now - st["ok_at"]),
+                                   "next_in_s": max(0, round(st["next"] - now))}
+                             for tag, st in state["sections"].items()},
+                "breakers": breaker_snapshot(),
+            }, indent=1).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *a): pass
+    srv = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=srv.serve_forever, name="status", daemon=True).start()
+    return srv
+
+def daemon(port=8787, readme_path="README.md"):
+    global KEEPALIVE
+    KEEPALIVE = True
+    lastgood, late, history = load_lastgood(), {}, load_history()
+    state = {"started": time.time(), "bundle_at": None,
+             "sections": {tag: {"status": "pending", "ok_at": None, "tried_at": None,
+                                "period_s": SECTION_PERIODS.get(tag, DAEMON_PERIOD), "next": 0}
+                          for tag, _ in README_STEPS}}
+    _status_server(state, port)
+    print(f"Daemon up — status on http://127.0.0.1:{port}/status")
+    tables_at, dirty = time.time(), False
+
+    while True:
+        now = time.time()
+        due = [(tag, fn) for tag, fn in README_STEPS
+               if state["sections"][tag]["next"] <= now and tag not in late]
+        done = [tag for tag, fut in late.items() if fut.done()]
+        if due or done:
+            memo_forget([tag for tag, _ in due]); _STATS.clear()
+            if now - tables_at >= TABLES_TTL: _TABLES.clear(); tables_at = now
+            for tag, _ in due: _RECORDS.pop(tag, None)
+            stamp   = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+            results = {tag: _settle(tag, late.pop(tag), lastgood, stamp) for tag in done}
+            if due:
+                results.update(run_sections(longest_first(due, history), now + DAEMON_BUDGET, lastgood,
+                                            late=late, grace=DAEMON_GRACE))
+            with open(readme_path, encoding="utf-8") as f:
+                readme = f.read()
+            for tag, (content, status) in results.items():
+                st = state["sections"][tag]
+                st.update(status=status, tried_at=now, next=now + st["period_s"])
+                if status == "OK": st["ok_at"] = now
+                if content is not None: readme = inject(readme, tag, content)
+                print(f"  {stamp} {tag}... {status}")
+            if _write_if_changed(readme_path, readme):
+                save_lastgood(lastgood); dirty = True
+            save_breaker(); save_latency(); save_nasa_quota()
+
+        if dirty and (state["bundle_at"] is None or now - state["bundle_at"] >= BUNDLE_PERIOD):
+            try:
+                with deadline(time.time() + BUNDLE_RESERVE):
+                    write_bundle(build_bundle()); write_charts()
+                state["bundle_at"], dirty = time.time(), False
+            except Exception as e:
+                print(f"  BUNDLE... FAILED: {e}")
+                state["bundle_at"] = time.time()
+
+        nxt = min([st["next"] for st in state["sections"].values()] +
+                  [time.time() + 5 if late else float("inf")])
+        time.sleep(min(60, max(1, nxt - time.time())))
+
+
+def main(readme_path="README.md", out_path=None, tags=None, dry_run=False, bundle=True, profile_dir=None,
+         memory=False):
     """
     Injects live data into README.md for mishraxharshit GitHub profile.
     Active sections match the collapsible <details> blocks in README.md.
     All 48 functions preserved — add a tag to README to re-enable any section.
+    `tags` limits the run to those README_STEPS; `out_path` ("-" = stdout)
+    writes elsewhere; `dry_run` writes nothing but .cache/; `memory` turns on
+    per-section accounting and budgets.
     """
-    print("Loading README.md...")
-    with open("README.md", "r", encoding="utf-8") as f:
+    global DRY_RUN
+    DRY_RUN  = dry_run
+    out_path = out_path or readme_path
+    print(f"Loading {readme_path}...", file=sys.stderr if out_path == "-" else sys.stdout)
+    with open(readme_path, "r", encoding="utf-8") as f:
         readme = f.read()
+    original = readme
+    log = lambda *a, **k: print(*a, **k, file=sys.stderr if out_path == "-" else sys.stdout)
+
+    steps = [(tag, fn) for tag, fn in README_STEPS if not tags or tag in tags]
+    if profile_dir:
+        os.makedirs(profile_dir, exist_ok=True)
+        open(os.path.join(profile_dir, "stacks.folded"), "w").close()
+        steps = [(tag, profiled(tag, fn, profile_dir)) for tag, fn in steps]
+
+    t_end    = time.time() + RUN_BUDGET
+    lastgood = load_lastgood()
+    history  = load_history()
+    started  = time.time()
+    with memory_accounting() if memory else nullcontext():
+        results = run_sections(longest_first(steps, history), t_end - BUNDLE_RESERVE, lastgood,
+                               workers=1 if profile_dir else 8)
+    for tag, _ in steps:
+        if _STATS.get(tag, {}).get("t") is None: stats_section(tag, time.time() - started)   # straggler
+        content, status = results[tag]
+        log(f"  {tag}... {status}{mem_note(tag)}")
+        if content is not None: readme = inject(readme, tag, content)
+    log(f"  {len(steps)} sections in {time.time() - started:.1f}s")
+
+    if dry_run:
+        changed = [tag for tag, _ in steps
+                   if material_change(original, readme, [t for t, _ in README_STEPS if t != tag])]
+        log(f"\nDry run — changed: {', '.join(changed) or 'nothing'}; nothing written.")
+    elif out_path == "-":
+        sys.stdout.write(readme)
+    else:
+        save_lastgood(lastgood)
+        if out_path != readme_path or material_change(original, readme):
+            _atomic_write(out_path, readme)
+            print(f"\n{out_path} updated — {len(steps)} live sections injected.")
+        else:
+            print(f"\nNo material change (only the timestamp moved) — {out_path} left untouched.")
+        if not tags: prune_assets(readme)
+
+    if bundle and not tags and not dry_run:
+        b0, _TLS.section = time.time(), "BUNDLE"
+        with deadline(t_end):
+            log("  BUNDLE...", end=" ", flush=True)
+            try:
+                log(f"OK ({write_bundle(build_bundle()) / 1024:.0f} KB)")
+            except Exception as e:
+                log(f"FAILED: {e}")
 
-    steps = [
-        # ── Header ──────────────────────────────────────
-        ("TIME",          get_timestamp),
-        # ── Space (open by default) ─────────────────────
-        ("ISS",           get_iss),
-        ("SPACE_WEATHER", get_space_weather),
-        ("NEOS",          get_neos),
-        # ── Earth ───────────────────────────────────────
-        ("EARTHQUAKES",   get_earthquakes),
-        ("CO2_ATMO",      get_co2),
-        ("WEATHER",       get_weather_global),
-        # ── Research ────────────────────────────────────
-        ("TICKER",        get_arxiv),
-        ("APOD",          get_apod_visual),
-        ("ON_THIS_DAY",   get_on_this_day),
-        # ── Satellites ──────────────────────────────────
-        ("CELESTRAK",     get_celestrak),
-        ("DONKI",         get_donki),
-        ("EXOPLANETS",    get_exoplanets),
-        # ── World ───────────────────────────────────────
-        ("GDP",           get_gdp_growth),
-        ("FOREX",         get_forex),
-        ("DISEASE",       get_disease_stats),
-        # ── Footer ──────────────────────────────────────
-        ("QUOTE",         get_quote_of_day),
-    ]
-
-    for tag, fn in steps:
-        print(f"  {tag}...", end=" ", flush=True)
-        try:
-            content = fn()
-            readme  = inject(readme, tag, content)
-            print("OK")
-        except Exception as e:
-            print(f"FAILED: {e}")
-
-    with open("README.md", "w", encoding="utf-8") as f:
-        f.write(readme)
-    print("\nProfile README updated — 17 live sections injected.")
+            log("  CHARTS...", end=" ", flush=True)
+            try:
+                log(f"OK ({write_charts()} SVG)")
+            except Exception as e:
+                log(f"FAILED: {e}")
+        _TLS.section = None
+        stats_section("BUNDLE", time.time() - b0)
+
+    slow = record_run(history)
+    if not dry_run and not profile_dir and not memory and CASSETTE_MODE != "replay":
+        save_history(history)                      # instrumented or replayed runs would skew the baselines
+    if slow:
+        log("  Regressions:\n" + "\n".join(f"    {line}" for line in slow))
+    cpu_shutdown()
+    save_breaker(); save_latency(); save_nasa_quota()
+    if CASSETTE_MODE == "record": log(f"  Recorded {save_cassette()} requests → {CASSETTE_PATH}")
+    if profile_dir: log(f"  Profiles → {profile_dir}/<TAG>.prof, {profile_dir}/stacks.folded")
+    tripped = sorted(h for h, b in breaker_snapshot().items() if b["state"] != "closed")
+    if tripped: log(f"  Circuits open: {', '.join(tripped)}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    ap = argparse.ArgumentParser(description="Refresh README.md, data.json and charts/ from the live APIs.")
+    ap.add_argument("--daemon", action="store_true", help="stay running and refresh each section on its own timer")
+    ap.add_argument("--port", type=int, default=8787, help="--daemon status endpoint port (127.0.0.1)")
+    ap.add_argument("--record", nargs="?", const=CASSETTE_PATH, metavar="FILE", help="save every request/response of this run to a cassette")
+    ap.add_argument("--replay", nargs="?", const=CASSETTE_PATH, metavar="FILE", help="serve requests from a cassette instead of the network")
+    ap.add_argument("--latency", type=float, default=0.0, metavar="X", help="--replay: sleep X × the recorded latency (1 = as recorded)")
+    ap.add_argument("--sections", metavar="TAG,...", help="run only these README tags (skips the bundle and asset pruning)")
+    ap.add_argument("--list", action="store_true", help="print the README section tags and exit")
+    ap.add_argument("--readme", default="README.md", metavar="FILE", help="README to read (default: README.md)")
+    ap.add_argument("--out", metavar="FILE", help="write the result here instead of --readme; '-' for stdout")
+    ap.add_argument("--dry-run", action="store_true", help="fetch and render, but write nothing outside .cache/")
+    ap.add_argument("--no-bundle", action="store_true", help="skip data.json and charts/")
+    ap.add_argument("--profile", nargs="?", const=os.path.join(CACHE_DIR, "profile"), metavar="DIR",
+                    help="per-section cProfile stats and collapsed stacks (default DIR: .cache/profile)")
+    ap.add_argument("--memory", action="store_true", default=os.environ.get("DASHBOARD_MEMORY") == "1",
+                    help="per-section tracemalloc accounting; sections over budget fall back to last good content")
+    ap.add_argument("--mem-budget", action="append", default=[], metavar="TAG=MiB",
+                    help=f"override a section's memory budget (default {MEM_DEFAULT} MiB)")
+    args = ap.parse_args()
+    for kv in args.mem_budget:
+        tag, _, mib = kv.partition("=")
+        if not mib.isdigit(): ap.error(f"--mem-budget expects TAG=MiB, got {kv!r}")
+        MEM_BUDGETS[tag.upper()] = int(mib)
+    if args.list: sys.exit(print("\n".join(tag for tag, _ in README_STEPS)))
+    tags = [t.strip().upper() for t in args.sections.split(",")] if args.sections else None
+    if tags and set(tags) - {tag for tag, _ in README_STEPS}:
+        ap.error(f"unknown section(s): {', '.join(sorted(set(tags) - {tag for tag, _ in README_STEPS}))} (see --list)")
+    if args.daemon and (tags or args.out or args.dry_run or args.profile): ap.error("--daemon takes only --port and --readme")
+    if args.record and args.replay: ap.error("--record and --replay are exclusive")
+    if (args.record or args.replay) and args.daemon: ap.error("cassettes cover a single run, not --daemon")
+    if args.record: cassette_open("record", args.record)
+    if args.replay:
+        try: n = cassette_open("replay", args.replay, args.latency)
+        except (OSError, ValueError) as e: ap.error(f"--replay: {e}")
+        print(f"Replaying {n} requests from {args.replay} at {utcnow():%Y-%m-%d %H:%M} UTC", file=sys.stderr)
+    if args.daemon: daemon(args.port, args.readme)
+    else: main(args.readme, args.out, tags, args.dry_run, not args.no_bundle, args.profile, args.memory)
+    if _TAPE_MISSES: sys.exit(f"replay diverged: {len(_TAPE_MISSES)} request(s) not in {args.replay}")
\ No newline at end of file